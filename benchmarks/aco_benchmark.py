@@ -0,0 +1,392 @@
+"""
+ACO Motoru Performans Ölçümü
+
+AntColonyOptimizer.optimize ve create_haversine_matrix fonksiyonlarını
+sentetik örneklerde (50, 200, 1000, 5000 nokta), Ankara gölet kümesinde ve
+optimumu bilinen TSPLIB örneklerinde çalıştırır. Her durum için toplam süre,
+iterasyon başına süre, en yüksek bellek kullanımı (tracemalloc) ve optimuma
+uzaklık (%) ölçülür; sonuçlar JSON olarak yazılır ve önceki bir sonuç
+dosyasıyla (baseline) karşılaştırılarak gerilemeler işaretlenir.
+
+Varsayılan baseline, depodaki benchmarks/baseline.json dosyasıdır (varsayılan
+parametrelerle tüm durumlar). Yalnızca iki dosyada da bulunan durumlar
+karşılaştırılır; karınca/iterasyon/tohum gibi parametreler baseline ile
+aynı değilse karşılaştırma atlanır. Varsayılan olarak bellek ve optimuma
+uzaklık karşılaştırılır; süre makineye ve anlık yüke bağlı olduğundan (aynı
+makinede tekrarlarda bile %25'i aşan oynama görülür) yalnızca
+--time-threshold verildiğinde karşılaştırılır. Süre karşılaştırması için
+baseline, ölçüm yapılan makinede --output ile yeniden üretilmelidir.
+
+Kullanım:
+    python benchmarks/aco_benchmark.py --output benchmark.json
+    python benchmarks/aco_benchmark.py --sizes 50 200 --baseline benchmark.json \
+        --time-threshold 0.2
+    python benchmarks/aco_benchmark.py --baseline ''   # karşılaştırma yapma
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DEFAULT_ACO_PARAMS
+from core.ant_algorithm import AntColonyOptimizer
+from core.haversine import create_haversine_matrix
+from data.coordinates import get_coordinates_list
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# TSPLIB örneklerinin bilinen optimum tur uzunlukları
+TSPLIB_OPTIMA = {
+    'burma14': 3323,
+    'ulysses16': 6859
+}
+
+# Bu sayıya kadar olan örneklerde optimum Held-Karp ile tam hesaplanır
+_HELD_KARP_MAX_CITIES = 16
+
+# Baseline ile aynı olmadıkça sonuçları karşılaştırılamaz kılan parametreler
+_COMPARABLE_PARAMETERS = ('ants', 'iterations', 'seed', 'n_jobs', 'pheromone_strategy')
+
+def synthetic_coordinates(num_points, seed):
+    """Ankara çevresinde (yaklaşık 1° x 1°) düzgün dağılımlı rastgele noktalar."""
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(39.4, 40.4, num_points)
+    lon = rng.uniform(32.3, 33.3, num_points)
+    return np.column_stack([lat, lon])
+
+def read_tsplib(path):
+    """
+    TSPLIB .tsp dosyasını okuyup mesafe matrisini oluşturur.
+    
+    Desteklenen kenar ağırlık tipleri: EUC_2D, CEIL_2D, GEO.
+    
+    Returns:
+    --------
+    tuple
+        (name, distance_matrix)
+    """
+    header = {}
+    coordinates = []
+    
+    with open(path, encoding='utf-8') as f:
+        in_coordinates = False
+        for line in f:
+            line = line.strip()
+            if not line or line == 'EOF':
+                continue
+            if line == 'NODE_COORD_SECTION':
+                in_coordinates = True
+                continue
+            if in_coordinates:
+                _, x, y = line.split()[:3]
+                coordinates.append((float(x), float(y)))
+            elif ':' in line:
+                key, value = line.split(':', 1)
+                header[key.strip()] = value.strip()
+    
+    name = os.path.splitext(os.path.basename(path))[0]
+    coordinates = np.asarray(coordinates)
+    edge_weight_type = header.get('EDGE_WEIGHT_TYPE')
+    
+    if edge_weight_type in ('EUC_2D', 'CEIL_2D'):
+        diff = coordinates[:, None, :] - coordinates[None, :, :]
+        distances = np.sqrt((diff ** 2).sum(axis=-1))
+        distances = np.ceil(distances) if edge_weight_type == 'CEIL_2D' else np.floor(distances + 0.5)
+    elif edge_weight_type == 'GEO':
+        distances = _tsplib_geo_matrix(coordinates)
+    else:
+        raise ValueError(f"Desteklenmeyen EDGE_WEIGHT_TYPE: {edge_weight_type}")
+    
+    np.fill_diagonal(distances, 0.0)
+    return name, distances
+
+def _tsplib_geo_matrix(coordinates):
+    """TSPLIB GEO mesafesi (DDD.MM formatı, tamsayıya yuvarlanmış km)."""
+    degrees = np.trunc(coordinates)
+    # TSPLIB tanımı PI = 3.141592 kullanır
+    radians = 3.141592 * (degrees + 5.0 * (coordinates - degrees) / 3.0) / 180.0
+    lat, lon = radians[:, 0], radians[:, 1]
+    
+    q1 = np.cos(lon[:, None] - lon[None, :])
+    q2 = np.cos(lat[:, None] - lat[None, :])
+    q3 = np.cos(lat[:, None] + lat[None, :])
+    cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    return np.trunc(6378.388 * np.arccos(cosine) + 1.0)
+
+def held_karp(distance_matrix):
+    """
+    Küçük örnekler için optimum tur uzunluğunu dinamik programlama ile
+    hesaplar - O(2^N · N^2) zaman, O(2^N · N) bellek.
+    """
+    n = len(distance_matrix)
+    if n > _HELD_KARP_MAX_CITIES:
+        raise ValueError(f"Held-Karp en fazla {_HELD_KARP_MAX_CITIES} şehir için kullanılır")
+    
+    distances = np.asarray(distance_matrix, dtype=float)
+    m = n - 1
+    inner = distances[1:, 1:]
+    
+    # cost[mask, j]: 0'dan çıkıp mask kümesini dolaşarak j'de biten en kısa yol
+    cost = np.full((1 << m, m), np.inf)
+    cost[1 << np.arange(m), np.arange(m)] = distances[0, 1:]
+    
+    for mask in range(1, 1 << m):
+        members = np.flatnonzero((mask >> np.arange(m)) & 1)
+        if len(members) < 2:
+            continue
+        previous = cost[mask ^ (1 << members)]
+        cost[mask, members] = (previous + inner[:, members].T).min(axis=1)
+    
+    return float((cost[-1] + distances[1:, 0]).min())
+
+def build_cases(args):
+    """Çalıştırılacak durumları (isim, tür, veri, optimum) listeler."""
+    cases = []
+    
+    for size in args.sizes:
+        coordinates = synthetic_coordinates(size, args.seed)
+        cases.append({'name': f'synthetic-{size}', 'kind': 'haversine',
+                      'coordinates': coordinates, 'optimum': None})
+        cases.append({'name': f'synthetic-{size}', 'kind': 'aco',
+                      'coordinates': coordinates, 'optimum': None})
+    
+    ankara = create_haversine_matrix(get_coordinates_list())
+    cases.append({'name': 'ankara', 'kind': 'aco', 'distance_matrix': ankara,
+                  'optimum': held_karp(ankara)})
+    
+    for path in sorted(glob.glob(os.path.join(args.tsplib_dir, '*.tsp'))):
+        name, distance_matrix = read_tsplib(path)
+        optimum = TSPLIB_OPTIMA.get(name)
+        if optimum is None and len(distance_matrix) <= _HELD_KARP_MAX_CITIES:
+            optimum = held_karp(distance_matrix)
+        cases.append({'name': f'tsplib-{name}', 'kind': 'aco',
+                      'distance_matrix': distance_matrix, 'optimum': optimum})
+    
+    return cases
+
+def run_case(case, args, measure_memory=False):
+    """
+    Durumu bir kez çalıştırır.
+    
+    Returns:
+    --------
+    dict
+        {'seconds', 'iterations', 'best_distance', 'peak_memory_mb'}
+    """
+    if measure_memory:
+        tracemalloc.start()
+    
+    try:
+        start = time.perf_counter()
+        if case['kind'] == 'haversine':
+            create_haversine_matrix(case['coordinates'])
+            iterations, best_distance = None, None
+        else:
+            distance_matrix = case.get('distance_matrix')
+            if distance_matrix is None:
+                distance_matrix = create_haversine_matrix(case['coordinates'])
+                # Matris oluşturma süresi ayrı durum olarak ölçülür
+                start = time.perf_counter()
+            
+            aco = AntColonyOptimizer(
+                distance_matrix,
+                num_ants=args.ants,
+                num_iterations=args.iterations,
+                alpha=DEFAULT_ACO_PARAMS['alpha'],
+                beta=DEFAULT_ACO_PARAMS['beta'],
+                evaporation_rate=DEFAULT_ACO_PARAMS['evaporation_rate'],
+                Q=DEFAULT_ACO_PARAMS['Q'],
+                candidate_list_size=DEFAULT_ACO_PARAMS['candidate_list_size'],
+                n_jobs=args.n_jobs,
+                local_search=DEFAULT_ACO_PARAMS['local_search'],
+                local_search_scope=DEFAULT_ACO_PARAMS['local_search_scope'],
+                pheromone_strategy=args.pheromone_strategy,
+                seed=args.seed
+            )
+            _, best_distance, _ = aco.optimize(verbose=False)
+            iterations = aco.iterations_run
+        seconds = time.perf_counter() - start
+        
+        peak_memory_mb = None
+        if measure_memory:
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    
+    return {'seconds': seconds, 'iterations': iterations,
+            'best_distance': best_distance, 'peak_memory_mb': peak_memory_mb}
+
+def benchmark_case(case, args):
+    """Durumu tekrarlı çalıştırıp ölçümleri özetler."""
+    # Süre ölçümleri tracemalloc olmadan (izleme ek yükü getirir)
+    runs = [run_case(case, args) for _ in range(args.repeats)]
+    seconds = [run['seconds'] for run in runs]
+    
+    n = len(case['distance_matrix']) if 'distance_matrix' in case else len(case['coordinates'])
+    result = {
+        'id': f"{case['kind']}/{case['name']}",
+        'name': case['name'],
+        'kind': case['kind'],
+        'num_points': n,
+        'repeats': args.repeats,
+        'wall_seconds': min(seconds),
+        'wall_seconds_mean': float(np.mean(seconds)),
+        'seconds_per_iteration': None,
+        'peak_memory_mb': None,
+        'best_distance': runs[0]['best_distance'],
+        'optimum': case['optimum'],
+        'gap_percent': None
+    }
+    
+    if runs[0]['iterations']:
+        result['seconds_per_iteration'] = min(seconds) / runs[0]['iterations']
+    
+    if case['optimum'] and result['best_distance'] is not None:
+        result['gap_percent'] = 100.0 * (result['best_distance'] - case['optimum']) / case['optimum']
+    
+    if not args.no_memory:
+        result['peak_memory_mb'] = run_case(case, args, measure_memory=True)['peak_memory_mb']
+    
+    return result
+
+def compare_with_baseline(results, baseline, time_threshold, memory_threshold, gap_threshold,
+                          min_seconds=0.05, min_memory_mb=1.0):
+    """
+    Sonuçları önceki bir çalıştırmayla karşılaştırır.
+    
+    Parameters:
+    -----------
+    time_threshold, memory_threshold : float or None
+        İzin verilen göreli artış (ör. 0.2 = %20); None ise metrik
+        karşılaştırılmaz
+    gap_threshold : float
+        Optimuma uzaklıkta izin verilen artış (yüzde puanı)
+    min_seconds, min_memory_mb : float
+        Bundan küçük mutlak artışlar gürültü sayılır (milisaniyelik
+        durumlarda göreli eşik tek başına yanıltıcıdır)
+    
+    Returns:
+    --------
+    list of dict
+        Gerileme kayıtları {'id', 'metric', 'baseline', 'current'}
+    """
+    previous = {result['id']: result for result in baseline['results']}
+    regressions = []
+    
+    for result in results:
+        old = previous.get(result['id'])
+        if old is None:
+            continue
+        
+        for metric, threshold, floor in (('wall_seconds', time_threshold, min_seconds),
+                                         ('peak_memory_mb', memory_threshold, min_memory_mb)):
+            if threshold is None:
+                continue
+            if old.get(metric) and result.get(metric) is not None:
+                if result[metric] > max(old[metric] * (1 + threshold), old[metric] + floor):
+                    regressions.append({'id': result['id'], 'metric': metric,
+                                        'baseline': old[metric], 'current': result[metric]})
+        
+        if old.get('gap_percent') is not None and result.get('gap_percent') is not None:
+            if result['gap_percent'] > old['gap_percent'] + gap_threshold:
+                regressions.append({'id': result['id'], 'metric': 'gap_percent',
+                                    'baseline': old['gap_percent'], 'current': result['gap_percent']})
+    
+    return regressions
+
+def _format(value, spec):
+    return format(value, spec) if value is not None else '-'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 1000, 5000])
+    parser.add_argument('--ants', type=int, default=DEFAULT_ACO_PARAMS['num_ants'])
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--n-jobs', type=int, default=DEFAULT_ACO_PARAMS['n_jobs'])
+    parser.add_argument('--pheromone-strategy', default=DEFAULT_ACO_PARAMS['pheromone_strategy'])
+    parser.add_argument('--tsplib-dir', default=DATA_DIR)
+    parser.add_argument('--no-memory', action='store_true',
+                        help="tracemalloc ile bellek ölçümünü atla")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help="Karşılaştırılacak önceki sonuç dosyası (boş: karşılaştırma yok)")
+    parser.add_argument('--time-threshold', type=float,
+                        help="Süre için izin verilen göreli artış (verilmezse süre karşılaştırılmaz)")
+    parser.add_argument('--memory-threshold', type=float, default=0.2)
+    parser.add_argument('--gap-threshold', type=float, default=1.0)
+    args = parser.parse_args()
+    
+    print(f"{'durum':<28} {'N':>6} {'süre (s)':>10} {'s/iter':>9} "
+          f"{'bellek MB':>10} {'mesafe':>12} {'fark %':>7}")
+    
+    results = []
+    for case in build_cases(args):
+        result = benchmark_case(case, args)
+        results.append(result)
+        print(f"{result['id']:<28} {result['num_points']:>6} "
+              f"{result['wall_seconds']:>10.3f} {_format(result['seconds_per_iteration'], '9.4f'):>9} "
+              f"{_format(result['peak_memory_mb'], '10.1f'):>10} "
+              f"{_format(result['best_distance'], '12.2f'):>12} "
+              f"{_format(result['gap_percent'], '7.2f'):>7}")
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'parameters': {key: value for key, value in vars(args).items()
+                           if key not in ('output', 'baseline', 'tsplib_dir')}
+        },
+        'results': results
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar yazıldı: {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        
+        baseline_parameters = baseline['meta'].get('parameters', {})
+        mismatched = [key for key in _COMPARABLE_PARAMETERS
+                      if baseline_parameters.get(key) != report['meta']['parameters'][key]]
+        if mismatched:
+            print(f"\nBaseline parametreleri farklı ({', '.join(mismatched)}), "
+                  f"karşılaştırma atlandı")
+            return 0
+        
+        regressions = compare_with_baseline(results, baseline, args.time_threshold,
+                                            args.memory_threshold, args.gap_threshold)
+        if not regressions:
+            print("\nBaseline ile karşılaştırma: gerileme yok")
+            return 0
+        
+        print("\nGerilemeler:")
+        for regression in regressions:
+            print(f"  {regression['id']:<28} {regression['metric']:<15} "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g}")
+        return 1
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+İçe Aktarma Süresi Kontrolü: `import core.ant_algorithm` soğuk başlangıç bütçesi
+
+Her hedef modül ayrı bir Python sürecinde `python -X importtime` ile içe
+aktarılır. İsteğe bağlı ağır paketlerden (googlemaps, folium, plotly,
+matplotlib, streamlit, ...) biri yüklenirse veya core.ant_algorithm'in
+numpy dışındaki içe aktarma süresi bütçeyi aşarsa çıkış kodu 1 olur.
+Süreler tekrarlar arasındaki en küçük değerdir (gürültüye karşı).
+
+Aynı kontroller tests/test_import_time.py ile pytest altında da çalışır.
+
+Kullanım:
+    python benchmarks/import_time_check.py
+    python benchmarks/import_time_check.py --budget-ms 40 --repeats 7
+    python -m pytest tests/test_import_time.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Bu modüllerin içe aktarılması ağır isteğe bağlı paketleri yüklememeli
+TARGETS = ('core.ant_algorithm', 'core.matrix_utils', 'core.pipeline', 'visual.plotting', 'cli')
+
+FORBIDDEN = ('googlemaps', 'requests', 'folium', 'branca', 'plotly', 'matplotlib',
+             'streamlit', 'streamlit_folium', 'pandas')
+
+# Bütçe dışı tutulan zorunlu bağımlılık (süresi makineye göre değişir)
+BASELINE_MODULE = 'numpy'
+
+# core.ant_algorithm için numpy hariç içe aktarma süresi bütçesi (ms)
+BUDGET_MS = 30.0
+
+def measure_imports(module, python=sys.executable):
+    """
+    Modülü yeni bir süreçte `-X importtime` ile içe aktarır.
+    
+    Parameters:
+    -----------
+    module : str
+        İçe aktarılacak modül adı
+    python : str
+        Python yorumlayıcısı
+    
+    Returns:
+    --------
+    dict
+        {modül adı: kümülatif süre (mikrosaniye)} - yüklenen tüm modüller
+    """
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} içe aktarılamadı:\n{completed.stderr}")
+    
+    timings = {}
+    for line in completed.stderr.splitlines():
+        # "import time:      self [us] | cumulative | imported package"
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        timings[fields[2].strip()] = int(fields[1])
+    return timings
+
+def check_module(module, repeats):
+    """
+    Modülün yüklediği yasaklı paketleri ve en küçük içe aktarma süresini bulur.
+    
+    Returns:
+    --------
+    dict
+        {'module', 'total_ms', 'baseline_ms', 'own_ms', 'forbidden'} -
+        own_ms: numpy hariç kümülatif süre
+    """
+    best = None
+    forbidden = set()
+    for _ in range(repeats):
+        timings = measure_imports(module)
+        forbidden.update(name for name in timings if name.split('.')[0] in FORBIDDEN)
+        
+        total = timings.get(module, 0)
+        baseline = timings.get(BASELINE_MODULE, 0)
+        if best is None or total - baseline < best[0] - best[1]:
+            best = (total, baseline)
+    
+    total, baseline = best
+    return {
+        'module': module,
+        'total_ms': total / 1000,
+        'baseline_ms': baseline / 1000,
+        'own_ms': (total - baseline) / 1000,
+        'forbidden': sorted(forbidden)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS,
+                        help="core.ant_algorithm için numpy hariç süre bütçesi (ms)")
+    parser.add_argument('--total-budget-ms', type=float, default=None,
+                        help="numpy dahil toplam süre bütçesi (ms, isteğe bağlı)")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--modules', nargs='+', default=list(TARGETS))
+    args = parser.parse_args(argv)
+    
+    failures = []
+    print(f"{'modül':<22} {'toplam (ms)':>11} {'numpy (ms)':>10} {'kendi (ms)':>10}  yasaklı")
+    
+    for module in args.modules:
+        result = check_module(module, args.repeats)
+        print(f"{module:<22} {result['total_ms']:>11.1f} {result['baseline_ms']:>10.1f} "
+              f"{result['own_ms']:>10.1f}  {', '.join(result['forbidden']) or '-'}")
+        
+        if result['forbidden']:
+            failures.append(f"{module} isteğe bağlı paketleri yüklüyor: "
+                            f"{', '.join(result['forbidden'])}")
+        
+        if module == 'core.ant_algorithm':
+            if result['own_ms'] > args.budget_ms:
+                failures.append(f"{module} içe aktarma süresi {result['own_ms']:.1f} ms "
+                                f"(bütçe {args.budget_ms:.1f} ms, numpy hariç)")
+            if args.total_budget_ms is not None and result['total_ms'] > args.total_budget_ms:
+                failures.append(f"{module} toplam içe aktarma süresi {result['total_ms']:.1f} ms "
+                                f"(bütçe {args.total_budget_ms:.1f} ms)")
+    
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ İçe aktarma bütçesi ve yasaklı paket kontrolü geçti")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Yerel Arama Karşılaştırması: ACO ve ACO + 2-opt/Or-opt
+
+Yerel aramasız ACO'nun verilen iterasyon sonunda ulaştığı tur kalitesine,
+yerel aramalı ACO'nun kaçıncı iterasyonda ulaştığını ölçer ve iterasyon
+oranını raporlar.
+
+Kullanım:
+    python benchmarks/local_search_benchmark.py --cities 200 --iterations 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ant_algorithm import AntColonyOptimizer
+
+def random_instance(num_cities, seed):
+    """Birim kare içinde rastgele noktalar için Öklid mesafe matrisi üretir."""
+    rng = np.random.default_rng(seed)
+    points = rng.random((num_cities, 2)) * 100
+    return np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+
+def iterations_to_reach(history, target):
+    """Geçmişte hedef mesafeye ilk ulaşılan iterasyonu (1 tabanlı) döndürür."""
+    for iteration, distance in enumerate(history, 1):
+        if distance <= target + 1e-9:
+            return iteration
+    return None
+
+def run(distance_matrix, args, local_search, seed):
+    aco = AntColonyOptimizer(
+        distance_matrix,
+        num_ants=args.ants,
+        num_iterations=args.iterations,
+        candidate_list_size=args.candidates,
+        local_search=local_search,
+        local_search_scope=args.scope,
+        seed=seed
+    )
+    start = time.perf_counter()
+    _, best_distance, history = aco.optimize(verbose=False)
+    return best_distance, list(history), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cities', type=int, default=200)
+    parser.add_argument('--ants', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--candidates', type=int, default=15)
+    parser.add_argument('--scope', choices=['best', 'all'], default='best')
+    parser.add_argument('--methods', nargs='+', default=['2opt', '2opt+oropt'])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    args = parser.parse_args()
+    
+    print(f"{'seed':>4} {'yöntem':<12} {'en iyi':>10} {'süre (s)':>9} "
+          f"{'hedef iter.':>11} {'oran':>6}")
+    
+    for seed in args.seeds:
+        distance_matrix = random_instance(args.cities, seed)
+        
+        baseline, _, baseline_time = run(distance_matrix, args, None, seed)
+        print(f"{seed:>4} {'ACO':<12} {baseline:>10.2f} {baseline_time:>9.2f} "
+              f"{args.iterations:>11} {1.0:>6.1f}")
+        
+        for method in args.methods:
+            best, history, elapsed = run(distance_matrix, args, method, seed)
+            reached = iterations_to_reach(history, baseline)
+            ratio = f"{args.iterations / reached:.1f}" if reached else "-"
+            print(f"{seed:>4} {method:<12} {best:>10.2f} {elapsed:>9.2f} "
+                  f"{reached if reached else '-':>11} {ratio:>6}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""
+Komut Satırından Toplu Rota Optimizasyonu
+Streamlit ve görselleştirme paketleri olmadan çalışır
+
+Girdi olarak JSON, JSON Lines veya CSV dosyaları ya da standart girdi
+(JSON Lines, satır başına bir iş) okunur; her iş için mesafe matrisi seçilen
+yöntemle oluşturulur, ACO çalıştırılır ve sonuçlar tamamlandıkça JSON Lines
+olarak yazılır.
+
+İş formatı (JSON):
+    {"id": "is-1", "locations": {"A": {"lat": 39.9, "lon": 32.8}, ...},
+     "method": "haversine", "params": {"num_iterations": 200}, "seed": 1}
+
+    locations bir liste de olabilir: [{"name": "A", "lat": .., "lon": ..}, ...]
+    veya [[lat, lon], ...]. Yalnızca lokasyon sözlüğü de tek iş sayılır.
+
+    Çok araçlı rotalama için iş "vrp" anahtarı içerebilir (ilk lokasyon depo;
+    verilmeyen alanlar config.VRP_CONFIG'den alınır):
+    "vrp": {"num_vehicles": 2, "vehicle_capacity": 6, "demands": 1,
+            "service_times": 20, "max_route_duration": 240}
+
+    Zaman pencereli rotalama için "time_windows" anahtarı (saatler "HH:MM";
+    verilmeyen alanlar config.TIME_WINDOW_CONFIG'den alınır):
+    "time_windows": {"default_window": ["08:00", "18:00"],
+                     "time_windows": {"A": ["09:00", "11:00"]},
+                     "service_times": 20, "objective": "duration"}
+
+CSV formatı: name, lat, lon sütunları; isteğe bağlı job sütunu ile bir
+dosyada birden fazla iş.
+
+Kullanım:
+    python cli.py jobs.jsonl --workers 4 > results.jsonl
+    cat jobs.jsonl | python cli.py --iterations 50
+    python cli.py points.csv --method google
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from config import (DEFAULT_ACO_PARAMS, DISTANCE_CACHE_CONFIG, GOOGLE_MAPS_FETCH_CONFIG,
+                    TIME_WINDOW_CONFIG, VRP_CONFIG)
+from core.pipeline import build_distance_matrix, make_optimizer
+from core.time_windows import format_clock
+
+def read_jobs(sources):
+    """
+    Girdi kaynaklarından işleri sırayla üretir.
+    
+    Parameters:
+    -----------
+    sources : list of str
+        Dosya yolları; '-' standart girdi (JSON Lines)
+    
+    Yields:
+    -------
+    dict
+        {'id', 'locations', ...} iş sözlüğü
+    """
+    for source in sources:
+        if source == '-':
+            yield from _read_json_lines(sys.stdin, 'stdin')
+            continue
+        
+        extension = os.path.splitext(source)[1].lower()
+        with open(source, encoding='utf-8', newline='') as f:
+            if extension == '.csv':
+                yield from _read_csv(f, source)
+            elif extension in ('.jsonl', '.ndjson'):
+                yield from _read_json_lines(f, source)
+            else:
+                data = json.load(f)
+                items = data if isinstance(data, list) and _is_job(data[0] if data else {}) else [data]
+                for index, item in enumerate(items):
+                    yield _make_job(item, f"{source}:{index}")
+
+def _read_json_lines(stream, name):
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        
+        job_id = f"{name}:{line_number}"
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            # Bozuk satır tüm akışı durdurmaz, hata kaydı olarak yazılır
+            yield {'id': job_id, 'error': f"JSONDecodeError: {e}"}
+            continue
+        yield _make_job(item, job_id)
+
+def _read_csv(stream, name):
+    """name, lat, lon sütunlu CSV; job sütunu varsa satırlar işlere ayrılır."""
+    jobs = {}
+    errors = {}
+    for line_number, row in enumerate(csv.DictReader(stream), 2):
+        row = {key.strip().lower(): value for key, value in row.items() if key}
+        job_id = row.get('job') or name
+        location_name = row.get('name') or str(len(jobs.get(job_id, {})))
+        try:
+            location = {'lat': _csv_coordinate(row, ('lat', 'latitude')),
+                        'lon': _csv_coordinate(row, ('lon', 'longitude'))}
+        except ValueError as e:
+            # Hatalı satır yalnızca kendi işini hata kaydına çevirir
+            errors.setdefault(job_id, f"Geçersiz lokasyonlar: {name}:{line_number}: {e}")
+            continue
+        jobs.setdefault(job_id, {})[location_name] = location
+    
+    for job_id in dict.fromkeys([*jobs, *errors]):
+        if job_id in errors:
+            yield {'id': job_id, 'error': errors[job_id]}
+        else:
+            yield {'id': job_id, 'locations': jobs[job_id]}
+
+def _csv_coordinate(row, columns):
+    """Satırdaki ilk dolu koordinat sütununu okur (0 geçerli bir değerdir)."""
+    for column in columns:
+        value = row.get(column)
+        if value is not None and value.strip() != '':
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"'{column}' sayı değil: {value!r}")
+    raise ValueError(f"{' / '.join(columns)} sütunu eksik veya boş")
+
+def _is_job(item):
+    return isinstance(item, dict) and 'locations' in item
+
+def _make_job(item, default_id):
+    """Ham JSON nesnesini iş sözlüğüne çevirir (geçersizse 'error' içerir)."""
+    job = dict(item) if _is_job(item) else {'locations': item}
+    job.setdefault('id', default_id)
+    try:
+        job['locations'] = _normalize_locations(job['locations'])
+    except (KeyError, TypeError, ValueError) as e:
+        job['error'] = f"Geçersiz lokasyonlar: {type(e).__name__}: {e}"
+    return job
+
+def _normalize_locations(locations):
+    """Lokasyonları {name: {lat, lon}} formatına çevirir."""
+    if isinstance(locations, dict):
+        return {str(name): {'lat': float(value['lat']), 'lon': float(value['lon'])}
+                for name, value in locations.items()}
+    
+    normalized = {}
+    for index, value in enumerate(locations):
+        if isinstance(value, dict):
+            normalized[str(value.get('name', index))] = {'lat': float(value['lat']),
+                                                         'lon': float(value['lon'])}
+        else:
+            lat, lon = value[:2]
+            normalized[str(index)] = {'lat': float(lat), 'lon': float(lon)}
+    return normalized
+
+def run_job(job, defaults):
+    """
+    Tek bir işi çalıştırır (işçi süreçte de çağrılır).
+    
+    Parameters:
+    -----------
+    job : dict
+        read_jobs çıktısı
+    defaults : dict
+        {'method', 'api_key', 'cache_config', 'params'} - komut satırı
+        varsayılanları
+    
+    Returns:
+    --------
+    dict
+        JSON Lines olarak yazılacak sonuç kaydı
+    """
+    if 'error' in job:
+        return {'id': job['id'], 'status': 'error', 'error': job['error']}
+    
+    try:
+        method = job.get('method', defaults['method'])
+        matrix = build_distance_matrix(
+            job['locations'], method, defaults['api_key'],
+            cache_config=defaults['cache_config'],
+            fetch_options=GOOGLE_MAPS_FETCH_CONFIG
+        )
+        
+        params = {**defaults['params'], **job.get('params', {})}
+        params['seed'] = job.get('seed', params.get('seed'))
+        
+        # Arayüzdeki gibi verilmeyen VRP ve zaman penceresi ayarları config
+        # varsayılanlarından gelir
+        vrp_params = job.get('vrp')
+        if vrp_params is not None:
+            vrp_params = {**VRP_CONFIG, **vrp_params}
+        time_window_params = job.get('time_windows')
+        if time_window_params is not None:
+            time_window_params = {**TIME_WINDOW_CONFIG, **time_window_params}
+        
+        aco = make_optimizer(matrix, params, vrp_params, time_window_params)
+        best_path, best_distance, _ = aco.optimize(verbose=False)
+        results = aco.get_results()
+        names = matrix['location_names']
+        
+        record = {
+            'id': job['id'],
+            'status': 'ok',
+            'method': matrix['method'],
+            'num_locations': len(names),
+            'best_distance': best_distance,
+            'best_path': best_path,
+            'route': [names[index] for index in best_path],
+            'iterations_run': results['iterations_run'],
+            'stop_reason': results['stop_reason'],
+            'elapsed_seconds': results['elapsed_seconds'],
+            'messages': [message for level, message in matrix['messages']
+                         if level in ('warning', 'error')]
+        }
+        if 'routes' in results:
+            record['feasible'] = results['feasible']
+            record['routes'] = [{**route, 'route': [names[index] for index in route['path']]}
+                                for route in results['routes']]
+        if 'schedule' in results:
+            record['feasible'] = results['feasible']
+            record['total_duration'] = results['total_duration']
+            record['schedule'] = [{'location': names[stop['location']],
+                                   'arrival': format_clock(stop['arrival']),
+                                   'departure': format_clock(stop['departure']),
+                                   'wait': stop['wait'], 'late': stop['late']}
+                                  for stop in results['schedule']]
+        return record
+    except Exception as e:
+        return {'id': job.get('id'), 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+def _run_parallel(jobs, defaults, workers):
+    """
+    İşleri süreç havuzunda çalıştırır; sonuçları tamamlanma sırasıyla üretir.
+    Bellekte en fazla workers * 4 bekleyen iş tutulur (büyük stdin akışları).
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    
+    max_pending = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for job in jobs:
+            pending.add(executor.submit(run_job, job, defaults))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        
+        for future in pending:
+            yield future.result()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="JSON/JSONL/CSV dosyaları; '-' = standart girdi (varsayılan)")
+    parser.add_argument('--method', choices=['haversine', 'google'], default='haversine')
+    parser.add_argument('--api-key', default=os.environ.get('GOOGLE_MAPS_API_KEY'),
+                        help="Google Maps API anahtarı (varsayılan: GOOGLE_MAPS_API_KEY)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Google mesafelerinde SQLite çift önbelleğini kullanma")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Paralel çalışan iş sayısı (süreç)")
+    parser.add_argument('--output', help="Sonuç dosyası (varsayılan: standart çıktı)")
+    parser.add_argument('--ants', type=int, default=DEFAULT_ACO_PARAMS['num_ants'])
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ACO_PARAMS['num_iterations'])
+    parser.add_argument('--pheromone-strategy', default=DEFAULT_ACO_PARAMS['pheromone_strategy'])
+    parser.add_argument('--local-search', default=DEFAULT_ACO_PARAMS['local_search'])
+    parser.add_argument('--time-limit', type=float, default=DEFAULT_ACO_PARAMS['time_limit_seconds'])
+    parser.add_argument('--seed', type=int, default=DEFAULT_ACO_PARAMS['seed'])
+    args = parser.parse_args(argv)
+    
+    params = {
+        **DEFAULT_ACO_PARAMS,
+        'num_ants': args.ants,
+        'num_iterations': args.iterations,
+        'pheromone_strategy': args.pheromone_strategy,
+        'local_search': None if args.local_search in ('none', 'None', '') else args.local_search,
+        'time_limit_seconds': args.time_limit,
+        'seed': args.seed
+    }
+    defaults = {
+        'method': args.method,
+        'api_key': args.api_key,
+        'cache_config': None if args.no_cache else DISTANCE_CACHE_CONFIG,
+        'params': params
+    }
+    
+    jobs = read_jobs(args.inputs)
+    if args.workers > 1:
+        results = _run_parallel(jobs, defaults, args.workers)
+    else:
+        results = (run_job(job, defaults) for job in jobs)
+    
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    failed = 0
+    try:
+        for result in results:
+            failed += result['status'] != 'ok'
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
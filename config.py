@@ -9,7 +9,62 @@ DEFAULT_ACO_PARAMS = {
     'alpha': 1.0,                # Feromon önem derecesi
     'beta': 2.0,                 # Mesafe önem derecesi
     'evaporation_rate': 0.5,     # Buharlaşma oranı (0-1 arası)
-    'Q': 100                     # Feromon yoğunluğu sabiti
+    'Q': 100,                    # Feromon yoğunluğu sabiti
+    'candidate_list_size': 20,   # En yakın komşu (aday) sayısı, None = tüm şehirler
+    'n_jobs': 1,                 # Rota oluşturma işçi süreç sayısı, -1 = tüm çekirdekler
+    'local_search': None,        # Yerel arama: None, '2opt' veya '2opt+oropt'
+    'local_search_scope': 'best', # Yerel arama kapsamı: 'best' veya 'all'
+    'pheromone_strategy': 'as',  # Feromon stratejisi: 'as', 'mmas' veya 'acs'
+    'patience': None,            # İyileşme olmadan durma sabrı (iterasyon), None = kapalı
+    'time_limit_seconds': None,  # Süre sınırı (saniye), None = sınırsız
+    'seed': None                 # Rastgele sayı tohumu, None = her çalıştırmada farklı
+}
+
+# Çok Araçlı Rotalama (VRP) Varsayılanları - ilk lokasyon depo kabul edilir
+VRP_CONFIG = {
+    'num_vehicles': 3,           # Araç sayısı
+    'vehicle_capacity': 6,       # Araç başına numune şişesi kapasitesi
+    'demands': 1,                # Gölet başına numune şişesi
+    'service_times': 20,         # Gölet başına numune alma süresi (dakika)
+    'max_route_duration': 240    # Vardiya süresi (dakika)
+}
+
+# Zaman Pencereli Rotalama (TSPTW) Varsayılanları - saatler 'HH:MM', ilk lokasyon depo
+TIME_WINDOW_CONFIG = {
+    'default_window': ('08:00', '18:00'),  # Penceresi verilmeyen lokasyonlar (depo: çıkış/dönüş)
+    'time_windows': {},                    # {gölet adı: (açılış, kapanış)} erişim saatleri
+    'service_times': 20,                   # Gölet başına numune alma süresi (dakika)
+    'objective': 'distance',               # 'distance', 'duration' veya 'weighted'
+    'objective_weights': (1.0, 1.0)        # 'weighted' için (km, dakika) ağırlıkları
+}
+
+# Arayüzde ilerleme çubuğu/grafik güncelleme aralığı (saniye)
+PROGRESS_UPDATE_INTERVAL = 0.25
+
+# Arka plan iş çalıştırıcı (Streamlit oturumları arasında paylaşılır)
+JOB_RUNNER_CONFIG = {
+    'max_workers': 2,      # Aynı anda çalışan optimizasyon sayısı
+    'max_results': 32,     # Önbellekte tutulan sonuç sayısı (LRU)
+    'max_jobs': 256        # Sorgulanabilir bitmiş iş sayısı
+}
+
+# Yol Mesafesi Önbelleği (Google Maps API sonuçları, SQLite)
+DISTANCE_CACHE_CONFIG = {
+    'path': '.cache/distance_cache.sqlite',
+    'ttl_seconds': 30 * 24 * 3600,   # Kayıt geçerlilik süresi (30 gün)
+    'max_entries': 100000            # En fazla çift sayısı (LRU ile silinir)
+}
+
+# Artımlı Mesafe Matrisi Deposu (.npy + JSON paketleri)
+MATRIX_STORE_CONFIG = {
+    'google_path': '.cache/matrices/google'
+}
+
+# Google Distance Matrix API İstek Ayarları
+GOOGLE_MAPS_FETCH_CONFIG = {
+    'max_concurrent_requests': 4,    # Aynı anda gönderilen istek sayısı
+    'elements_per_second': 1000,     # Kota: saniye başına eleman (token bucket)
+    'max_retries': 5                 # Geçici hatalarda tekrar deneme sayısı
 }
 
 # Streamlit Sayfa Ayarları
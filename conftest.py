@@ -0,0 +1,3 @@
+"""
+pytest kök yapılandırması: proje kökü sys.path'e eklenir (core, cli, ...).
+"""
@@ -3,8 +3,21 @@ Karınca Kolonisi Optimizasyonu (Ant Colony Optimization - ACO) Algoritması
 Gezgin Satıcı Problemi (TSP) için implementasyon
 """
 
+import time
+
 import numpy as np
-import random
+
+from core.instrumentation import make_instrumentation
+from core.local_search import improve_tour
+from core.parallel import SharedColonyPool, resolve_n_jobs
+from core.pheromone import make_pheromone_strategy, tour_edges
+
+# Büyük (ör. disk üzerindeki memmap) matrisler satır blokları halinde okunur;
+# bir blokta işlenecek yaklaşık eleman sayısı
+_BLOCK_ELEMENTS = 1 << 22
+
+# Yerel aramada aday listesi yoksa kullanılacak komşu sayısı
+_LOCAL_SEARCH_NEIGHBORS = 10
 
 class AntColonyOptimizer:
     """
@@ -12,12 +25,23 @@ class AntColonyOptimizer:
     """
     
     def __init__(self, distance_matrix, num_ants=50, num_iterations=100, 
-                 alpha=1.0, beta=2.0, evaporation_rate=0.5, Q=100):
+                 alpha=1.0, beta=2.0, evaporation_rate=0.5, Q=100,
+                 batch_construction=True, candidate_list_size=None,
+                 n_jobs=1, executor=None, local_search=None,
+                 local_search_scope='best', pheromone_strategy='as',
+                 patience=None, target_distance=None, min_pheromone_entropy=None,
+                 time_limit_seconds=None, seed=None, instrumentation=None, symmetric=None):
         """
         Parameters:
         -----------
-        distance_matrix : numpy.ndarray
-            Şehirler arası mesafe matrisi
+        distance_matrix : numpy.ndarray or numpy.memmap
+            Şehirler arası mesafe matrisi. numpy.memmap verilirse RAM'e
+            kopyalanmaz, satır blokları halinde okunur. Feromon, sezgisel
+            bilgi ve seçim ağırlıkları ise bellekte yoğun N x N float64
+            matrislerdir (toplam ~24 * N^2 bayt; 10.000 şehirde ~2,4 GB,
+            50.000 şehirde ~60 GB); memmap yalnızca mesafe matrisinin
+            kopyasını önler, on binlerce şehri tek optimizasyonda çözmeyi
+            sağlamaz
         num_ants : int
             Her iterasyonda kullanılacak karınca sayısı
         num_iterations : int
@@ -30,26 +54,193 @@ class AntColonyOptimizer:
             Feromon buharlaşma oranı (0-1 arası)
         Q : float
             Feromon yoğunluğu sabiti
+        batch_construction : bool
+            True ise tüm karıncaların rotaları NumPy dizileri ile birlikte
+            (vektörel) oluşturulur, False ise karıncalar tek tek ilerletilir
+        candidate_list_size : int, optional
+            Her şehir için tutulacak en yakın komşu (aday) sayısı. Karıncalar
+            yalnızca bu adaylar arasından seçim yapar; None ise tüm şehirler
+            değerlendirilir
+        n_jobs : int
+            Rota oluşturmada kullanılacak işçi süreç sayısı (-1 = tüm
+            çekirdekler). 1'den büyükse her iterasyonun karıncaları süreçlere
+            bölünür ve vektörel oluşturma kullanılır
+        executor : concurrent.futures.Executor, optional
+            Dışarıdan yönetilen süreç havuzu (ör. birden fazla çalıştırmada
+            yeniden kullanmak için); verilmezse optimize() kendi havuzunu açar
+        local_search : str, optional
+            Feromon güncellemesinden önce turlara uygulanacak yerel arama:
+            '2opt' veya '2opt+oropt'; None ise yerel arama yapılmaz
+        local_search_scope : str
+            'best' (yalnızca iterasyonun en iyi turu) veya 'all' (tüm turlar)
+        pheromone_strategy : str or AntSystemStrategy
+            Feromon güncelleme stratejisi: 'as' (Ant System), 'mmas'
+            (MAX-MIN Ant System), 'acs' (Ant Colony System) veya
+            core.pheromone içindeki sınıflardan bir nesne
+        patience : int, optional
+            En iyi mesafe bu kadar iterasyon boyunca iyileşmezse durulur
+        target_distance : float, optional
+            En iyi mesafe bu değere eşit veya daha küçük olunca durulur
+        min_pheromone_entropy : float, optional
+            Normalleştirilmiş feromon entropisi (0-1, bkz. pheromone_entropy)
+            bu değerin altına düşünce koloni durgun sayılır ve durulur
+        time_limit_seconds : float, optional
+            Toplam süre sınırı; her iterasyon sonunda kontrol edilir, bu yüzden
+            en fazla bir iterasyon süresi kadar aşılabilir
+        seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+            Rastgele sayı üreteci tohumu veya hazır Generator. Aynı tohum
+            (aynı parametrelerle) aynı rotayı üretir; None ise rastgele
+        instrumentation : bool, callable or Instrumentation, optional
+            Aşama süresi ve sayaç ölçümü (bkz. core.instrumentation). True
+            ise açılır; fonksiyon verilirse her iterasyon kaydıyla çağrılır.
+            Kapalıyken ek yük yalnızca birkaç boş fonksiyon çağrısıdır
+        symmetric : bool, optional
+            Mesafe matrisi simetrik mi; None ise matristen belirlenir. Simetrik
+            modda feromon (i, j) ve (j, i) kenarlarına birlikte bırakılır;
+            asimetrik modda (ör. Google yol mesafeleri) feromon yalnızca
+            geçilen yöndeki kenara bırakılır ve yerel arama segment ters
+            çevirmeyen Or-opt ile yapılır
         """
-        self.distance_matrix = distance_matrix
+        # ndarray/memmap olduğu gibi tutulur (kopyalanmaz)
+        if isinstance(distance_matrix, np.ndarray):
+            self.distance_matrix = distance_matrix
+        else:
+            self.distance_matrix = np.asarray(distance_matrix)
         self.num_cities = len(distance_matrix)
+        if symmetric is None:
+            symmetric = is_symmetric(self.distance_matrix)
+        self.symmetric = bool(symmetric)
         self.num_ants = num_ants
         self.num_iterations = num_iterations
         self.alpha = alpha
         self.beta = beta
         self.evaporation_rate = evaporation_rate
         self.Q = Q
+        self.batch_construction = batch_construction
+        self.candidate_list_size = candidate_list_size
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.executor = executor
+        self.local_search = local_search
+        self.local_search_scope = local_search_scope
+        self.pheromone_strategy = make_pheromone_strategy(pheromone_strategy)
+        self.patience = patience
+        self.target_distance = target_distance
+        self.min_pheromone_entropy = min_pheromone_entropy
+        self.time_limit_seconds = time_limit_seconds
+        
+        # Nesneye özel rastgele sayı üreteci (global np.random durumu kullanılmaz)
+        self.rng = np.random.default_rng(seed)
+        
+        self.instrumentation = make_instrumentation(instrumentation)
+        
+        if local_search_scope not in ('best', 'all'):
+            raise ValueError(f"Geçersiz local_search_scope: {local_search_scope}")
+        
+        # En yakın komşu (aday) listeleri - adım başına O(n) yerine O(k)
+        self.candidate_list = self._build_candidate_list(candidate_list_size)
+        
+        # Yerel arama komşu listeleri (aday listesi varsa o kullanılır)
+        self.neighbor_list = None
+        if local_search is not None:
+            self.neighbor_list = self.candidate_list
+            if self.neighbor_list is None:
+                self.neighbor_list = self._nearest_neighbors(
+                    candidate_list_size or _LOCAL_SEARCH_NEIGHBORS)
+        self.local_search_moves = 0
         
         # Feromon matrisi - başlangıçta tüm kenarlar eşit feromon içerir
-        self.pheromone = np.ones((self.num_cities, self.num_cities)) / self.num_cities
+        # (başlangıç değeri stratejiye göre: AS 1/N, MMAS tau_max, ACS tau0)
+        self.pheromone = np.empty((self.num_cities, self.num_cities))
+        self.pheromone_strategy.initialize(self)
+        
+        # Sezgisel bilgi (eta^beta) çalışma boyunca değişmez, bir kez hesaplanır.
+        # Sıfır mesafeyi önlemek için küçük bir epsilon eklenir. Mesafe matrisi
+        # memmap olsa da bu matris (feromon ve seçim ağırlıkları gibi) RAM'dedir.
+        self.heuristic_beta = np.empty((self.num_cities, self.num_cities))
+        for rows in self._row_blocks():
+            heuristic = 1.0 / (self.distance_matrix[rows] + 1e-10)
+            self.heuristic_beta[rows] = heuristic if self.beta == 1 else heuristic ** self.beta
+        
+        # Seçim ağırlıkları (tau^alpha * eta^beta) - her iterasyonda bir kez yenilenir
+        self.choice_info = None
+        self._update_choice_info()
         
         # En iyi çözümü saklamak için
         self.best_path = None
         self.best_distance = float('inf')
         
+        # Son rota oluşturmada gerçekleşen (adım, seçim) sayıları
+        self.construction_counts = (0, 0)
+        
         # İterasyon geçmişi
         self.iteration_best_distances = []
         
+        # Durma bilgisi: 'max_iterations', 'patience', 'target_distance',
+        # 'stagnation', 'time_limit' veya 'cancelled'
+        self.stop_reason = None
+        self.iterations_run = 0
+        self.elapsed_seconds = 0.0
+        
+    def _build_candidate_list(self, size):
+        """
+        Her şehir için mesafeye göre sıralı en yakın `size` komşuyu hesaplar.
+        
+        Parameters:
+        -----------
+        size : int or None
+            Aday listesi uzunluğu
+        
+        Returns:
+        --------
+        numpy.ndarray or None
+            (num_cities, size) boyutunda komşu indeksleri; aday listesi
+            gereksizse (None veya size >= num_cities - 1) None
+        """
+        if not size or size >= self.num_cities - 1:
+            return None
+        
+        return self._nearest_neighbors(size)
+    
+    def _nearest_neighbors(self, size):
+        """
+        Her şehir için mesafeye göre sıralı en yakın `size` komşuyu hesaplar
+        (satır blokları halinde; memmap matrisler RAM'e kopyalanmaz).
+        
+        Parameters:
+        -----------
+        size : int
+            Komşu sayısı (en fazla num_cities - 1)
+        
+        Returns:
+        --------
+        numpy.ndarray
+            (num_cities, size) boyutunda komşu indeksleri
+        """
+        size = max(1, min(size, self.num_cities - 1))
+        neighbors = np.empty((self.num_cities, size), dtype=np.intp)
+        
+        for rows in self._row_blocks():
+            distances = np.array(self.distance_matrix[rows], dtype=float)
+            row_indices = np.arange(rows.start, rows.stop)
+            distances[row_indices - rows.start, row_indices] = np.inf
+            
+            # En yakın k komşuyu seç ve kendi aralarında mesafeye göre sırala
+            nearest = np.argpartition(distances, size - 1, axis=1)[:, :size]
+            local_rows = np.arange(len(row_indices))[:, None]
+            order = np.argsort(distances[local_rows, nearest], axis=1)
+            neighbors[rows] = nearest[local_rows, order]
+        
+        return neighbors
+    
+    def _row_blocks(self):
+        """
+        Mesafe matrisini satır blokları halinde dolaşmak için dilimler üretir.
+        Böylece memmap matrislerde bellekte aynı anda yalnızca bir blok bulunur.
+        """
+        block_rows = max(1, _BLOCK_ELEMENTS // max(self.num_cities, 1))
+        for start in range(0, self.num_cities, block_rows):
+            yield slice(start, min(start + block_rows, self.num_cities))
+    
     def calculate_path_distance(self, path):
         """
         Verilen rotanın toplam mesafesini hesaplar.
@@ -71,10 +262,33 @@ class AntColonyOptimizer:
         distance += self.distance_matrix[path[-1]][path[0]]
         return distance
     
-    def construct_solution(self):
+    def calculate_path_distances(self, paths):
+        """
+        Birden fazla rotanın toplam mesafelerini vektörel olarak hesaplar.
+        
+        Parameters:
+        -----------
+        paths : numpy.ndarray
+            (num_ants, num_cities) boyutunda rota dizisi
+        
+        Returns:
+        --------
+        numpy.ndarray
+            Her rotanın toplam mesafesi (dönüş dahil)
+        """
+        next_cities = np.roll(paths, -1, axis=1)
+        return self.distance_matrix[paths, next_cities].sum(axis=1)
+    
+    def construct_solution(self, draws=None):
         """
         Bir karınca için olasılıksal olarak rota oluşturur.
         
+        Parameters:
+        -----------
+        draws : numpy.ndarray, optional
+            (num_cities - 1, 2) boyutunda önceden üretilmiş [0, 1) sayıları
+            (adım başına rulet eşiği ve q0 çekilişi); verilmezse toplu üretilir
+        
         Returns:
         --------
         list
@@ -83,18 +297,53 @@ class AntColonyOptimizer:
         # Rastgele başlangıç şehri (genellikle 0)
         current_city = 0
         unvisited = list(range(1, self.num_cities))
+        visited = np.zeros(self.num_cities, dtype=bool)
+        visited[current_city] = True
         path = [current_city]
         
-        while unvisited:
+        if draws is None:
+            draws = self.rng.random((self.num_cities - 1, 2))
+        
+        for step_draws in draws:
             # Bir sonraki şehri seç
-            next_city = self._select_next_city(current_city, unvisited)
+            next_city = self._select_next_city(current_city, unvisited, visited, step_draws)
+            if self.pheromone_strategy.uses_local_update:
+                self.pheromone_strategy.local_update(self, current_city, next_city)
             path.append(next_city)
             unvisited.remove(next_city)
+            visited[next_city] = True
             current_city = next_city
         
         return path
     
-    def _select_next_city(self, current_city, unvisited):
+    def construct_solutions(self, num_ants):
+        """
+        Tüm karıncaların rotalarını aynı anda (vektörel) oluşturur.
+        
+        Her adımda bütün karıncalar birlikte ilerletilir: ziyaret edilen
+        şehirler bir maske ile dışlanır ve seçim, kümülatif toplam üzerinden
+        rulet tekerleği ile yapılır.
+        
+        Parameters:
+        -----------
+        num_ants : int
+            Rota oluşturacak karınca sayısı
+        
+        Returns:
+        --------
+        numpy.ndarray
+            (num_ants, num_cities) boyutunda rota dizisi
+        """
+        on_step = None
+        if self.pheromone_strategy.uses_local_update:
+            def on_step(from_cities, to_cities):
+                self.pheromone_strategy.local_update(self, from_cities, to_cities)
+        
+        return _construct_tours(self.choice_info, num_ants, self.candidate_list,
+                                rng=self.rng, q0=self.pheromone_strategy.q0,
+                                on_step=on_step)
+    
+    def _select_next_city(self, current_city, unvisited, visited=None, draws=None):
         """
         Feromon ve mesafe bilgisine göre bir sonraki şehri seçer.
         
@@ -104,59 +353,410 @@ class AntColonyOptimizer:
             Şu anki şehir
         unvisited : list
             Henüz ziyaret edilmemiş şehirler
+        visited : numpy.ndarray, optional
+            Ziyaret maskesi; aday listesi kullanılırken gereklidir
+        draws : sequence of float, optional
+            (rulet eşiği, q0 çekilişi) - [0, 1) aralığında; verilmezse üretilir
         
         Returns:
         --------
         int
             Seçilen şehir
         """
-        pheromone_values = np.array([self.pheromone[current_city][city] for city in unvisited])
+        if draws is None:
+            draws = self.rng.random(2)
+        threshold, exploit_draw = draws
+        
+        q0 = self.pheromone_strategy.q0
+        exploit = q0 is not None and exploit_draw < q0
+        
+        if self.candidate_list is not None and visited is not None:
+            candidates = self.candidate_list[current_city]
+            candidates = candidates[~visited[candidates]]
+            
+            if len(candidates) == 0:
+                # Adaylar tükendi: kalan şehirler arasından en iyisi
+                weights = self.choice_info[current_city, unvisited]
+                return unvisited[int(np.argmax(weights))]
+            
+            unvisited = candidates
         
-        # Mesafe bilgisi (heuristic) - mesafe ne kadar kısaysa o kadar iyi
-        # Sıfır mesafeyi önlemek için küçük bir epsilon ekle
-        heuristic_values = np.array([
-            1.0 / (self.distance_matrix[current_city][city] + 1e-10) 
-            for city in unvisited
-        ])
+        # Olasılık hesaplama - tau^alpha * eta^beta önceden hesaplandı
+        probabilities = self.choice_info[current_city, unvisited]
         
-        # Olasılık hesaplama
-        probabilities = (pheromone_values ** self.alpha) * (heuristic_values ** self.beta)
-        probabilities = probabilities / probabilities.sum()
+        if exploit:
+            # ACS sömürü kuralı: en yüksek ağırlıklı şehir
+            return unvisited[int(np.argmax(probabilities))]
         
-        # Rulet tekerleği seçimi
-        next_city = np.random.choice(unvisited, p=probabilities)
+        # Rulet tekerleği seçimi - kümülatif toplam üzerinde ikili arama
+        cumulative = np.cumsum(probabilities)
+        index = np.searchsorted(cumulative, threshold * cumulative[-1], side='right')
         
-        return next_city
+        return unvisited[min(int(index), len(unvisited) - 1)]
+    
+    def _update_choice_info(self):
+        """
+        Seçim ağırlık matrisini (tau^alpha * eta^beta) feromon matrisinden
+        yeniden oluşturur. Feromonlar yalnızca iterasyon sonunda değiştiği için
+        her iterasyonda bir kez çağrılması yeterlidir.
+        """
+        if self.choice_info is None:
+            self.choice_info = np.empty_like(self.pheromone)
+        
+        # Mevcut tampona yazılır (paralel çalışmada paylaşılan bellek)
+        if self.alpha == 1:
+            # alpha = 1 iken üs alma işlemine gerek yok
+            np.multiply(self.pheromone, self.heuristic_beta, out=self.choice_info)
+        else:
+            np.power(self.pheromone, self.alpha, out=self.choice_info)
+            self.choice_info *= self.heuristic_beta
+    
+    def _refresh_choice_info(self, from_cities, to_cities):
+        """
+        Yalnızca verilen kenarların seçim ağırlıklarını yeniler (simetrik
+        modda iki yönde). ACS'nin yerel ve global güncellemelerinde tüm matris
+        yerine O(k) iş.
+        """
+        rows, cols = from_cities, to_cities
+        if self.symmetric:
+            rows = np.concatenate([np.ravel(from_cities), np.ravel(to_cities)])
+            cols = np.concatenate([np.ravel(to_cities), np.ravel(from_cities)])
+        
+        pheromone = self.pheromone[rows, cols]
+        if self.alpha != 1:
+            pheromone = pheromone ** self.alpha
+        self.choice_info[rows, cols] = pheromone * self.heuristic_beta[rows, cols]
     
     def update_pheromones(self, all_paths, all_distances):
         """
         Tüm karıncaların rotalarına göre feromon matrisini günceller.
+        Buharlaşma ve bırakma kuralları seçilen feromon stratejisine aittir.
         
         Parameters:
         -----------
-        all_paths : list of lists
+        all_paths : list of lists or numpy.ndarray
             Tüm karıncaların rotaları
-        all_distances : list of floats
+        all_distances : list of floats or numpy.ndarray
             Tüm rotaların mesafeleri
         """
-        # Buharlaşma
-        self.pheromone *= (1 - self.evaporation_rate)
+        changed_edges = self.pheromone_strategy.update(self, all_paths, all_distances)
+        
+        # Yeni feromon değerleri için seçim ağırlıklarını yenile
+        if changed_edges is None:
+            self._update_choice_info()
+        else:
+            self._refresh_choice_info(*changed_edges)
+    
+    def _deposit(self, from_cities, to_cities, amounts):
+        """
+        Verilen kenarlara toplu halde feromon ekler. Simetrik modda (i, j) ve
+        (j, i) birlikte güncellenir (matris simetrik kalır); asimetrik modda
+        yalnızca geçilen yöndeki kenar güncellenir.
+        
+        Aynı kenar birden fazla kez geçiyorsa katkılar toplanır. Çok sayıda
+        kenar (tüm koloni) düz indeksler üzerinde tek bir bincount ile, az
+        sayıda kenar (ör. MMAS'ta tek tur) np.add.at ile O(k) işlenir.
+        
+        Parameters:
+        -----------
+        from_cities, to_cities : numpy.ndarray
+            Kenarların başlangıç ve bitiş şehirleri
+        amounts : numpy.ndarray
+            Her kenara eklenecek feromon miktarı
+        """
+        n = self.num_cities
+        from_cities = np.ravel(from_cities)
+        to_cities = np.ravel(to_cities)
+        amounts = np.ravel(amounts)
+        
+        flat_indices = from_cities * n + to_cities
+        weights = amounts
+        if self.symmetric:
+            # (i, j) ve (j, i) yönleri birlikte
+            flat_indices = np.concatenate([flat_indices, to_cities * n + from_cities])
+            weights = np.concatenate([amounts, amounts])
+        
+        if flat_indices.size * 8 < n * n:
+            # Seyrek güncelleme: n x n ara dizi oluşturmadan
+            np.add.at(self.pheromone.reshape(-1), flat_indices, weights)
+        else:
+            self.pheromone += np.bincount(flat_indices, weights=weights,
+                                          minlength=n * n).reshape(n, n)
+    
+    def _update_edges(self, from_cities, to_cities, factor, offset=0.0):
+        """
+        Verilen kenarlarda tau = factor * tau + offset uygular (simetrik modda
+        iki yönde). Aynı kenar birden fazla kez verilse de güncelleme bir kez
+        yapılır.
+        
+        Parameters:
+        -----------
+        from_cities, to_cities : numpy.ndarray or int
+            Kenarların başlangıç ve bitiş şehirleri
+        factor : float
+            Çarpan (ör. 1 - buharlaşma oranı)
+        offset : float
+            Eklenecek sabit
+        """
+        values = self.pheromone[from_cities, to_cities] * factor + offset
+        self.pheromone[from_cities, to_cities] = values
+        if self.symmetric:
+            self.pheromone[to_cities, from_cities] = values
+    
+    def _construct_colony(self, pool=None):
+        """
+        Bir iterasyondaki tüm karıncaların rotalarını üretir.
+        
+        Parameters:
+        -----------
+        pool : SharedColonyPool, optional
+            Paralel çalışmada kullanılan süreç havuzu
+        
+        Returns:
+        --------
+        numpy.ndarray or list of lists
+            Tüm karıncaların rotaları
+        
+        Gerçekleşen oluşturma adımı ve şehir seçimi sayıları ölçüm için
+        self.construction_counts içine (steps, selections) olarak yazılır.
+        """
+        n = self.num_cities
+        if pool is not None or self.batch_construction:
+            # Vektörel oluşturma: her adımda tüm karıncalar birer şehir seçer
+            self.construction_counts = (n - 1, self.num_ants * (n - 1))
+        else:
+            self.construction_counts = (self.num_ants * (n - 1), self.num_ants * (n - 1))
+        
+        if pool is not None:
+            all_paths = pool.construct(self.num_ants, q0=self.pheromone_strategy.q0)
+            
+            # İşçiler seçim ağırlıklarını değiştirmez; ACS yerel güncellemesi
+            # oluşturma bittikten sonra tüm kenarlara bir kez uygulanır
+            if self.pheromone_strategy.uses_local_update:
+                self.pheromone_strategy.local_update(self, *tour_edges(all_paths))
+            return all_paths
+        
+        if self.batch_construction:
+            return self.construct_solutions(self.num_ants)
+        
+        # İterasyonun tüm rastgele sayıları tek seferde üretilir
+        draws = self.rng.random((self.num_ants, self.num_cities - 1, 2))
+        
+        return [self.construct_solution(draws[ant]) for ant in range(self.num_ants)]
+    
+    def _evaluate_paths(self, all_paths):
+        """Rotaların mesafelerini hesaplar (dizi ise vektörel)."""
+        if isinstance(all_paths, np.ndarray):
+            return self.calculate_path_distances(all_paths)
+        return [self.calculate_path_distance(path) for path in all_paths]
+    
+    def _solution_path(self, path):
+        """Karıncanın rotasını best_path olarak saklanacak listeye çevirir."""
+        return np.asarray(path).tolist()
+    
+    def _apply_local_search(self, all_paths, all_distances):
+        """
+        Seçilen turları yerel arama ile yerinde iyileştirir.
+        
+        Parameters:
+        -----------
+        all_paths : list of lists or numpy.ndarray
+            Tüm karıncaların rotaları (yerinde güncellenir)
+        all_distances : list of floats or numpy.ndarray
+            Tüm rotaların mesafeleri (yerinde güncellenir)
+        """
+        if self.local_search_scope == 'best':
+            indices = [int(np.argmin(all_distances))]
+        else:
+            indices = range(len(all_paths))
         
-        # Her karıncanın katkısı
-        for path, distance in zip(all_paths, all_distances):
-            # Kısa rotalar daha fazla feromon bırakır
-            pheromone_deposit = self.Q / distance
+        for index in indices:
+            tour, num_moves = improve_tour(all_paths[index], self.distance_matrix,
+                                           self.neighbor_list, self.local_search,
+                                           symmetric=self.symmetric)
+            if not num_moves:
+                continue
             
-            # Rotadaki her kenara feromon ekle
-            for i in range(len(path) - 1):
-                self.pheromone[path[i]][path[i + 1]] += pheromone_deposit
-                self.pheromone[path[i + 1]][path[i]] += pheromone_deposit
+            self.local_search_moves += num_moves
+            if isinstance(all_paths, np.ndarray):
+                all_paths[index] = tour
+            else:
+                all_paths[index] = tour.tolist()
+            all_distances[index] = self.calculate_path_distance(tour)
+    
+    def pheromone_entropy(self):
+        """
+        Feromon matrisinin ortalama normalleştirilmiş satır entropisini hesaplar.
+        
+        Her şehirden çıkan kenarların feromonları bir olasılık dağılımı olarak
+        ele alınır; entropi log(N - 1) ile bölünerek 0-1 aralığına getirilir.
+        1 eşit dağılımı (keşif), 0'a yakın değerler feromonun tek bir rotada
+        toplandığını (durgunluk) gösterir.
+        
+        Returns:
+        --------
+        float
+            Ortalama normalleştirilmiş entropi
+        """
+        n = self.num_cities
+        if n < 3:
+            return 0.0
+        
+        total = 0.0
+        for rows in self._row_blocks():
+            block = np.array(self.pheromone[rows])
+            row_indices = np.arange(rows.start, rows.stop)
+            block[row_indices - rows.start, row_indices] = 0.0
             
-            # Başlangıç noktasına dönüş
-            self.pheromone[path[-1]][path[0]] += pheromone_deposit
-            self.pheromone[path[0]][path[-1]] += pheromone_deposit
+            p = block / block.sum(axis=1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                total -= np.where(p > 0, p * np.log(p), 0.0).sum()
+        
+        return float(total / (n * np.log(n - 1)))
     
-    def optimize(self, verbose=True):
+    def _check_stopping(self, iteration, last_improvement, start_time):
+        """
+        Erken durma koşullarını kontrol eder.
+        
+        Parameters:
+        -----------
+        iteration : int
+            Tamamlanan iterasyonun indeksi
+        last_improvement : int
+            En iyi mesafenin son iyileştiği iterasyon
+        start_time : float
+            time.perf_counter() ile alınmış başlangıç zamanı
+        
+        Returns:
+        --------
+        str or None
+            Durma nedeni; devam edilecekse None
+        """
+        if self.target_distance is not None and self.best_distance <= self.target_distance:
+            return 'target_distance'
+        
+        if self.patience is not None and iteration - last_improvement >= self.patience:
+            return 'patience'
+        
+        if (self.min_pheromone_entropy is not None
+                and self.pheromone_entropy() < self.min_pheromone_entropy):
+            return 'stagnation'
+        
+        if (self.time_limit_seconds is not None
+                and time.perf_counter() - start_time >= self.time_limit_seconds):
+            return 'time_limit'
+        
+        return None
+    
+    def _start_pool(self):
+        """
+        n_jobs > 1 ise süreç havuzunu başlatır ve seçim ağırlık matrisini
+        paylaşılan belleğe taşır.
+        
+        Returns:
+        --------
+        SharedColonyPool or None
+        """
+        if self.n_jobs <= 1:
+            return None
+        
+        # İşçi akışları nesnenin üretecinden türetilir (aynı tohumla tekrarlanabilir)
+        seed_sequence = np.random.SeedSequence(int(self.rng.integers(0, 2**63 - 1)))
+        pool = SharedColonyPool(self.choice_info, self.candidate_list, self.n_jobs,
+                                executor=self.executor, seed_sequence=seed_sequence)
+        
+        # Feromon güncellemesi seçim ağırlıklarını doğrudan paylaşılan belleğe yazar
+        self.choice_info = pool.choice_info
+        return pool
+    
+    def _stop_pool(self, pool):
+        """Paylaşılan belleği bırakmadan önce seçim ağırlıklarını geri kopyalar."""
+        if pool is None:
+            return
+        
+        self.choice_info = np.array(self.choice_info)
+        pool.close()
+    
+    def iterate(self):
+        """
+        ACO algoritmasını iterasyon iterasyon çalıştıran üreteç.
+        
+        Her iterasyon sonunda (feromon güncellemesinden sonra) o ana kadarki
+        en iyi çözüm döndürülür. Döngüden erken çıkmak (break / close())
+        çalıştırmayı iptal eder; stop_reason 'cancelled' olur ve süreç havuzu
+        kapatılır.
+        
+        Yields:
+        -------
+        tuple
+            (iteration, best_distance, best_path) - iteration 0 tabanlıdır
+        """
+        start_time = time.perf_counter()
+        self.stop_reason = 'max_iterations'
+        last_improvement = 0
+        
+        instrumentation = self.instrumentation
+        
+        pool = self._start_pool()
+        
+        try:
+            for iteration in range(self.num_iterations):
+                instrumentation.start_iteration(iteration)
+                
+                # Tüm karıncalar için rota oluştur
+                with instrumentation.phase('construction'):
+                    all_paths = self._construct_colony(pool)
+                steps, selections = self.construction_counts
+                instrumentation.count('steps', steps)
+                instrumentation.count('selections', selections)
+                
+                with instrumentation.phase('distance'):
+                    all_distances = self._evaluate_paths(all_paths)
+                
+                # Yerel arama (2-opt / Or-opt) - feromon güncellemesinden önce
+                if self.local_search is not None:
+                    moves_before = self.local_search_moves
+                    with instrumentation.phase('local_search'):
+                        self._apply_local_search(all_paths, all_distances)
+                    instrumentation.count('local_search_moves',
+                                          self.local_search_moves - moves_before)
+                
+                # En iyi çözümü güncelle
+                iteration_best_index = int(np.argmin(all_distances))
+                if all_distances[iteration_best_index] < self.best_distance:
+                    self.best_distance = float(all_distances[iteration_best_index])
+                    self.best_path = self._solution_path(all_paths[iteration_best_index])
+                    last_improvement = iteration
+                    instrumentation.count('improvements')
+                
+                # Feromonları güncelle
+                with instrumentation.phase('pheromone'):
+                    self.update_pheromones(all_paths, all_distances)
+                
+                instrumentation.end_iteration()
+                
+                # Bu iterasyondaki en iyi mesafeyi kaydet
+                iteration_best = min(all_distances)
+                self.iteration_best_distances.append(self.best_distance)
+                
+                self.iterations_run = iteration + 1
+                
+                yield iteration, self.best_distance, self.best_path
+                
+                # Erken durma
+                stop_reason = self._check_stopping(iteration, last_improvement, start_time)
+                if stop_reason is not None:
+                    self.stop_reason = stop_reason
+                    break
+        except GeneratorExit:
+            # Tüketici döngüyü erken bıraktı (ör. kullanıcı iptali)
+            self.stop_reason = 'cancelled'
+            raise
+        finally:
+            self._stop_pool(pool)
+            self.elapsed_seconds = time.perf_counter() - start_time
+        
+    def optimize(self, verbose=True, callback=None):
         """
         ACO algoritmasını çalıştırır.
         
@@ -164,43 +764,34 @@ class AntColonyOptimizer:
         -----------
         verbose : bool
             İlerleme bilgisi yazdırılsın mı
+        callback : callable, optional
+            callback(iteration, best_distance, best_path) - her iterasyon
+            sonunda çağrılır. False döndürürse çalıştırma iptal edilir
+            (stop_reason = 'cancelled')
         
         Returns:
         --------
         tuple
             (best_path, best_distance, iteration_history)
         """
-        for iteration in range(self.num_iterations):
-            # Tüm karıncalar için rota oluştur
-            all_paths = []
-            all_distances = []
-            
-            for ant in range(self.num_ants):
-                path = self.construct_solution()
-                distance = self.calculate_path_distance(path)
-                
-                all_paths.append(path)
-                all_distances.append(distance)
+        snapshots = self.iterate()
+        try:
+            for iteration, best_distance, best_path in snapshots:
+                if verbose and (iteration + 1) % 10 == 0:
+                    print(f"İterasyon {iteration + 1}/{self.num_iterations} - "
+                          f"En iyi mesafe: {best_distance:.2f} km")
                 
-                # En iyi çözümü güncelle
-                if distance < self.best_distance:
-                    self.best_distance = distance
-                    self.best_path = path.copy()
-            
-            # Feromonları güncelle
-            self.update_pheromones(all_paths, all_distances)
-            
-            # Bu iterasyondaki en iyi mesafeyi kaydet
-            iteration_best = min(all_distances)
-            self.iteration_best_distances.append(self.best_distance)
-            
-            if verbose and (iteration + 1) % 10 == 0:
-                print(f"İterasyon {iteration + 1}/{self.num_iterations} - "
-                      f"En iyi mesafe: {self.best_distance:.2f} km")
+                if callback is not None and callback(iteration, best_distance, best_path) is False:
+                    break
+        finally:
+            snapshots.close()
         
         if verbose:
             print(f"\nOptimizasyon tamamlandı!")
             print(f"En iyi mesafe: {self.best_distance:.2f} km")
+            if self.stop_reason != 'max_iterations':
+                print(f"Erken durdu ({self.stop_reason}) - "
+                      f"{self.iterations_run}/{self.num_iterations} iterasyon")
         
         return self.best_path, self.best_distance, self.iteration_best_distances
     
@@ -218,8 +809,200 @@ class AntColonyOptimizer:
             'best_distance': self.best_distance,
             'iteration_history': self.iteration_best_distances,
             'num_iterations': self.num_iterations,
+            'iterations_run': self.iterations_run,
+            'stop_reason': self.stop_reason,
+            'elapsed_seconds': self.elapsed_seconds,
             'num_ants': self.num_ants,
             'alpha': self.alpha,
             'beta': self.beta,
-            'evaporation_rate': self.evaporation_rate
+            'evaporation_rate': self.evaporation_rate,
+            'pheromone_strategy': self.pheromone_strategy.name,
+            'symmetric': self.symmetric,
+            'instrumentation': self.instrumentation.summary()
         }
+
+
+def _construct_tours(choice_info, num_ants, candidate_list=None, rng=None,
+                     q0=None, on_step=None):
+    """
+    Seçim ağırlık matrisinden tüm karıncaların rotalarını birlikte oluşturur.
+    
+    Paralel çalışmada işçi süreçler de aynı fonksiyonu kullanır; bu yüzden
+    optimizer nesnesine değil yalnızca dizilere bağlıdır.
+    
+    Parameters:
+    -----------
+    choice_info : numpy.ndarray
+        tau^alpha * eta^beta seçim ağırlıkları
+    num_ants : int
+        Rota oluşturacak karınca sayısı
+    candidate_list : numpy.ndarray, optional
+        (num_cities, k) boyutunda en yakın komşu listeleri
+    rng : numpy.random.Generator, optional
+        Rastgele sayı üreteci; bütün adımların sayıları tek seferde üretilir
+    q0 : float, optional
+        ACS sömürü olasılığı; verilirse karıncalar bu olasılıkla en yüksek
+        ağırlıklı şehri seçer
+    on_step : callable, optional
+        on_step(from_cities, to_cities) - her adımdan sonra çağrılır (ACS
+        yerel feromon güncellemesi için; choice_info yerinde güncellenebilir)
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (num_ants, num_cities) boyutunda rota dizisi (hepsi 0'dan başlar)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    n = len(choice_info)
+    ants = np.arange(num_ants)
+    
+    paths = np.zeros((num_ants, n), dtype=np.intp)
+    visited = np.zeros((num_ants, n), dtype=bool)
+    visited[:, 0] = True
+    current = np.zeros(num_ants, dtype=np.intp)
+    
+    # Adım başına ayrı çağrı yerine tüm eşikler (ve q0 çekilişleri) toplu üretilir
+    thresholds_all = rng.random((n - 1, num_ants))
+    exploit_all = rng.random((n - 1, num_ants)) < q0 if q0 is not None else None
+    
+    for step in range(1, n):
+        thresholds = thresholds_all[step - 1]
+        exploit = exploit_all[step - 1] if exploit_all is not None else None
+        next_cities = _select_next_cities(choice_info, candidate_list,
+                                          current, visited, ants, thresholds,
+                                          exploit)
+        
+        if on_step is not None:
+            on_step(current, next_cities)
+        
+        paths[:, step] = next_cities
+        visited[ants, next_cities] = True
+        current = next_cities
+    
+    return paths
+
+def _select_next_cities(choice_info, candidate_list, current, visited, ants, thresholds,
+                        exploit=None):
+    """
+    Tüm karıncalar için bir sonraki şehri aynı anda seçer.
+    
+    Aday listesi kullanılıyorsa seçim yalnızca ziyaret edilmemiş adaylar
+    arasından yapılır; adayları tükenen karıncalar kalan şehirler arasından
+    en yüksek seçim ağırlığına sahip olana gider.
+    
+    Parameters:
+    -----------
+    choice_info : numpy.ndarray
+        tau^alpha * eta^beta seçim ağırlıkları
+    candidate_list : numpy.ndarray or None
+        En yakın komşu listeleri
+    current : numpy.ndarray
+        Her karıncanın bulunduğu şehir
+    visited : numpy.ndarray
+        (num_ants, num_cities) boyutunda ziyaret maskesi
+    ants : numpy.ndarray
+        Karınca indeksleri (0..num_ants-1)
+    thresholds : numpy.ndarray
+        Her karınca için [0, 1) aralığında rastgele sayı
+    exploit : numpy.ndarray, optional
+        Rulet yerine en yüksek ağırlıklı şehri seçecek karıncaların maskesi
+        (ACS q0 kuralı)
+    
+    Returns:
+    --------
+    numpy.ndarray
+        Her karınca için seçilen şehir
+    """
+    if candidate_list is None:
+        # Tüm karıncalar için seçim ağırlıkları (önbellekten okunur)
+        weights = choice_info[current]
+        weights[visited] = 0.0
+        next_cities = _roulette(weights, thresholds, ~visited)
+        
+        if exploit is not None and exploit.any():
+            best = weights[exploit]
+            best[visited[exploit]] = -np.inf
+            next_cities[exploit] = np.argmax(best, axis=1)
+        return next_cities
+    
+    # Yalnızca en yakın komşular arasından seçim - O(k)
+    candidates = candidate_list[current]
+    weights = choice_info[current[:, None], candidates]
+    weights[visited[ants[:, None], candidates]] = 0.0
+    
+    totals = weights.sum(axis=1)
+    has_candidates = totals > 0
+    
+    next_cities = np.empty(len(ants), dtype=np.intp)
+    if has_candidates.any():
+        chosen = _roulette(weights[has_candidates], thresholds[has_candidates])
+        if exploit is not None:
+            greedy = exploit[has_candidates]
+            chosen[greedy] = np.argmax(weights[has_candidates][greedy], axis=1)
+        next_cities[has_candidates] = candidates[has_candidates, chosen]
+    
+    exhausted = ~has_candidates
+    if exhausted.any():
+        # Adaylar tükendi: kalan şehirler arasından en iyisi
+        weights = choice_info[current[exhausted]]
+        weights[visited[exhausted]] = -np.inf
+        next_cities[exhausted] = np.argmax(weights, axis=1)
+    
+    return next_cities
+
+def _roulette(weights, thresholds, allowed=None):
+    """
+    Kümülatif toplam ile satır bazında rulet tekerleği seçimi yapar.
+    
+    Parameters:
+    -----------
+    weights : numpy.ndarray
+        (satır, seçenek) boyutunda negatif olmayan ağırlıklar
+    thresholds : numpy.ndarray
+        Her satır için [0, 1) aralığında rastgele sayı
+    allowed : numpy.ndarray, optional
+        Ağırlık toplamı sıfır/taşmış satırlarda eşit olasılıkla
+        seçilebilecek seçeneklerin maskesi
+    
+    Returns:
+    --------
+    numpy.ndarray
+        Her satır için seçilen sütun indeksi
+    """
+    cumulative = np.cumsum(weights, axis=1)
+    totals = cumulative[:, -1]
+    
+    # Sayısal taşma/sıfır toplam durumunda izin verilenler eşit olasılıklı
+    if allowed is not None:
+        degenerate = ~(np.isfinite(totals) & (totals > 0))
+        if degenerate.any():
+            cumulative[degenerate] = np.cumsum(allowed[degenerate], axis=1)
+            totals = cumulative[:, -1]
+    
+    return np.argmax(cumulative > (thresholds * totals)[:, None], axis=1)
+
+def is_symmetric(matrix, rtol=1e-9):
+    """
+    Matrisin simetrik olup olmadığını satır blokları halinde kontrol eder
+    (memmap matrisler RAM'e kopyalanmaz).
+    
+    Parameters:
+    -----------
+    matrix : numpy.ndarray or numpy.memmap
+        Kare mesafe matrisi
+    rtol : float
+        Kayan nokta farkları için göreli tolerans
+    
+    Returns:
+    --------
+    bool
+    """
+    n = len(matrix)
+    block_rows = max(1, _BLOCK_ELEMENTS // max(n, 1))
+    for start in range(0, n, block_rows):
+        rows = slice(start, min(start + block_rows, n))
+        if not np.allclose(matrix[rows], np.asarray(matrix[:, rows]).T, rtol=rtol, atol=0.0):
+            return False
+    return True
@@ -0,0 +1,177 @@
+"""
+Yol Mesafesi/Süresi Sonuçları için Kalıcı (SQLite) Önbellek
+Anahtar: yuvarlanmış başlangıç/varış koordinatları + ulaşım modu
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+class DistanceCache:
+    """
+    Koordinat çifti bazında kalıcı mesafe önbelleği.
+    
+    Kayıtlar ttl_seconds süresi dolunca geçersiz sayılır; kayıt sayısı
+    max_entries değerini aşarsa en uzun süredir erişilmeyen (LRU) kayıtlar
+    silinir. Her işlem kendi bağlantısını açtığı için farklı thread'lerden
+    (ör. Streamlit yeniden çalıştırmaları) güvenle kullanılabilir.
+    """
+    
+    def __init__(self, path, ttl_seconds=30 * 24 * 3600, max_entries=100000, precision=5):
+        """
+        Parameters:
+        -----------
+        path : str
+            SQLite veritabanı dosya yolu (klasör yoksa oluşturulur)
+        ttl_seconds : float or None
+            Kaydın geçerlilik süresi (saniye); None ise süresiz
+        max_entries : int or None
+            En fazla kayıt sayısı; None ise sınırsız
+        precision : int
+            Koordinatların anahtar için yuvarlanacağı ondalık basamak sayısı
+            (5 basamak ~1 metre)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.precision = precision
+        self._scale = 10 ** precision
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pairs (
+                    origin_lat INTEGER NOT NULL,
+                    origin_lon INTEGER NOT NULL,
+                    dest_lat INTEGER NOT NULL,
+                    dest_lon INTEGER NOT NULL,
+                    mode TEXT NOT NULL,
+                    distance_km REAL NOT NULL,
+                    duration_min REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (origin_lat, origin_lon, dest_lat, dest_lon, mode)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pairs_accessed ON pairs (accessed_at)")
+    
+    @contextmanager
+    def _connect(self):
+        """Tek işlemlik bağlantı açar; hata yoksa commit edip kapatır."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _key(self, origin, destination, mode):
+        """(lat, lon) çiftlerini tamsayı anahtara çevirir."""
+        return (round(origin[0] * self._scale), round(origin[1] * self._scale),
+                round(destination[0] * self._scale), round(destination[1] * self._scale),
+                mode)
+    
+    def get_many(self, pairs, mode="driving"):
+        """
+        Önbellekte bulunan çiftlerin mesafe ve sürelerini döndürür.
+        
+        Parameters:
+        -----------
+        pairs : iterable of tuples
+            [((lat1, lon1), (lat2, lon2)), ...] başlangıç/varış çiftleri
+        mode : str
+            Ulaşım modu (driving, walking, ...)
+        
+        Returns:
+        --------
+        dict
+            {(origin, destination): (distance_km, duration_min)} - yalnızca
+            geçerli (süresi dolmamış) kayıtlar
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return {}
+        
+        keys = {self._key(origin, destination, mode): (origin, destination)
+                for origin, destination in pairs}
+        now = time.time()
+        min_created = now - self.ttl_seconds if self.ttl_seconds is not None else float('-inf')
+        
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TEMP TABLE wanted (
+                    origin_lat INTEGER, origin_lon INTEGER,
+                    dest_lat INTEGER, dest_lon INTEGER, mode TEXT
+                )
+            """)
+            conn.executemany("INSERT INTO wanted VALUES (?, ?, ?, ?, ?)", keys.keys())
+            
+            rows = conn.execute("""
+                SELECT p.origin_lat, p.origin_lon, p.dest_lat, p.dest_lon, p.mode,
+                       p.distance_km, p.duration_min
+                FROM pairs p
+                JOIN wanted w USING (origin_lat, origin_lon, dest_lat, dest_lon, mode)
+                WHERE p.created_at >= ?
+            """, (min_created,)).fetchall()
+            
+            # LRU için erişim zamanını güncelle
+            conn.execute("""
+                UPDATE pairs SET accessed_at = ?
+                WHERE created_at >= ? AND EXISTS (
+                    SELECT 1 FROM wanted w
+                    WHERE w.origin_lat = pairs.origin_lat AND w.origin_lon = pairs.origin_lon
+                      AND w.dest_lat = pairs.dest_lat AND w.dest_lon = pairs.dest_lon
+                      AND w.mode = pairs.mode
+                )
+            """, (now, min_created))
+            conn.execute("DROP TABLE wanted")
+        
+        return {keys[tuple(row[:5])]: (row[5], row[6]) for row in rows}
+    
+    def put_many(self, entries, mode="driving"):
+        """
+        Mesafe/süre sonuçlarını önbelleğe yazar.
+        
+        Parameters:
+        -----------
+        entries : iterable of tuples
+            [(origin, destination, distance_km, duration_min), ...]
+        mode : str
+            Ulaşım modu
+        """
+        now = time.time()
+        rows = [self._key(origin, destination, mode) + (distance_km, duration_min, now, now)
+                for origin, destination, distance_km, duration_min in entries]
+        if not rows:
+            return
+        
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._evict(conn, now)
+    
+    def _evict(self, conn, now):
+        """Süresi dolan kayıtları ve kapasite üzerindeki en eski (LRU) kayıtları siler."""
+        if self.ttl_seconds is not None:
+            conn.execute("DELETE FROM pairs WHERE created_at < ?", (now - self.ttl_seconds,))
+        
+        if self.max_entries is not None:
+            count = conn.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute("""
+                    DELETE FROM pairs WHERE rowid IN (
+                        SELECT rowid FROM pairs ORDER BY accessed_at ASC LIMIT ?
+                    )
+                """, (excess,))
+    
+    def clear(self):
+        """Tüm kayıtları siler."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pairs")
+    
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
@@ -41,28 +41,121 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     
     return distance
 
-def create_haversine_matrix(coordinates):
+def _haversine_block(lat1_rad, lon1_rad, lat2_rad, lon2_rad):
+    """
+    Radyan cinsinden iki nokta kümesi arasındaki tüm mesafeleri yayınlama
+    (broadcasting) ile hesaplar. İşlem sırası haversine_distance ile
+    aynıdır; sonuçlar skaler fonksiyonla birebir (en fazla birkaç ULP
+    farkla) örtüşür.
+    
+    Parameters:
+    -----------
+    lat1_rad, lon1_rad : numpy.ndarray
+        Satır noktalarının enlem/boylamları, (r, 1) boyutunda
+    lat2_rad, lon2_rad : numpy.ndarray
+        Sütun noktalarının enlem/boylamları, (1, c) boyutunda
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (r, c) boyutunda float64 mesafe bloğu (kilometre)
+    """
+    R = 6371.0
+    
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    
+    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return R * c
+
+def create_haversine_matrix(coordinates, dtype=np.float64):
     """
     Koordinat listesinden Haversine mesafe matrisi oluşturur.
     
+    Tüm matris tek geçişte NumPy yayınlama (broadcasting) ile hesaplanır.
+    float64 çıktısı skaler haversine_distance ile aynıdır; vektörel
+    trigonometrik fonksiyonlar nedeniyle bazı hücrelerde en fazla 1e-15
+    göreli (birkaç ULP) fark oluşabilir. float32 çıktı yaklaşık 1e-7 göreli
+    hassasiyettedir.
+    
     Parameters:
     -----------
-    coordinates : list of tuples
+    coordinates : list of tuples or numpy.ndarray
         [(lat1, lon1), (lat2, lon2), ...] formatında koordinat listesi
+        veya (N, 2) boyutunda dizi
+    dtype : numpy.dtype
+        Çıktı matrisinin veri tipi (np.float64 veya np.float32)
     
     Returns:
     --------
     numpy.ndarray
         NxN boyutunda mesafe matrisi (N = lokasyon sayısı)
     """
-    n = len(coordinates)
-    distance_matrix = np.zeros((n, n))
+    coords = np.radians(np.asarray(coordinates, dtype=np.float64).reshape(-1, 2))
+    lat = coords[:, 0]
+    lon = coords[:, 1]
+    
+    distance_matrix = _haversine_block(lat[:, None], lon[:, None],
+                                       lat[None, :], lon[None, :])
+    
+    # Köşegen (aynı nokta) her zaman tam sıfır
+    np.fill_diagonal(distance_matrix, 0.0)
+    
+    return distance_matrix.astype(dtype, copy=False)
+
+def create_haversine_memmap(coordinates, filename, block_size=2048, dtype=np.float32):
+    """
+    Çok büyük lokasyon kümeleri için Haversine mesafe matrisini satır
+    şeritleri halinde hesaplayıp diske yazar ve numpy.memmap olarak açar.
+    
+    Bellek kullanımı N^2 ile değil blok boyutu ile sınırlıdır: her şerit en
+    fazla block_size x block_size eleman içerir ve hesaplanır hesaplanmaz
+    dosyaya eklenir. Yazma sırasında memmap kullanılmaz; yazılabilir bir
+    memmap dokunduğu tüm sayfaları süreç belleğinde tuttuğu için tepe
+    bellek N^2 ile büyürdü.
+    
+    Not: AntColonyOptimizer memmap'i kopyalamadan okur, ancak feromon ve
+    seçim ağırlıkları için yine N x N float64 matrisler ayırır.
+    
+    Parameters:
+    -----------
+    coordinates : list of tuples or numpy.ndarray
+        [(lat1, lon1), (lat2, lon2), ...] formatında koordinat listesi
+        veya (N, 2) boyutunda dizi
+    filename : str
+        Matrisin yazılacağı dosya yolu (ham, başlıksız veri)
+    block_size : int
+        Şerit başına eleman sayısı block_size^2 ile sınırlanır
+    dtype : numpy.dtype
+        Dosyadaki veri tipi (np.float32 veya np.float64)
+    
+    Returns:
+    --------
+    numpy.memmap
+        Salt okunur (mode='r') NxN mesafe matrisi
+    """
+    coords = np.radians(np.asarray(coordinates, dtype=np.float64).reshape(-1, 2))
+    lat = coords[:, 0]
+    lon = coords[:, 1]
+    n = len(coords)
+    
+    # Şerit yüksekliği: satır sayısı * N <= block_size^2
+    stripe_rows = max(1, min(block_size, block_size * block_size // max(n, 1)))
     
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                lat1, lon1 = coordinates[i]
-                lat2, lon2 = coordinates[j]
-                distance_matrix[i][j] = haversine_distance(lat1, lon1, lat2, lon2)
+    with open(filename, 'wb') as f:
+        for row_start in range(0, n, stripe_rows):
+            row_end = min(row_start + stripe_rows, n)
+            rows = slice(row_start, row_end)
+            
+            stripe = _haversine_block(lat[rows, None], lon[rows, None],
+                                      lat[None, :], lon[None, :])
+            
+            # Bu şeride düşen köşegen elemanları tam sıfır
+            row_indices = np.arange(row_start, row_end)
+            stripe[row_indices - row_start, row_indices] = 0.0
+            
+            stripe.astype(dtype, copy=False).tofile(f)
     
-    return distance_matrix
+    return np.memmap(filename, dtype=dtype, mode='r', shape=(n, n))
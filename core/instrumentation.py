@@ -0,0 +1,189 @@
+"""
+Optimizasyon Aşama Süreleri ve Sayaçları
+Rota oluşturma, mesafe hesabı, feromon güncellemesi ve yerel arama ölçümü
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+# optimize() içinde ölçülen aşamalar
+PHASES = ('construction', 'distance', 'pheromone', 'local_search')
+
+class Instrumentation:
+    """
+    İterasyon bazında aşama sürelerini ve sayaçları toplar.
+    
+    Her iterasyon sonunda bir kayıt ({'iteration', aşama süreleri (saniye),
+    sayaçlar}) oluşturulur ve kayıtlı kancalara (hook) iletilir. Ölçümler
+    Chrome trace JSON formatında dışa aktarılabilir (chrome://tracing,
+    Perfetto veya speedscope ile açılır).
+    """
+    
+    enabled = True
+    
+    def __init__(self, hooks=None):
+        """
+        Parameters:
+        -----------
+        hooks : list of callable, optional
+            hook(record) - her iterasyon sonunda çağrılır
+        """
+        self.hooks = list(hooks or [])
+        self.records = []
+        self.counters = {}
+        
+        self._origin = time.perf_counter()
+        self._events = []
+        self._current = None
+        self._iteration_start = None
+    
+    def add_hook(self, hook):
+        """İterasyon sonu kancası ekler."""
+        self.hooks.append(hook)
+    
+    def start_iteration(self, iteration):
+        """Yeni iterasyon kaydı başlatır."""
+        self._current = {'iteration': iteration}
+        self._iteration_start = time.perf_counter()
+    
+    @contextmanager
+    def phase(self, name):
+        """Bloğun süresini mevcut iterasyonun `name` aşamasına ekler."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._current[name] = self._current.get(name, 0.0) + duration
+            self._events.append((name, start, duration, self._current['iteration']))
+    
+    def count(self, name, value=1):
+        """Sayaç artırır (hem iterasyon kaydında hem toplamda)."""
+        self._current[name] = self._current.get(name, 0) + value
+        self.counters[name] = self.counters.get(name, 0) + value
+    
+    def end_iteration(self):
+        """İterasyon kaydını tamamlar ve kancaları çağırır."""
+        record = self._current
+        duration = time.perf_counter() - self._iteration_start
+        record['total'] = duration
+        self._events.append(('iteration', self._iteration_start, duration, record['iteration']))
+        
+        self.records.append(record)
+        self._current = None
+        
+        for hook in self.hooks:
+            hook(record)
+    
+    def summary(self):
+        """
+        Toplam ve iterasyon başına ortalama süreleri döndürür.
+        
+        Returns:
+        --------
+        dict
+            {'iterations', 'total_seconds', 'phase_seconds', 'phase_mean_seconds',
+             'counters', 'per_iteration'}
+        """
+        num_iterations = len(self.records)
+        phase_seconds = {name: sum(record.get(name, 0.0) for record in self.records)
+                         for name in PHASES}
+        
+        return {
+            'iterations': num_iterations,
+            'total_seconds': sum(record['total'] for record in self.records),
+            'phase_seconds': phase_seconds,
+            'phase_mean_seconds': {name: (seconds / num_iterations if num_iterations else 0.0)
+                                   for name, seconds in phase_seconds.items()},
+            'counters': dict(self.counters),
+            'per_iteration': list(self.records)
+        }
+    
+    def to_chrome_trace(self, filename=None):
+        """
+        Ölçümleri Chrome trace (Trace Event) formatına çevirir.
+        
+        Parameters:
+        -----------
+        filename : str, optional
+            Verilirse JSON bu dosyaya yazılır
+        
+        Returns:
+        --------
+        dict
+            {'traceEvents': [...], 'displayTimeUnit': 'ms'}
+        """
+        pid = os.getpid()
+        events = [{
+            'name': name,
+            'cat': 'aco',
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': 0,
+            'args': {'iteration': iteration}
+        } for name, start, duration, iteration in self._events]
+        
+        # Sayaçlar iterasyon sonunda "C" olayları olarak eklenir
+        iteration_ends = {iteration: start + duration
+                          for name, start, duration, iteration in self._events
+                          if name == 'iteration'}
+        for record in self.records:
+            counters = {key: value for key, value in record.items()
+                        if key not in PHASES and key not in ('iteration', 'total')}
+            if counters:
+                end = iteration_ends[record['iteration']]
+                events.append({'name': 'counters', 'ph': 'C', 'ts': (end - self._origin) * 1e6,
+                               'pid': pid, 'tid': 0, 'args': counters})
+        
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        
+        if filename is not None:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+        return trace
+
+class _NullInstrumentation:
+    """Ölçüm kapalıyken kullanılan, hiçbir iş yapmayan nesne."""
+    
+    enabled = False
+    
+    _context = nullcontext()
+    
+    def start_iteration(self, iteration):
+        pass
+    
+    def phase(self, name):
+        return self._context
+    
+    def count(self, name, value=1):
+        pass
+    
+    def end_iteration(self):
+        pass
+    
+    def summary(self):
+        return None
+
+NULL_INSTRUMENTATION = _NullInstrumentation()
+
+def make_instrumentation(instrumentation):
+    """
+    optimize() için ölçüm nesnesini hazırlar.
+    
+    Parameters:
+    -----------
+    instrumentation : bool, callable or Instrumentation
+        True: yeni Instrumentation; fonksiyon: kanca olarak kaydedilen yeni
+        Instrumentation; Instrumentation: olduğu gibi; False/None: kapalı
+    """
+    if not instrumentation:
+        return NULL_INSTRUMENTATION
+    if instrumentation is True:
+        return Instrumentation()
+    if callable(instrumentation) and not isinstance(instrumentation, Instrumentation):
+        return Instrumentation(hooks=[instrumentation])
+    return instrumentation
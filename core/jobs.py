@@ -0,0 +1,254 @@
+"""
+Arka Plan İş Çalıştırıcı ve Sonuç Önbelleği
+Uzun süren optimizasyonlar arayüz thread'ini bloklamadan çalıştırılır
+"""
+
+import hashlib
+import json
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+def make_job_key(*parts):
+    """
+    İş girdilerinden (lokasyonlar, yöntem, parametreler, tohum) kararlı bir
+    anahtar üretir. Sözlük sırası anahtarı etkilemez.
+    
+    Parameters:
+    -----------
+    *parts
+        JSON'a çevrilebilen iş girdileri; NumPy dizileri listeye çevrilir
+    
+    Returns:
+    --------
+    str
+        SHA-256 özeti (hex)
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _json_default(value):
+    """JSON'a doğrudan çevrilemeyen değerler (NumPy dizileri/sayıları, diğerleri repr)."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+class Job:
+    """
+    Arka planda çalışan tek bir iş.
+    
+    İş fonksiyonu ilk argüman olarak bu nesneyi alır; ilerlemeyi report()
+    ile bildirir ve `cancelled` ile iptal isteğini kontrol eder.
+    
+    Attributes:
+    -----------
+    status : str
+        'pending', 'running', 'done', 'failed' veya 'cancelled'
+    progress : dict
+        İş fonksiyonunun bildirdiği son ilerleme bilgisi
+    result : object
+        İş sonucu ('done' durumunda)
+    error : str
+        Hata izi ('failed' durumunda)
+    cached : bool
+        Sonuç önbellekten geldiyse True
+    """
+    
+    def __init__(self, key):
+        """
+        Parameters:
+        -----------
+        key : str
+            Sonuç önbelleği anahtarı (bkz. make_job_key)
+        """
+        self.job_id = uuid.uuid4().hex
+        self.key = key
+        self.status = 'pending'
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.cached = False
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+    
+    @property
+    def cancelled(self):
+        """İptal istendiyse True."""
+        return self._cancel_event.is_set()
+    
+    @property
+    def finished(self):
+        """İş bittiyse (başarılı, hatalı veya iptal) True."""
+        return self.status in ('done', 'failed', 'cancelled')
+    
+    def cancel(self):
+        """İşin iptalini ister (iş fonksiyonu kontrol ettiğinde durur)."""
+        self._cancel_event.set()
+    
+    def report(self, **progress):
+        """
+        İlerleme bilgisini günceller (önceki anahtarlar korunur).
+        
+        Parameters:
+        -----------
+        **progress
+            Ör. stage, percent, iteration, best_distance
+        """
+        self.progress = {**self.progress, **progress}
+
+class JobRunner:
+    """
+    İşleri thread havuzunda çalıştırır ve sonuçları anahtara göre saklar.
+    
+    Aynı anahtarla gelen istek, sonuç önbellekteyse hemen tamamlanmış bir iş
+    olarak döner; aynı anahtarlı iş hâlâ çalışıyorsa yeni iş açılmaz, mevcut
+    işin kimliği döndürülür. Önbellek en fazla `max_results` sonuç tutar ve
+    en uzun süredir kullanılmayanı atar (LRU).
+    """
+    
+    def __init__(self, max_workers=2, max_results=32, max_jobs=256):
+        """
+        Parameters:
+        -----------
+        max_workers : int
+            Aynı anda çalışabilecek iş sayısı
+        max_results : int
+            Önbellekte tutulacak en fazla sonuç sayısı
+        max_jobs : int
+            Kimliğiyle sorgulanabilecek en fazla bitmiş iş sayısı
+        """
+        self.max_results = max_results
+        self.max_jobs = max_jobs
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='aco-job')
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._results = OrderedDict()
+        self._active = {}
+    
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        fn(job, *args, **kwargs) işini (gerekirse) başlatır.
+        
+        Parameters:
+        -----------
+        key : str
+            Sonuç önbelleği anahtarı (bkz. make_job_key)
+        fn : callable
+            İş fonksiyonu; ilk argümanı Job nesnesidir
+        *args, **kwargs
+            İş fonksiyonuna iletilecek argümanlar
+        
+        Returns:
+        --------
+        str
+            İş kimliği
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                job = Job(key)
+                job.status = 'done'
+                job.result = self._results[key]
+                job.cached = True
+                job.finished_at = job.created_at
+                self._add_job(job)
+                return job.job_id
+            
+            if key in self._active:
+                return self._active[key]
+            
+            job = Job(key)
+            self._add_job(job)
+            self._active[key] = job.job_id
+        
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.job_id
+    
+    def _run(self, job, fn, args, kwargs):
+        """İşi havuz thread'inde çalıştırır; durumunu ve sonucunu kaydeder."""
+        job.status = 'running'
+        try:
+            result = fn(job, *args, **kwargs)
+        except Exception:
+            job.error = traceback.format_exc()
+            job.status = 'failed'
+        else:
+            if job.cancelled:
+                job.status = 'cancelled'
+            else:
+                job.result = result
+                self._store_result(job.key, result)
+                job.status = 'done'
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get(job.key) == job.job_id:
+                    del self._active[job.key]
+    
+    def _store_result(self, key, result):
+        """Sonucu önbelleğe ekler; sınır aşılırsa en eski sonucu atar (LRU)."""
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+    
+    def _add_job(self, job):
+        """İşi kaydeder; sınır aşılırsa en eski bitmiş işleri unutur."""
+        self._jobs[job.job_id] = job
+        if len(self._jobs) > self.max_jobs:
+            for job_id in [job_id for job_id, old in self._jobs.items() if old.finished]:
+                if len(self._jobs) <= self.max_jobs:
+                    break
+                del self._jobs[job_id]
+    
+    def get(self, job_id):
+        """
+        İş kimliğine karşılık gelen işi döndürür.
+        
+        Parameters:
+        -----------
+        job_id : str
+            submit() ile dönen iş kimliği
+        
+        Returns:
+        --------
+        Job or None
+            İş bulunamazsa (veya unutulduysa) None
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def cancel(self, job_id):
+        """
+        Çalışan işin iptalini ister.
+        
+        Parameters:
+        -----------
+        job_id : str
+            submit() ile dönen iş kimliği
+        """
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+    
+    def shutdown(self, wait=True):
+        """
+        Thread havuzunu kapatır.
+        
+        Parameters:
+        -----------
+        wait : bool
+            Çalışan işlerin bitmesi beklensin mi
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,330 @@
+"""
+Karınca Rotaları için Yerel Arama (2-opt ve Or-opt)
+Komşu listeleri ve "don't-look bit"ler ile büyük N'de ölçeklenir
+"""
+
+from collections import deque
+
+import numpy as np
+
+# Kayan nokta hataları nedeniyle sonsuz döngüye girmemek için en küçük kazanç
+_MIN_GAIN = 1e-10
+
+def tour_length(tour, distance_matrix):
+    """Kapalı turun toplam uzunluğunu hesaplar."""
+    tour = np.asarray(tour)
+    return float(distance_matrix[tour, np.roll(tour, -1)].sum())
+
+def two_opt(tour, distance_matrix, neighbor_lists, max_moves=None):
+    """
+    Turu komşu listeli 2-opt ile iyileştirir.
+    
+    Her şehir için tüm aday komşuların kazancı tek seferde (vektörel)
+    hesaplanır; en iyi iyileştirici hamle uygulanır. İyileşme bulunamayan
+    şehirlerin "don't-look bit"i kapanır ve yalnızca bir hamle ile uçları
+    değişen şehirler tekrar kuyruğa alınır.
+    
+    Parameters:
+    -----------
+    tour : sequence of int
+        Başlangıç turu (0 ile başlar)
+    distance_matrix : numpy.ndarray
+        Simetrik mesafe matrisi
+    neighbor_lists : numpy.ndarray
+        (N, k) boyutunda en yakın komşu listeleri
+    max_moves : int, optional
+        Uygulanacak en fazla hamle sayısı
+    
+    Returns:
+    --------
+    tuple
+        (improved_tour, num_moves) - tur 0 ile başlayacak şekilde döndürülür
+    """
+    tour = np.array(tour, dtype=np.intp)
+    n = len(tour)
+    if n < 4:
+        return tour, 0
+    
+    position = np.empty(n, dtype=np.intp)
+    position[tour] = np.arange(n)
+    
+    queue = deque(tour.tolist())
+    active = np.ones(n, dtype=bool)
+    num_moves = 0
+    
+    while queue and (max_moves is None or num_moves < max_moves):
+        a = queue.popleft()
+        active[a] = False
+        
+        move = _best_two_opt_move(a, tour, position, distance_matrix, neighbor_lists)
+        if move is None:
+            continue
+        
+        endpoints = _apply_two_opt(tour, position, *move)
+        num_moves += 1
+        
+        # Uçları değişen şehirlerin don't-look bit'lerini aç
+        for city in endpoints:
+            if not active[city]:
+                active[city] = True
+                queue.append(city)
+    
+    return _rotate_to_start(tour), num_moves
+
+def _best_two_opt_move(a, tour, position, distance_matrix, neighbor_lists):
+    """
+    a şehri için en iyi 2-opt hamlesini bulur.
+    
+    Returns:
+    --------
+    tuple or None
+        (x, y): (x, succ(x)) ve (y, succ(y)) kenarlarını çıkarıp (x, y) ve
+        (succ(x), succ(y)) kenarlarını ekleyen hamle; iyileşme yoksa None
+    """
+    n = len(tour)
+    candidates = neighbor_lists[a]
+    i = position[a]
+    succ_a = tour[(i + 1) % n]
+    pred_a = tour[i - 1]
+    
+    candidate_positions = position[candidates]
+    succ_c = tour[(candidate_positions + 1) % n]
+    pred_c = tour[candidate_positions - 1]
+    
+    d_ac = distance_matrix[a, candidates]
+    
+    # Ardıl tipi: (a, succ a) ve (c, succ c) yerine (a, c) ve (succ a, succ c)
+    succ_gain = (distance_matrix[a, succ_a] + distance_matrix[candidates, succ_c]
+                 - d_ac - distance_matrix[succ_a, succ_c])
+    succ_gain[(candidates == succ_a) | (succ_c == a)] = -np.inf
+    
+    # Öncül tipi: (pred a, a) ve (pred c, c) yerine (a, c) ve (pred a, pred c)
+    pred_gain = (distance_matrix[pred_a, a] + distance_matrix[pred_c, candidates]
+                 - d_ac - distance_matrix[pred_a, pred_c])
+    pred_gain[(candidates == pred_a) | (pred_c == a)] = -np.inf
+    
+    best_succ = int(np.argmax(succ_gain))
+    best_pred = int(np.argmax(pred_gain))
+    
+    if succ_gain[best_succ] >= pred_gain[best_pred]:
+        if succ_gain[best_succ] > _MIN_GAIN:
+            return a, candidates[best_succ]
+    elif pred_gain[best_pred] > _MIN_GAIN:
+        # Öncül tipi hamle, (pred a, pred c) için ardıl tipi hamle ile aynıdır
+        return pred_a, pred_c[best_pred]
+    return None
+
+def _apply_two_opt(tour, position, x, y):
+    """
+    (x, succ x) ve (y, succ y) kenarlarını kaldırıp aradaki yolu ters çevirir.
+    Daha kısa olan taraf ters çevrilir.
+    
+    Returns:
+    --------
+    tuple
+        Uçları değişen dört şehir
+    """
+    n = len(tour)
+    i, j = position[x], position[y]
+    succ_x, succ_y = tour[(i + 1) % n], tour[(j + 1) % n]
+    
+    # succ x ... y yolunu (döngüsel) ters çevir; diğer taraf daha kısaysa onu
+    start, end = (i + 1) % n, j
+    length = (end - start) % n + 1
+    if length > n - length:
+        start, end = (j + 1) % n, i
+        length = n - length
+    
+    indices = (start + np.arange(length)) % n
+    tour[indices] = tour[indices[::-1]]
+    position[tour[indices]] = indices
+    
+    return x, y, succ_x, succ_y
+
+def or_opt(tour, distance_matrix, neighbor_lists, segment_lengths=(1, 2, 3), max_moves=None,
+           allow_reverse=True):
+    """
+    Turu Or-opt ile iyileştirir: 1-3 şehirlik bir segmenti (gerekirse ters
+    çevirerek) komşu listesindeki bir şehrin yanına taşır. Segment ters
+    çevrilmezse kenar yönleri korunur; asimetrik matrislerde de geçerlidir.
+    
+    Parameters:
+    -----------
+    tour : sequence of int
+        Başlangıç turu
+    distance_matrix : numpy.ndarray
+        Mesafe matrisi (allow_reverse=True ise simetrik)
+    neighbor_lists : numpy.ndarray
+        (N, k) boyutunda en yakın komşu listeleri
+    segment_lengths : tuple of int
+        Denenecek segment uzunlukları
+    max_moves : int, optional
+        Uygulanacak en fazla hamle sayısı
+    allow_reverse : bool
+        Segmentin ters çevrilerek eklenmesine izin verilir mi
+    
+    Returns:
+    --------
+    tuple
+        (improved_tour, num_moves) - tur 0 ile başlayacak şekilde döndürülür
+    """
+    tour = np.array(tour, dtype=np.intp)
+    n = len(tour)
+    if n < 5:
+        return tour, 0
+    
+    position = np.empty(n, dtype=np.intp)
+    position[tour] = np.arange(n)
+    
+    queue = deque(tour.tolist())
+    active = np.ones(n, dtype=bool)
+    num_moves = 0
+    
+    while queue and (max_moves is None or num_moves < max_moves):
+        a = queue.popleft()
+        active[a] = False
+        
+        move = _best_or_opt_move(a, tour, position, distance_matrix,
+                                 neighbor_lists, segment_lengths, allow_reverse)
+        if move is None:
+            continue
+        
+        tour, touched = _apply_or_opt(tour, *move)
+        position[tour] = np.arange(n)
+        num_moves += 1
+        
+        for city in touched:
+            if not active[city]:
+                active[city] = True
+                queue.append(city)
+    
+    return _rotate_to_start(tour), num_moves
+
+def _best_or_opt_move(a, tour, position, distance_matrix, neighbor_lists, segment_lengths,
+                      allow_reverse=True):
+    """
+    a ile başlayan segmentler için en iyi Or-opt hamlesini bulur.
+    
+    Returns:
+    --------
+    tuple or None
+        (segment_start_position, segment_length, c, reverse): segment c ile
+        succ(c) arasına taşınır; iyileşme yoksa None
+    """
+    n = len(tour)
+    i = position[a]
+    best = None
+    best_gain = _MIN_GAIN
+    
+    for length in segment_lengths:
+        if length > n - 3:
+            break
+        
+        segment_positions = (i + np.arange(length)) % n
+        e = tour[segment_positions[-1]]
+        prev = tour[i - 1]
+        nxt = tour[(segment_positions[-1] + 1) % n]
+        
+        removal_gain = (distance_matrix[prev, a] + distance_matrix[e, nxt]
+                        - distance_matrix[prev, nxt])
+        
+        # Segmentin bir ucuna yakın şehirlerin yanına ekleme denenir
+        candidates = np.unique(np.concatenate([neighbor_lists[a], neighbor_lists[e]]))
+        segment = tour[segment_positions]
+        
+        succ_c = tour[(position[candidates] + 1) % n]
+        valid = (~np.isin(candidates, segment) & ~np.isin(succ_c, segment)
+                 & (candidates != prev))
+        if not valid.any():
+            continue
+        candidates, succ_c = candidates[valid], succ_c[valid]
+        
+        d_c_succ = distance_matrix[candidates, succ_c]
+        forward = d_c_succ - distance_matrix[candidates, a] - distance_matrix[e, succ_c]
+        insertions = [(False, forward)]
+        if allow_reverse:
+            backward = d_c_succ - distance_matrix[candidates, e] - distance_matrix[a, succ_c]
+            insertions.append((True, backward))
+        
+        for reverse, insertion_gain in insertions:
+            k = int(np.argmax(insertion_gain))
+            gain = removal_gain + insertion_gain[k]
+            if gain > best_gain:
+                best_gain = gain
+                best = (i, length, candidates[k], reverse)
+    
+    return best
+
+def _apply_or_opt(tour, start, length, c, reverse):
+    """Segmenti turdan çıkarıp c'nin arkasına ekler; yeni turu döndürür."""
+    n = len(tour)
+    segment_positions = (start + np.arange(length)) % n
+    segment = tour[segment_positions]
+    
+    keep = np.ones(n, dtype=bool)
+    keep[segment_positions] = False
+    rest = tour[keep]
+    
+    prev = tour[start - 1]
+    nxt = tour[(segment_positions[-1] + 1) % n]
+    insert_at = int(np.flatnonzero(rest == c)[0]) + 1
+    succ_c = rest[insert_at % len(rest)]
+    
+    if reverse:
+        segment = segment[::-1]
+    
+    new_tour = np.concatenate([rest[:insert_at], segment, rest[insert_at:]])
+    touched = (prev, nxt, c, succ_c, segment[0], segment[-1])
+    return new_tour, touched
+
+def _rotate_to_start(tour, start_city=0):
+    """Turu start_city ile başlayacak şekilde döndürür."""
+    shift = int(np.flatnonzero(tour == start_city)[0])
+    return np.roll(tour, -shift) if shift else tour
+
+def improve_tour(tour, distance_matrix, neighbor_lists, method='2opt', symmetric=True):
+    """
+    Seçilen yerel arama yöntemini tura uygular.
+    
+    2-opt bir yolu ters çevirdiği için yalnızca simetrik matrislerde
+    geçerlidir; asimetrik matrislerde her iki yöntem de segmenti ters
+    çevirmeyen Or-opt'a döner.
+    
+    Parameters:
+    -----------
+    tour : sequence of int
+        Başlangıç turu
+    distance_matrix : numpy.ndarray
+        Mesafe matrisi
+    neighbor_lists : numpy.ndarray
+        (N, k) boyutunda en yakın komşu listeleri
+    method : str
+        '2opt' veya '2opt+oropt' (2-opt ve Or-opt, iyileşme durana kadar)
+    symmetric : bool
+        Mesafe matrisi simetrik mi
+    
+    Returns:
+    --------
+    tuple
+        (improved_tour, num_moves)
+    """
+    if method not in ('2opt', '2opt+oropt'):
+        raise ValueError(f"Bilinmeyen yerel arama yöntemi: {method}")
+    
+    if not symmetric:
+        return or_opt(tour, distance_matrix, neighbor_lists, allow_reverse=False)
+    
+    tour, num_moves = two_opt(tour, distance_matrix, neighbor_lists)
+    if method == '2opt':
+        return tour, num_moves
+    
+    while True:
+        tour, or_moves = or_opt(tour, distance_matrix, neighbor_lists)
+        num_moves += or_moves
+        if not or_moves:
+            return tour, num_moves
+        
+        tour, two_opt_moves = two_opt(tour, distance_matrix, neighbor_lists)
+        num_moves += two_opt_moves
+        if not two_opt_moves:
+            return tour, num_moves
@@ -0,0 +1,214 @@
+"""
+Lokasyon Ekleme/Çıkarmada Artımlı Mesafe Matrisi Güncelleme
+Önceki matris diskte tutulur; yalnızca yeni satır ve sütunlar hesaplanır
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from core.haversine import _haversine_block
+from core.matrix_utils import (
+    fetch_distance_matrix_with_google,
+    load_matrix_bundle,
+    save_matrix_bundle,
+    _bundle_paths
+)
+
+# Paket yolu başına kilit: aynı dosyayı güncelleyen işler (ör. arayüzdeki
+# eşzamanlı arka plan işleri) sırayla okur ve yazar
+_PATH_LOCKS = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+def _path_lock(filename):
+    """Paket dosyasına ait (mutlak yola göre) süreç içi kilidi döndürür."""
+    key = os.path.abspath(_bundle_paths(filename)[2])
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(key, threading.Lock())
+
+class MatrixStore:
+    """
+    Diskte saklanan mesafe matrisini yeni lokasyon kümesiyle eşitler.
+    
+    Yeni küme, daha önce kaydedilen küme ile isim ve koordinata göre
+    karşılaştırılır: korunan lokasyonların değerleri eski matristen yeni
+    indekslere taşınır, silinenler atılır ve yalnızca eklenen lokasyonların
+    satır/sütunları hesaplanır. N mevcut noktaya k nokta eklemek O(k·N) iş
+    (Google için O(k·N) eleman) gerektirir.
+    """
+    
+    def __init__(self, filename, method='haversine', api_key=None, cache=None,
+                 **fetch_options):
+        """
+        Parameters:
+        -----------
+        filename : str
+            Matris paketinin adı (bkz. save_matrix_bundle)
+        method : str
+            'haversine' (kuş uçuşu) veya 'google' (gerçek yol)
+        api_key : str, optional
+            Google Maps API anahtarı (method='google' için)
+        cache : DistanceCache, optional
+            Çift bazında kalıcı mesafe önbelleği
+        **fetch_options
+            fetch_distance_matrix_with_google için ek parametreler
+        """
+        if method not in ('haversine', 'google'):
+            raise ValueError(f"Bilinmeyen mesafe yöntemi: {method}")
+        
+        self.filename = filename
+        self.method = method
+        self.api_key = api_key
+        self.cache = cache
+        self.fetch_options = fetch_options
+    
+    def _load_previous(self):
+        """Aynı yöntemle kaydedilmiş önceki paketi (varsa) yükler."""
+        _, _, meta_path = _bundle_paths(self.filename)
+        if not os.path.exists(meta_path):
+            return None
+        
+        bundle = load_matrix_bundle(self.filename, mmap_mode='r')
+        meta = bundle['metadata']
+        if meta.get('method') != self.method or 'coordinates' not in meta:
+            return None
+        return bundle
+    
+    def update(self, locations_dict):
+        """
+        Matrisi verilen lokasyon kümesine göre günceller ve kaydeder.
+        
+        Aynı paket yolunu kullanan güncellemeler (farklı MatrixStore
+        nesnelerinden de olsa) bir kilitle sıralanır: önceki paketin okunması
+        ile yeni paketin .npy ve .json dosyalarının yazılması arasına başka
+        bir güncelleme giremez.
+        
+        Parameters:
+        -----------
+        locations_dict : dict
+            {name: {lat: float, lon: float, ...}} formatında lokasyon sözlüğü
+        
+        Returns:
+        --------
+        dict
+            {'distance_matrix', 'duration_matrix' (haversine için None),
+             'location_names', 'added', 'removed', 'failed_cells'}
+        """
+        with _path_lock(self.filename):
+            return self._update(locations_dict)
+    
+    def _update(self, locations_dict):
+        """update() gövdesi; paket kilidi tutulurken çağrılır."""
+        location_names = list(locations_dict.keys())
+        coordinates = [(float(locations_dict[name]["lat"]), float(locations_dict[name]["lon"]))
+                       for name in location_names]
+        n = len(location_names)
+        
+        previous = self._load_previous()
+        previous_index = {}
+        if previous is not None:
+            previous_coordinates = previous['metadata']['coordinates']
+            # İsmi aynı fakat koordinatı değişmiş lokasyon yeni sayılır
+            previous_index = {(name, tuple(coordinate)): i for i, (name, coordinate)
+                              in enumerate(zip(previous['location_names'], previous_coordinates))}
+        
+        old_positions = np.array([previous_index.get((name, coordinate), -1)
+                                  for name, coordinate in zip(location_names, coordinates)],
+                                 dtype=np.intp)
+        kept = np.flatnonzero(old_positions >= 0)
+        added = np.flatnonzero(old_positions < 0)
+        
+        distance_matrix = np.full((n, n), np.nan)
+        duration_matrix = np.full((n, n), np.nan) if self.method == 'google' else None
+        
+        # Korunan lokasyonlar: eski değerleri yeni indekslere taşı
+        if len(kept):
+            source = np.ix_(old_positions[kept], old_positions[kept])
+            target = np.ix_(kept, kept)
+            distance_matrix[target] = previous['distance_matrix'][source]
+            if duration_matrix is not None and previous['duration_matrix'] is not None:
+                duration_matrix[target] = previous['duration_matrix'][source]
+        np.fill_diagonal(distance_matrix, 0.0)
+        if duration_matrix is not None:
+            np.fill_diagonal(duration_matrix, 0.0)
+        
+        failed_cells = []
+        if self.method == 'haversine':
+            self._fill_haversine(distance_matrix, coordinates, added)
+        else:
+            failed_cells = self._fill_google(distance_matrix, duration_matrix,
+                                             locations_dict, added)
+        
+        removed = []
+        if previous is not None:
+            kept_old = set(old_positions[kept].tolist())
+            removed = [name for i, name in enumerate(previous['location_names'])
+                       if i not in kept_old]
+        
+        # Eski memmap bağlantıları yazmadan önce bırakılır
+        previous = None
+        
+        save_matrix_bundle(self.filename, distance_matrix, location_names,
+                           duration_matrix=duration_matrix, source=self.method,
+                           metadata={'method': self.method,
+                                     'coordinates': [list(c) for c in coordinates]})
+        
+        return {
+            'distance_matrix': distance_matrix,
+            'duration_matrix': duration_matrix,
+            'location_names': location_names,
+            'added': [location_names[i] for i in added],
+            'removed': removed,
+            'failed_cells': failed_cells
+        }
+    
+    def _fill_haversine(self, distance_matrix, coordinates, added):
+        """Eklenen lokasyonların satır ve sütunlarını Haversine ile doldurur."""
+        if not len(added):
+            return
+        
+        coords = np.radians(np.asarray(coordinates, dtype=np.float64))
+        lat = coords[:, 0]
+        lon = coords[:, 1]
+        
+        # k x N blok; mesafe simetrik olduğundan sütunlar satırların aynası
+        rows = _haversine_block(lat[added, None], lon[added, None],
+                                lat[None, :], lon[None, :])
+        rows[np.arange(len(added)), added] = 0.0
+        distance_matrix[added, :] = rows
+        distance_matrix[:, added] = rows.T
+    
+    def _fill_google(self, distance_matrix, duration_matrix, locations_dict, added):
+        """
+        Eklenen satır/sütunları ve önceki çalıştırmada alınamamış (NaN)
+        hücreleri Google Distance Matrix API ile doldurur.
+        """
+        n = len(distance_matrix)
+        is_added = np.zeros(n, dtype=bool)
+        is_added[added] = True
+        
+        # Dikdörtgen bloklar ayrı istenir: (yeni x tümü) ve (eski x yeni);
+        # böylece karışık bloklarda gereksiz eleman istenmez
+        requests = [
+            np.outer(is_added, np.ones(n, dtype=bool)),
+            np.outer(~is_added, is_added),
+            np.isnan(distance_matrix) & ~is_added[:, None] & ~is_added[None, :]
+        ]
+        
+        failed_cells = []
+        for cells in requests:
+            if not cells.any():
+                continue
+            
+            result = fetch_distance_matrix_with_google(
+                self.api_key, locations_dict, cache=self.cache, cells=cells,
+                **self.fetch_options)
+            
+            distance_matrix[cells] = result.distance_matrix[cells]
+            duration_matrix[cells] = result.duration_matrix[cells]
+            failed_cells.extend(result.failed_cells)
+        
+        np.fill_diagonal(distance_matrix, 0.0)
+        np.fill_diagonal(duration_matrix, 0.0)
+        return failed_cells
@@ -2,21 +2,75 @@
 Google Maps API ile Gerçek Yol Mesafesi Matrisi Oluşturma
 """
 
-import googlemaps
+import json
 import numpy as np
+import os
+import random
+import tempfile
+import threading
 import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 
-def create_distance_matrix_with_google(api_key, locations_dict):
+from core.rate_limit import TokenBucket
+
+# Distance Matrix API istek limitleri: istek başına en fazla 25 başlangıç,
+# 25 varış ve (standart planda) 100 eleman
+MAX_ORIGINS = 25
+MAX_DESTINATIONS = 25
+MAX_ELEMENTS = 100
+
+# Tekrar denenebilecek (geçici) API durumları
+RETRIABLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR", "RESOURCE_EXHAUSTED"}
+
+@dataclass
+class DistanceMatrixResult:
+    """
+    Google Distance Matrix çağrısının yapılandırılmış sonucu.
+    
+    Attributes:
+    -----------
+    distance_matrix : numpy.ndarray
+        km cinsinden mesafeler; alınamayan hücreler NaN
+    duration_matrix : numpy.ndarray
+        dakika cinsinden süreler; alınamayan hücreler NaN
+    location_names : list
+        Lokasyon isimleri (matris sırası)
+    failed_cells : list of dict
+        Alınamayan hücreler: {origin_index, destination_index, origin,
+        destination, status, error}
+    num_requests : int
+        Gönderilen API isteği sayısı (tekrar denemeler dahil)
+    num_cached : int
+        Önbellekten okunan hücre sayısı
+    """
+    distance_matrix: np.ndarray
+    duration_matrix: np.ndarray
+    location_names: list
+    failed_cells: list = field(default_factory=list)
+    num_requests: int = 0
+    num_cached: int = 0
+
+def create_distance_matrix_with_google(api_key, locations_dict, **kwargs):
     """
     Google Maps Distance Matrix API kullanarak gerçek yol mesafelerini hesaplar.
     
+    fetch_distance_matrix_with_google için geriye dönük uyumlu sarmalayıcıdır:
+    alınamayan hücreler 0 olarak yazılır ve sayıları bir uyarı ile bildirilir.
+    Hücre bazında hata bilgisi için fetch_distance_matrix_with_google
+    kullanılmalıdır.
+    
     Parameters:
     -----------
     api_key : str
         Google Maps API anahtarı
     locations_dict : dict
         {name: {lat: float, lon: float, adres: str}} formatında lokasyon sözlüğü
+    **kwargs
+        fetch_distance_matrix_with_google parametreleri
     
     Returns:
     --------
@@ -26,67 +80,269 @@ def create_distance_matrix_with_google(api_key, locations_dict):
         - duration_matrix: numpy array, dakika cinsinden süreler
         - location_names: list, lokasyon isimleri
     """
-    # Google Maps client oluştur
-    gmaps = googlemaps.Client(key=api_key)
+    result = fetch_distance_matrix_with_google(api_key, locations_dict, **kwargs)
+    
+    if result.failed_cells:
+        warnings.warn(f"{len(result.failed_cells)} hücre için mesafe alınamadı, 0 yazıldı")
+    
+    distance_matrix = np.nan_to_num(result.distance_matrix, nan=0.0)
+    duration_matrix = np.nan_to_num(result.duration_matrix, nan=0.0)
+    
+    return distance_matrix, duration_matrix, result.location_names
+
+def fetch_distance_matrix_with_google(api_key, locations_dict,
+                                      max_origins=MAX_ORIGINS,
+                                      max_destinations=MAX_DESTINATIONS,
+                                      max_elements=MAX_ELEMENTS,
+                                      cache=None, mode="driving",
+                                      max_concurrent_requests=4,
+                                      elements_per_second=1000,
+                                      max_retries=5,
+                                      backoff_base=0.5,
+                                      backoff_max=30.0,
+                                      cells=None):
+    """
+    Google Maps Distance Matrix API ile mesafe/süre matrislerini eşzamanlı
+    isteklerle oluşturur.
     
+    NxN matris, API limitlerine uyan en büyük başlangıç x varış bloklarına
+    bölünür ve her blok için tek bir istek gönderilir. Bloklar bir thread
+    havuzunda eşzamanlı istenir; toplam hız, kotaya göre ayarlanan bir token
+    bucket ile (saniye başına eleman) sınırlanır. Geçici hatalar
+    (OVER_QUERY_LIMIT, ağ hataları, ...) jitter'lı üstel geri çekilme ile
+    tekrar denenir. Önbellek verilirse yalnızca önbellekte bulunmayan
+    çiftler istenir; tümü önbellekteyse hiç API çağrısı yapılmaz.
+    
+    Parameters:
+    -----------
+    api_key : str
+        Google Maps API anahtarı
+    locations_dict : dict
+        {name: {lat: float, lon: float, adres: str}} formatında lokasyon sözlüğü
+    max_origins : int
+        Bir istekteki en fazla başlangıç noktası sayısı
+    max_destinations : int
+        Bir istekteki en fazla varış noktası sayısı
+    max_elements : int
+        Bir istekteki en fazla eleman (başlangıç x varış) sayısı
+    cache : DistanceCache, optional
+        Çift bazında kalıcı mesafe önbelleği (core.distance_cache)
+    mode : str
+        Ulaşım modu (driving, walking, bicycling, transit)
+    max_concurrent_requests : int
+        Aynı anda gönderilebilecek en fazla istek sayısı
+    elements_per_second : float
+        Kota: saniye başına izin verilen eleman sayısı
+    max_retries : int
+        Geçici hatalarda blok başına en fazla tekrar deneme sayısı
+    backoff_base : float
+        İlk geri çekilme süresi (saniye); her denemede iki katına çıkar
+    backoff_max : float
+        En uzun geri çekilme süresi (saniye)
+    cells : numpy.ndarray, optional
+        (N, N) boolean maske; verilirse yalnızca True hücreler istenir,
+        diğerleri NaN kalır (artımlı güncelleme için)
+    
+    Returns:
+    --------
+    DistanceMatrixResult
+        Matrisler, lokasyon isimleri ve alınamayan hücrelerin listesi
+    """
     # Lokasyon isimlerini ve koordinatlarını al
     location_names = list(locations_dict.keys())
     n = len(location_names)
+    coordinates = [(locations_dict[name]["lat"], locations_dict[name]["lon"])
+                   for name in location_names]
     
-    # Mesafe ve süre matrisleri oluştur
-    distance_matrix = np.zeros((n, n))
-    duration_matrix = np.zeros((n, n))
+    # Mesafe ve süre matrisleri - alınamayan hücreler NaN kalır
+    distance_matrix = np.full((n, n), np.nan)
+    duration_matrix = np.full((n, n), np.nan)
+    np.fill_diagonal(distance_matrix, 0.0)
+    np.fill_diagonal(duration_matrix, 0.0)
     
-    # Her lokasyon çifti için API'ye istek gönder
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            
-            # Origin ve destination koordinatları
-            origin = (locations_dict[location_names[i]]["lat"], 
-                     locations_dict[location_names[i]]["lon"])
-            destination = (locations_dict[location_names[j]]["lat"], 
-                          locations_dict[location_names[j]]["lon"])
-            
+    result = DistanceMatrixResult(distance_matrix, duration_matrix, location_names)
+    
+    # Hangi çiftlerin API'den istenmesi gerektiği (köşegen hariç)
+    missing = ~np.eye(n, dtype=bool)
+    if cells is not None:
+        missing &= np.asarray(cells, dtype=bool)
+    
+    if cache is not None:
+        cells = list(zip(*np.nonzero(missing)))
+        cached = cache.get_many([(coordinates[i], coordinates[j]) for i, j in cells], mode=mode)
+        for i, j in cells:
+            hit = cached.get((coordinates[i], coordinates[j]))
+            if hit is not None:
+                distance_matrix[i][j], duration_matrix[i][j] = hit
+                missing[i][j] = False
+        result.num_cached = len(cells) - int(missing.sum())
+    
+    if not missing.any():
+        return result
+    
+    blocks = list(_iter_missing_blocks(missing, max_origins, max_destinations, max_elements))
+    limiter = TokenBucket(elements_per_second, capacity=max(elements_per_second, max_elements))
+    clients = threading.local()
+    request_counts = []
+    
+    def fetch_block(origin_indices, destination_indices):
+        # googlemaps.Client thread'ler arasında paylaşılmaz
+        if not hasattr(clients, 'gmaps'):
+            import googlemaps
+            clients.gmaps = googlemaps.Client(key=api_key)
+        
+        for attempt in range(max_retries + 1):
+            limiter.acquire(len(origin_indices) * len(destination_indices))
+            request_counts.append(1)
             try:
                 # Distance Matrix API çağrısı
-                result = gmaps.distance_matrix(
-                    origins=origin,
-                    destinations=destination,
-                    mode="driving",  # Araba ile
+                return clients.gmaps.distance_matrix(
+                    origins=[coordinates[i] for i in origin_indices],
+                    destinations=[coordinates[j] for j in destination_indices],
+                    mode=mode,
                     language="tr",
                     units="metric"
                 )
-                
-                # Sonuçları kontrol et
-                if result['rows'][0]['elements'][0]['status'] == 'OK':
-                    # Mesafe (metre -> kilometre)
-                    distance_m = result['rows'][0]['elements'][0]['distance']['value']
-                    distance_matrix[i][j] = distance_m / 1000.0
-                    
-                    # Süre (saniye -> dakika)
-                    duration_s = result['rows'][0]['elements'][0]['duration']['value']
-                    duration_matrix[i][j] = duration_s / 60.0
-                else:
-                    print(f"Uyarı: {location_names[i]} -> {location_names[j]} mesafe bulunamadı!")
-                    distance_matrix[i][j] = 0
-                    duration_matrix[i][j] = 0
-                
-                # API rate limit'i aşmamak için kısa bekleme
-                time.sleep(0.1)
-                
             except Exception as e:
-                print(f"Hata: {location_names[i]} -> {location_names[j]} - {str(e)}")
-                distance_matrix[i][j] = 0
-                duration_matrix[i][j] = 0
+                if attempt == max_retries or not _is_retriable(e):
+                    raise
+                # Jitter'lı üstel geri çekilme (full jitter)
+                time.sleep(random.uniform(0, min(backoff_max, backoff_base * 2 ** attempt)))
+    
+    fetched = []
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent_requests)) as executor:
+        futures = {executor.submit(fetch_block, *block): block for block in blocks}
+        
+        for future in as_completed(futures):
+            origin_indices, destination_indices = futures[future]
+            
+            try:
+                response = future.result()
+            except Exception as e:
+                status = getattr(e, 'status', None) or type(e).__name__
+                for i in origin_indices:
+                    for j in destination_indices:
+                        if missing[i][j]:
+                            result.failed_cells.append(_failed_cell(
+                                i, j, location_names, status, str(e)))
+                continue
+            
+            for row, i in zip(response['rows'], origin_indices):
+                for element, j in zip(row['elements'], destination_indices):
+                    if not missing[i][j]:
+                        continue
+                    
+                    # Sonuçları kontrol et
+                    if element['status'] == 'OK':
+                        # Mesafe (metre -> kilometre)
+                        distance_matrix[i][j] = element['distance']['value'] / 1000.0
+                        
+                        # Süre (saniye -> dakika)
+                        duration_matrix[i][j] = element['duration']['value'] / 60.0
+                        
+                        fetched.append((coordinates[i], coordinates[j],
+                                        distance_matrix[i][j], duration_matrix[i][j]))
+                    else:
+                        result.failed_cells.append(_failed_cell(
+                            i, j, location_names, element['status'], None))
+    
+    result.num_requests = len(request_counts)
     
-    return distance_matrix, duration_matrix, location_names
+    # Yalnızca başarılı sonuçlar önbelleğe yazılır
+    if cache is not None:
+        cache.put_many(fetched, mode=mode)
+    
+    return result
+
+def _is_retriable(error):
+    """API hatasının geçici olup olmadığını (tekrar denenebilir) belirler."""
+    if getattr(error, 'status', None) in RETRIABLE_STATUSES:
+        return True
+    
+    import googlemaps
+    return isinstance(error, (googlemaps.exceptions.TransportError,
+                              googlemaps.exceptions.Timeout))
+
+def _failed_cell(i, j, location_names, status, error):
+    return {
+        'origin_index': int(i),
+        'destination_index': int(j),
+        'origin': location_names[i],
+        'destination': location_names[j],
+        'status': status,
+        'error': error
+    }
+
+def _iter_missing_blocks(missing, max_origins=MAX_ORIGINS,
+                         max_destinations=MAX_DESTINATIONS, max_elements=MAX_ELEMENTS):
+    """
+    Eksik hücre içeren satır/sütunları bloklar; her bloğu yalnızca eksik
+    hücresi olan satır ve sütunlara daraltır, tamamen dolu blokları atlar.
+    
+    Yields:
+    -------
+    tuple
+        (origin_block, destination_block) indeks listeleri
+    """
+    missing_rows = np.flatnonzero(missing.any(axis=1)).tolist()
+    missing_cols = np.flatnonzero(missing.any(axis=0)).tolist()
+    
+    for origin_indices, destination_indices in _iter_blocks(
+            missing_rows, missing_cols, max_origins, max_destinations, max_elements):
+        block_missing = missing[np.ix_(origin_indices, destination_indices)]
+        if not block_missing.any():
+            continue
+        yield ([i for i, row in zip(origin_indices, block_missing.any(axis=1)) if row],
+               [j for j, col in zip(destination_indices, block_missing.any(axis=0)) if col])
 
-def save_matrix_to_file(matrix, location_names, filename):
+def _iter_blocks(origin_indices, destination_indices, max_origins=MAX_ORIGINS,
+                 max_destinations=MAX_DESTINATIONS, max_elements=MAX_ELEMENTS):
+    """
+    Başlangıç x varış indekslerini API limitlerine uyan en büyük bloklara böler.
+    
+    Parameters:
+    -----------
+    origin_indices, destination_indices : sequence of int
+        Bloklanacak satır ve sütun indeksleri
+    max_origins, max_destinations, max_elements : int
+        İstek başına limitler
+    
+    Yields:
+    -------
+    tuple
+        (origin_block, destination_block) indeks listeleri
+    """
+    origin_indices = list(origin_indices)
+    destination_indices = list(destination_indices)
+    if not origin_indices or not destination_indices:
+        return
+    
+    # Toplam istek sayısını en aza indiren blok boyutunu seç
+    best = None
+    for destinations_per_block in range(1, min(len(destination_indices), max_destinations) + 1):
+        origins_per_block = min(len(origin_indices), max_origins,
+                                max_elements // destinations_per_block)
+        if origins_per_block < 1:
+            break
+        num_requests = (-(-len(origin_indices) // origins_per_block) *
+                        -(-len(destination_indices) // destinations_per_block))
+        if best is None or num_requests <= best[0]:
+            best = (num_requests, origins_per_block, destinations_per_block)
+    _, origins_per_block, destinations_per_block = best
+    
+    for o in range(0, len(origin_indices), origins_per_block):
+        for d in range(0, len(destination_indices), destinations_per_block):
+            yield (origin_indices[o:o + origins_per_block],
+                   destination_indices[d:d + destinations_per_block])
+
+def save_matrix_to_file(matrix, location_names, filename, duration_matrix=None, metadata=None):
     """
     Mesafe matrisini dosyaya kaydeder.
     
+    Uzantı .csv ise tablo olarak dışa aktarılır (yalnızca mesafe matrisi);
+    aksi halde ikili .npy + JSON paketi yazılır (bkz. save_matrix_bundle).
+    
     Parameters:
     -----------
     matrix : numpy.ndarray
@@ -95,31 +351,181 @@ def save_matrix_to_file(matrix, location_names, filename):
         Lokasyon isimleri
     filename : str
         Kaydedilecek dosya adı
+    duration_matrix : numpy.ndarray, optional
+        Süre matrisi (yalnızca ikili pakette saklanır)
+    metadata : dict, optional
+        Ek bilgiler (ör. {'source': 'google'})
     """
-    import pandas as pd
-    
-    df = pd.DataFrame(matrix, index=location_names, columns=location_names)
-    df.to_csv(filename)
+    if filename.lower().endswith('.csv'):
+        export_matrix_to_csv(matrix, location_names, filename)
+    else:
+        save_matrix_bundle(filename, matrix, location_names,
+                           duration_matrix=duration_matrix, metadata=metadata)
     print(f"Mesafe matrisi {filename} dosyasına kaydedildi.")
 
-def load_matrix_from_file(filename):
+def load_matrix_from_file(filename, mmap_mode='r'):
     """
     Dosyadan mesafe matrisini yükler.
     
     Parameters:
     -----------
     filename : str
-        Yüklenecek dosya adı
+        Yüklenecek dosya adı (.npy paketi veya eski .csv dosyası)
+    mmap_mode : str or None
+        İkili paket için numpy.load mmap_mode değeri; 'r' ile matris
+        kopyalanmadan (zero-copy) diskten eşlenir
     
     Returns:
     --------
     tuple
         (matrix, location_names)
     """
+    if filename.lower().endswith('.csv'):
+        import pandas as pd
+        
+        df = pd.read_csv(filename, index_col=0)
+        return df.values, list(df.index)
+    
+    bundle = load_matrix_bundle(filename, mmap_mode=mmap_mode)
+    return bundle['distance_matrix'], bundle['location_names']
+
+def export_matrix_to_csv(matrix, location_names, filename):
+    """
+    Matrisi isimli satır/sütunlarla CSV olarak dışa aktarır.
+    
+    Parameters:
+    -----------
+    matrix : numpy.ndarray
+        Mesafe veya süre matrisi
+    location_names : list
+        Lokasyon isimleri
+    filename : str
+        CSV dosya adı
+    """
     import pandas as pd
     
-    df = pd.read_csv(filename, index_col=0)
-    matrix = df.values
-    location_names = list(df.index)
+    df = pd.DataFrame(np.asarray(matrix), index=location_names, columns=location_names)
+    df.to_csv(filename)
+
+def _bundle_paths(filename):
+    """Paket dosya yollarını döndürür: (mesafe .npy, süre .npy, JSON)."""
+    base = filename[:-4] if filename.lower().endswith('.npy') else filename
+    return base + '.npy', base + '.duration.npy', base + '.json'
+
+def save_matrix_bundle(filename, distance_matrix, location_names, duration_matrix=None,
+                       units=None, source=None, metadata=None):
+    """
+    Mesafe (ve varsa süre) matrisini ham .npy dosyalarına, isimleri ve
+    üst bilgileri JSON yan dosyasına yazar.
+    
+    Dosyalar: <base>.npy (mesafe), <base>.duration.npy (süre),
+    <base>.json (isimler, birimler, kaynak, zaman damgası). .npy dosyaları
+    load_matrix_bundle ile mmap_mode='r' kullanılarak kopyasız açılabilir.
+    
+    Parameters:
+    -----------
+    filename : str
+        Paket adı (.npy uzantılı veya uzantısız)
+    distance_matrix : numpy.ndarray
+        Mesafe matrisi
+    location_names : list
+        Lokasyon isimleri
+    duration_matrix : numpy.ndarray, optional
+        Süre matrisi
+    units : dict, optional
+        Birimler (varsayılan: {'distance': 'km', 'duration': 'min'})
+    source : str, optional
+        Verinin kaynağı (ör. 'google', 'haversine')
+    metadata : dict, optional
+        JSON'a eklenecek ek bilgiler
+    """
+    distance_path, duration_path, meta_path = _bundle_paths(filename)
+    
+    directory = os.path.dirname(os.path.abspath(distance_path))
+    os.makedirs(directory, exist_ok=True)
+    
+    distance_matrix = np.asarray(distance_matrix)
+    _save_npy_atomic(distance_path, distance_matrix)
+    
+    if duration_matrix is not None:
+        _save_npy_atomic(duration_path, np.asarray(duration_matrix))
+    elif os.path.exists(duration_path):
+        # Eski paketten kalan süre matrisi yeni mesafelerle eşleşmez
+        os.remove(duration_path)
+    
+    meta = {
+        'location_names': list(location_names),
+        'shape': list(distance_matrix.shape),
+        'dtype': distance_matrix.dtype.str,
+        'units': units or {'distance': 'km', 'duration': 'min'},
+        'source': source,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'has_duration': duration_matrix is not None
+    }
+    if metadata:
+        meta.update(metadata)
+    
+    # JSON en son ve atomik olarak yazılır: yarım kalmış paket okunmaz
+    with _atomic_write(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+def _save_npy_atomic(path, array):
+    """
+    Diziyi geçici dosyaya yazıp yerine taşır; aynı dosyayı memmap ile açık
+    tutan okuyucular yarım/kesilmiş veri görmez.
+    """
+    with _atomic_write(path, 'wb') as f:
+        np.save(f, array)
+
+@contextmanager
+def _atomic_write(path, mode, **open_kwargs):
+    """
+    Aynı klasörde benzersiz adlı geçici dosyaya yazdırıp os.replace ile
+    yerine taşır. Sabit '.tmp' adı kullanılmadığı için aynı dosyaya eşzamanlı
+    yazan iki iş birbirinin geçici dosyasını kesemez; hata olursa geçici
+    dosya silinir ve hedef değişmez.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_matrix_bundle(filename, mmap_mode='r'):
+    """
+    save_matrix_bundle ile yazılmış paketi yükler.
+    
+    Parameters:
+    -----------
+    filename : str
+        Paket adı (.npy uzantılı veya uzantısız)
+    mmap_mode : str or None
+        numpy.load mmap_mode değeri ('r' = salt okunur, kopyasız)
+    
+    Returns:
+    --------
+    dict
+        {'distance_matrix', 'duration_matrix' (yoksa None),
+         'location_names', 'metadata'}
+    """
+    distance_path, duration_path, meta_path = _bundle_paths(filename)
+    
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    
+    distance_matrix = np.load(distance_path, mmap_mode=mmap_mode)
+    duration_matrix = None
+    if meta.get('has_duration'):
+        duration_matrix = np.load(duration_path, mmap_mode=mmap_mode)
     
-    return matrix, location_names
+    return {
+        'distance_matrix': distance_matrix,
+        'duration_matrix': duration_matrix,
+        'location_names': meta['location_names'],
+        'metadata': meta
+    }
@@ -0,0 +1,163 @@
+"""
+Karınca Kolonisi Algoritması için Çok Çekirdekli Rota Oluşturma
+Seçim ağırlık matrisi işçi süreçlerle paylaşılan bellek üzerinden paylaşılır
+"""
+
+import os
+
+import numpy as np
+
+# İşçi süreçte bağlanılmış paylaşılan bellek blokları: isim -> (blok, dizi)
+_ATTACHED = {}
+
+def resolve_n_jobs(n_jobs):
+    """
+    n_jobs değerini gerçek işçi sayısına çevirir.
+    
+    Parameters:
+    -----------
+    n_jobs : int or None
+        İşçi sayısı; negatif değerler çekirdek sayısına göre yorumlanır
+        (-1 = tüm çekirdekler, -2 = biri hariç tümü, ...)
+    
+    Returns:
+    --------
+    int
+        En az 1 olan işçi sayısı
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, int(n_jobs))
+
+class SharedColonyPool:
+    """
+    Bir iterasyondaki karıncaları işçi süreçlere dağıtan havuz.
+    
+    Seçim ağırlık matrisi (tau^alpha * eta^beta) ve aday listeleri bir kez
+    paylaşılan belleğe yerleştirilir; iterasyonlar arasında yalnızca yerinde
+    güncellenir, her görevde tekrar pickle edilmez. Her görev kendi bağımsız
+    SeedSequence alt akışı ile çalışır.
+    """
+    
+    def __init__(self, choice_info, candidate_list, n_jobs, executor=None,
+                 seed_sequence=None):
+        """
+        Parameters:
+        -----------
+        choice_info : numpy.ndarray
+            Başlangıç seçim ağırlık matrisi (paylaşılan belleğe kopyalanır)
+        candidate_list : numpy.ndarray or None
+            En yakın komşu listeleri
+        n_jobs : int
+            İşçi sayısı (karıncalar bu kadar parçaya bölünür)
+        executor : concurrent.futures.Executor, optional
+            Dışarıdan yönetilen havuz; verilmezse ProcessPoolExecutor açılır
+        seed_sequence : numpy.random.SeedSequence, optional
+            İşçi rastgele sayı akışlarının türetileceği kök tohum
+        """
+        self.n_jobs = n_jobs
+        self._owns_executor = executor is None
+        if executor is None:
+            # Süreç havuzu modülleri yalnızca n_jobs > 1 iken yüklenir
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=n_jobs)
+        self.executor = executor
+        self.seed_sequence = seed_sequence if seed_sequence is not None else np.random.SeedSequence()
+        
+        self._blocks = []
+        self.choice_info, self._choice_spec = self._share(choice_info)
+        
+        if candidate_list is not None:
+            self.candidate_list, self._candidate_spec = self._share(candidate_list)
+        else:
+            self.candidate_list, self._candidate_spec = None, None
+    
+    def _share(self, array):
+        """Diziyi yeni bir paylaşılan bellek bloğuna kopyalar."""
+        from multiprocessing import shared_memory
+        
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[...] = array
+        self._blocks.append(block)
+        return shared, (block.name, array.shape, array.dtype.str)
+    
+    def construct(self, num_ants, q0=None):
+        """
+        num_ants karıncanın rotalarını işçiler arasında paylaştırarak oluşturur.
+        
+        Parameters:
+        -----------
+        num_ants : int
+            Toplam karınca sayısı
+        q0 : float, optional
+            ACS sömürü olasılığı (bkz. _construct_tours)
+        
+        Returns:
+        --------
+        numpy.ndarray
+            (num_ants, num_cities) boyutunda birleştirilmiş rota dizisi
+        """
+        chunk_sizes = [len(chunk) for chunk in np.array_split(np.arange(num_ants), self.n_jobs)
+                       if len(chunk)]
+        seeds = self.seed_sequence.spawn(len(chunk_sizes))
+        
+        futures = [
+            self.executor.submit(_construct_chunk, self._choice_spec,
+                                 self._candidate_spec, size, seed, q0)
+            for size, seed in zip(chunk_sizes, seeds)
+        ]
+        return np.concatenate([future.result() for future in futures])
+    
+    def close(self):
+        """Havuzu (kendisi açtıysa) kapatır ve paylaşılan belleği serbest bırakır."""
+        if self._owns_executor:
+            self.executor.shutdown()
+        
+        # Tampona bakan diziler bırakılmadan blok kapatılamaz
+        self.choice_info = None
+        self.candidate_list = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _attach(spec):
+    """İşçi süreçte paylaşılan bellek bloğuna bağlanır (süreç başına bir kez)."""
+    name, shape, dtype = spec
+    if name not in _ATTACHED:
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(name=name)
+        _ATTACHED[name] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    return _ATTACHED[name][1]
+
+def _release_stale(active_names):
+    """Önceki çalıştırmalardan kalan blok bağlantılarını kapatır."""
+    for name in list(_ATTACHED):
+        if name not in active_names:
+            block, array = _ATTACHED.pop(name)
+            del array
+            block.close()
+
+def _construct_chunk(choice_spec, candidate_spec, num_ants, seed, q0=None):
+    """İşçi süreçte bir grup karıncanın rotalarını oluşturur."""
+    from core.ant_algorithm import _construct_tours
+    
+    active_names = {choice_spec[0]}
+    if candidate_spec is not None:
+        active_names.add(candidate_spec[0])
+    _release_stale(active_names)
+    
+    choice_info = _attach(choice_spec)
+    candidate_list = _attach(candidate_spec) if candidate_spec is not None else None
+    
+    rng = np.random.default_rng(seed)
+    return _construct_tours(choice_info, num_ants, candidate_list, rng, q0=q0)
@@ -0,0 +1,271 @@
+"""
+Feromon Güncelleme Stratejileri
+Ant System (AS), MAX-MIN Ant System (MMAS) ve Ant Colony System (ACS)
+"""
+
+import numpy as np
+
+def nearest_neighbor_tour_length(distance_matrix, start=0):
+    """
+    0. şehirden başlayan açgözlü en yakın komşu turunun uzunluğunu hesaplar.
+    Feromon sınırlarının (tau_max, tau0) başlangıç tahmini için kullanılır.
+    
+    Parameters:
+    -----------
+    distance_matrix : numpy.ndarray
+        Mesafe matrisi
+    start : int
+        Başlangıç şehri
+    
+    Returns:
+    --------
+    float
+        Tur uzunluğu (dönüş dahil)
+    """
+    n = len(distance_matrix)
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    current = start
+    length = 0.0
+    
+    for _ in range(n - 1):
+        row = np.array(distance_matrix[current], dtype=float)
+        row[visited] = np.inf
+        next_city = int(np.argmin(row))
+        length += row[next_city]
+        visited[next_city] = True
+        current = next_city
+    
+    return length + float(distance_matrix[current][start])
+
+def tour_edges(paths):
+    """
+    Rotaların kenarlarını (dönüş kenarı dahil) düz diziler olarak döndürür.
+    
+    Parameters:
+    -----------
+    paths : numpy.ndarray
+        (num_ants, num_cities) veya (num_cities,) boyutunda rota(lar)
+    
+    Returns:
+    --------
+    tuple
+        (from_cities, to_cities) - rota ile aynı boyutta
+    """
+    paths = np.asarray(paths, dtype=np.intp)
+    return paths, np.roll(paths, -1, axis=-1)
+
+class AntSystemStrategy:
+    """
+    Klasik Ant System: tüm feromonlar buharlaşır, her karınca rotasına
+    Q / mesafe kadar feromon bırakır.
+    """
+    
+    name = 'as'
+    
+    # ACS dışındaki stratejilerde sömürü (q0) kuralı ve yerel güncelleme yok
+    q0 = None
+    uses_local_update = False
+    
+    def initialize(self, aco):
+        """Başlangıç feromon değerlerini ayarlar (AS: 1 / N)."""
+        aco.pheromone.fill(1.0 / aco.num_cities)
+    
+    def update(self, aco, all_paths, all_distances):
+        """
+        Feromon matrisini iterasyon sonunda günceller.
+        
+        Returns:
+        --------
+        tuple or None
+            Yalnızca bazı kenarlar değiştiyse (from_cities, to_cities);
+            tüm matris değiştiyse None
+        """
+        # Buharlaşma
+        aco.pheromone *= (1 - aco.evaporation_rate)
+        
+        # Tüm rotalar tek bir indeks dizisinde: (num_ants, num_cities)
+        from_cities, to_cities = tour_edges(all_paths)
+        
+        # Kısa rotalar daha fazla feromon bırakır
+        deposits = aco.Q / np.asarray(all_distances, dtype=float)
+        amounts = np.broadcast_to(deposits[:, None], from_cities.shape)
+        
+        aco._deposit(from_cities, to_cities, amounts)
+        return None
+    
+    def local_update(self, aco, from_cities, to_cities):
+        """Karıncaların geçtiği kenarlara adım sonrası yerel güncelleme (ACS)."""
+        pass
+
+class MaxMinAntSystemStrategy(AntSystemStrategy):
+    """
+    MAX-MIN Ant System.
+    
+    Yalnızca tek bir tur (iterasyonun en iyisi, belirli aralıklarla şimdiye
+    kadarki en iyi) feromon bırakır, böylece bırakma işlemi O(N) olur.
+    Feromonlar [tau_min, tau_max] aralığında tutulur; en iyi çözüm uzun süre
+    iyileşmezse (durgunluk) feromonlar tau_max'a yeniden başlatılır.
+    
+    Buharlaşma ve kırpma her iterasyonda tüm matrise uygulanır, bu yüzden
+    update() değişen kenarları değil None döndürür ve seçim ağırlıkları
+    (AS'deki gibi) tamamen yeniden hesaplanır. Yalnızca tur kenarları O(N)'dir.
+    """
+    
+    name = 'mmas'
+    
+    def __init__(self, p_best=0.05, global_best_interval=10, stagnation_iterations=50):
+        """
+        Parameters:
+        -----------
+        p_best : float
+            Yakınsamada en iyi turun tekrar oluşturulma olasılığı; tau_min
+            bu değerden türetilir
+        global_best_interval : int
+            Kaç iterasyonda bir şimdiye kadarki en iyi turun bırakacağı
+            (diğer iterasyonlarda iterasyonun en iyisi)
+        stagnation_iterations : int
+            En iyi çözüm bu kadar iterasyon iyileşmezse feromonlar yeniden
+            başlatılır
+        """
+        self.p_best = p_best
+        self.global_best_interval = global_best_interval
+        self.stagnation_iterations = stagnation_iterations
+        
+        self.tau_max = None
+        self.tau_min = None
+        self._iteration = 0
+        self._last_best = float('inf')
+        self._stagnant = 0
+        self.num_restarts = 0
+    
+    def _set_limits(self, aco, best_distance):
+        """tau_max = Q / (rho * L_best), tau_min p_best'ten türetilir."""
+        n = aco.num_cities
+        self.tau_max = aco.Q / (aco.evaporation_rate * best_distance)
+        
+        p_root = self.p_best ** (1.0 / n)
+        average_choices = max(n / 2.0, 2.0)
+        self.tau_min = min(self.tau_max * (1 - p_root) / ((average_choices - 1) * p_root),
+                           self.tau_max)
+    
+    def initialize(self, aco):
+        """Feromonlar en yakın komşu turundan tahmin edilen tau_max ile başlar."""
+        self._set_limits(aco, nearest_neighbor_tour_length(aco.distance_matrix))
+        aco.pheromone.fill(self.tau_max)
+    
+    def update(self, aco, all_paths, all_distances):
+        """
+        Buharlaştırır, tek turu bırakır ve feromonları [tau_min, tau_max]
+        aralığına kırpar.
+        
+        Returns:
+        --------
+        None
+            Tüm matris değiştiği için her zaman None (tam yenileme); seyrek
+            yenileme yalnızca kenar bazında güncellenen ACS'de mümkündür
+        """
+        self._iteration += 1
+        
+        # Yeni en iyi çözümle sınırları güncelle ve durgunluğu takip et
+        if aco.best_distance < self._last_best:
+            self._last_best = aco.best_distance
+            self._set_limits(aco, aco.best_distance)
+            self._stagnant = 0
+        else:
+            self._stagnant += 1
+        
+        if self._stagnant >= self.stagnation_iterations:
+            # Durgunluk: feromonları yeniden başlat
+            aco.pheromone.fill(self.tau_max)
+            self._stagnant = 0
+            self.num_restarts += 1
+            return None
+        
+        # Buharlaşma
+        aco.pheromone *= (1 - aco.evaporation_rate)
+        
+        # Yalnızca tek tur bırakır - O(N)
+        if self._iteration % self.global_best_interval == 0:
+            best_path, best_distance = aco.best_path, aco.best_distance
+        else:
+            index = int(np.argmin(all_distances))
+            best_path, best_distance = all_paths[index], all_distances[index]
+        
+        from_cities, to_cities = tour_edges(best_path)
+        aco._deposit(from_cities, to_cities,
+                     np.full(from_cities.shape, aco.Q / best_distance))
+        
+        np.clip(aco.pheromone, self.tau_min, self.tau_max, out=aco.pheromone)
+        return None
+
+class AntColonySystemStrategy(AntSystemStrategy):
+    """
+    Ant Colony System.
+    
+    Seçimde q0 olasılıkla en yüksek ağırlıklı şehir seçilir (sömürü), aksi
+    halde rulet tekerleği kullanılır. Her adımda geçilen kenarlar yerel
+    olarak tau0'a doğru çekilir. Global güncelleme yalnızca şimdiye kadarki
+    en iyi turun kenarlarında yapılır (buharlaşma dahil O(N)).
+    """
+    
+    name = 'acs'
+    uses_local_update = True
+    
+    def __init__(self, q0=0.9, local_evaporation=0.1):
+        """
+        Parameters:
+        -----------
+        q0 : float
+            Sömürü (en iyi kenarı seçme) olasılığı
+        local_evaporation : float
+            Yerel güncellemedeki buharlaşma oranı (xi)
+        """
+        self.q0 = q0
+        self.local_evaporation = local_evaporation
+        self.tau0 = None
+    
+    def initialize(self, aco):
+        """tau0 = Q / (N * L_nn) - tüm kenarlar tau0 ile başlar."""
+        self.tau0 = aco.Q / (aco.num_cities * nearest_neighbor_tour_length(aco.distance_matrix))
+        aco.pheromone.fill(self.tau0)
+    
+    def update(self, aco, all_paths, all_distances):
+        # Yalnızca en iyi turun kenarları: tau = (1 - rho) tau + rho Q / L_best
+        from_cities, to_cities = tour_edges(aco.best_path)
+        rho = aco.evaporation_rate
+        
+        aco._update_edges(from_cities, to_cities, 1 - rho, rho * aco.Q / aco.best_distance)
+        return from_cities, to_cities
+    
+    def local_update(self, aco, from_cities, to_cities):
+        # tau = (1 - xi) tau + xi tau0
+        xi = self.local_evaporation
+        aco._update_edges(from_cities, to_cities, 1 - xi, xi * self.tau0)
+        aco._refresh_choice_info(from_cities, to_cities)
+
+PHEROMONE_STRATEGIES = {
+    'as': AntSystemStrategy,
+    'mmas': MaxMinAntSystemStrategy,
+    'acs': AntColonySystemStrategy
+}
+
+def make_pheromone_strategy(strategy):
+    """
+    İsim veya strateji nesnesinden feromon stratejisi oluşturur.
+    
+    Parameters:
+    -----------
+    strategy : str or AntSystemStrategy
+        'as', 'mmas', 'acs' veya hazır strateji nesnesi
+    
+    Returns:
+    --------
+    AntSystemStrategy
+    """
+    if isinstance(strategy, str):
+        try:
+            return PHEROMONE_STRATEGIES[strategy.lower()]()
+        except KeyError:
+            raise ValueError(f"Bilinmeyen feromon stratejisi: {strategy}")
+    return strategy
@@ -0,0 +1,217 @@
+"""
+Rota Optimizasyonu İş Akışı
+Mesafe matrisi oluşturma ve ACO çalıştırma (arayüzden bağımsız)
+"""
+
+import numpy as np
+
+from core.ant_algorithm import AntColonyOptimizer
+from core.haversine import create_haversine_matrix
+from core.time_windows import TimeWindowOptimizer, resolve_time_windows
+from core.vrp import VehicleRoutingOptimizer
+
+# Süre bilgisi olmayan mesafeler için ortalama hız (km/saat)
+AVERAGE_SPEED_KMH = 50
+
+def build_distance_matrix(locations, method='haversine', api_key=None, store_path=None,
+                          cache_config=None, fetch_options=None):
+    """
+    Lokasyonlar için mesafe matrisini oluşturur.
+    
+    Google Maps kullanılırken kayıtlı matris ve çift önbelleği ile yalnızca
+    eksik çiftler istenir; alınamayan hücreler kuş uçuşu mesafe ile
+    doldurulur. API hiç kullanılamazsa Haversine'e geri dönülür.
+    
+    Parameters:
+    -----------
+    locations : dict
+        {name: {lat: float, lon: float, ...}} formatında lokasyon sözlüğü
+    method : str
+        'google' (gerçek yol) veya 'haversine' (kuş uçuşu)
+    api_key : str, optional
+        Google Maps API anahtarı
+    store_path : str, optional
+        Google matris paketinin yolu (bkz. MatrixStore); verilmezse matris
+        paketi kullanılmaz, yalnızca çift önbelleği ile istenir
+    cache_config : dict, optional
+        DistanceCache parametreleri; verilmezse çift önbelleği kullanılmaz
+    fetch_options : dict, optional
+        fetch_distance_matrix_with_google için ek parametreler
+    
+    Returns:
+    --------
+    dict
+        {'distance_matrix', 'duration_matrix', 'location_names', 'method',
+         'messages'} - messages: arayüzde gösterilecek (seviye, metin) listesi;
+        seviye 'success', 'info', 'warning' veya 'error'
+    """
+    location_names = list(locations.keys())
+    coordinates = [(locations[name]["lat"], locations[name]["lon"]) for name in location_names]
+    messages = []
+    
+    if method == 'google':
+        try:
+            if not api_key:
+                raise ValueError("GOOGLE_MAPS_API_KEY tanımlı değil")
+            
+            # Google istemcisi ve önbellek modülleri yalnızca bu yolda yüklenir
+            from core.distance_cache import DistanceCache
+            from core.matrix_store import MatrixStore
+            from core.matrix_utils import fetch_distance_matrix_with_google
+            
+            # Daha önce alınmış çiftler önbellekten okunur, yalnızca eksikler istenir
+            distance_cache = DistanceCache(**cache_config) if cache_config else None
+            if store_path is not None:
+                # Kayıtlı matris ile karşılaştırılır, yalnızca yeni lokasyonlar istenir
+                matrix_store = MatrixStore(
+                    store_path, method='google', api_key=api_key,
+                    cache=distance_cache, **(fetch_options or {})
+                )
+                stored = matrix_store.update(locations)
+            else:
+                fetched = fetch_distance_matrix_with_google(
+                    api_key, locations, cache=distance_cache, **(fetch_options or {}))
+                stored = {'distance_matrix': fetched.distance_matrix,
+                          'duration_matrix': fetched.duration_matrix,
+                          'location_names': fetched.location_names,
+                          'failed_cells': fetched.failed_cells}
+            distance_matrix = stored['distance_matrix']
+            duration_matrix = stored['duration_matrix']
+            
+            failed = np.isnan(distance_matrix)
+            if failed.any():
+                # Alınamayan hücreler kuş uçuşu mesafe ile doldurulur
+                fallback_matrix = create_haversine_matrix(coordinates)
+                distance_matrix[failed] = fallback_matrix[failed]
+                duration_matrix[failed] = estimate_duration_matrix(fallback_matrix[failed])
+                messages.append(('warning',
+                    f"⚠️ {int(failed.sum())} lokasyon çifti için yol mesafesi "
+                    f"alınamadı, kuş uçuşu mesafe kullanıldı: " +
+                    ", ".join(f"{cell['origin']} → {cell['destination']} ({cell['status']})"
+                              for cell in stored['failed_cells'][:5])))
+            messages.append(('success', "✅ Google Maps API ile gerçek yol mesafeleri alındı!"))
+            
+            return {
+                'distance_matrix': distance_matrix,
+                'duration_matrix': duration_matrix,
+                'location_names': stored['location_names'],
+                'method': 'google',
+                'messages': messages
+            }
+        except Exception as e:
+            messages.append(('error', f"❌ Google Maps API hatası: {str(e)}"))
+            messages.append(('warning', "⚠️ Haversine formülü ile kuş uçuşu mesafeler kullanılacak."))
+    else:
+        messages.append(('info', "ℹ️ Haversine formülü ile kuş uçuşu mesafeler kullanıldı."))
+    
+    return {
+        'distance_matrix': create_haversine_matrix(coordinates),
+        'duration_matrix': None,
+        'location_names': location_names,
+        'method': 'haversine',
+        'messages': messages
+    }
+
+def estimate_duration_matrix(distance_matrix):
+    """Mesafelerden (km) ortalama hızla tahmini süre (dakika) hesaplar."""
+    return np.asarray(distance_matrix) / AVERAGE_SPEED_KMH * 60
+
+def make_optimizer(matrix, aco_params, vrp_params=None, time_window_params=None):
+    """
+    Mesafe matrisi sonucundan optimizer nesnesini oluşturur.
+    
+    Parameters:
+    -----------
+    matrix : dict
+        build_distance_matrix çıktısı
+    aco_params : dict
+        AntColonyOptimizer parametreleri (distance_matrix hariç)
+    vrp_params : dict, optional
+        Verilirse VehicleRoutingOptimizer parametreleri (demands,
+        vehicle_capacity, service_times, max_route_duration, num_vehicles);
+        süre matrisi yoksa (Haversine) ortalama hızla tahmin edilir
+    time_window_params : dict, optional
+        Verilirse TimeWindowOptimizer parametreleri; time_windows lokasyon
+        adına göre sözlük olabilir, default_window penceresi verilmeyen
+        lokasyonlara uygulanır (bkz. resolve_time_windows)
+    
+    Returns:
+    --------
+    AntColonyOptimizer, VehicleRoutingOptimizer or TimeWindowOptimizer
+    """
+    if vrp_params is not None and time_window_params is not None:
+        raise ValueError("VRP ve zaman penceresi modları birlikte kullanılamaz")
+    
+    if vrp_params is None and time_window_params is None:
+        return AntColonyOptimizer(distance_matrix=matrix['distance_matrix'], **aco_params)
+    
+    duration_matrix = matrix['duration_matrix']
+    if duration_matrix is None:
+        duration_matrix = estimate_duration_matrix(matrix['distance_matrix'])
+    
+    if time_window_params is not None:
+        params = dict(time_window_params)
+        params['time_windows'] = resolve_time_windows(matrix['location_names'],
+                                                      params.get('time_windows'),
+                                                      params.pop('default_window', None))
+        return TimeWindowOptimizer(distance_matrix=matrix['distance_matrix'],
+                                   duration_matrix=duration_matrix,
+                                   **params, **aco_params)
+    
+    return VehicleRoutingOptimizer(distance_matrix=matrix['distance_matrix'],
+                                   duration_matrix=duration_matrix,
+                                   **vrp_params, **aco_params)
+
+def run_route_optimization(locations, method, aco_params, api_key=None, callback=None,
+                           vrp_params=None, time_window_params=None, **matrix_options):
+    """
+    Mesafe matrisini oluşturup ACO ile en kısa rotayı bulur.
+    
+    Parameters:
+    -----------
+    locations : dict
+        {name: {lat: float, lon: float, ...}} formatında lokasyon sözlüğü
+    method : str
+        'google' veya 'haversine'
+    aco_params : dict
+        AntColonyOptimizer parametreleri (distance_matrix hariç)
+    api_key : str, optional
+        Google Maps API anahtarı
+    callback : callable, optional
+        AntColonyOptimizer.optimize callback'i; iterasyon listesine erişim
+        için ikinci argüman olarak optimizer nesnesi de verilir:
+        callback(aco, iteration, best_distance, best_path)
+    vrp_params : dict, optional
+        Çok araçlı rotalama parametreleri (bkz. make_optimizer); verilirse
+        aco_results içinde araç rotaları ('routes') da döner
+    time_window_params : dict, optional
+        Zaman pencereli rotalama parametreleri (bkz. make_optimizer);
+        verilirse aco_results içinde zaman çizelgesi ('schedule') da döner
+    **matrix_options
+        build_distance_matrix için store_path, cache_config, fetch_options
+    
+    Returns:
+    --------
+    dict
+        build_distance_matrix çıktısı + {'best_path', 'best_distance',
+        'iteration_history', 'aco_results'}
+    """
+    result = build_distance_matrix(locations, method, api_key, **matrix_options)
+    
+    aco = make_optimizer(result, aco_params, vrp_params, time_window_params)
+    
+    on_iteration = None
+    if callback is not None:
+        def on_iteration(iteration, best_distance, best_path):
+            return callback(aco, iteration, best_distance, best_path)
+    
+    best_path, best_distance, iteration_history = aco.optimize(verbose=False,
+                                                               callback=on_iteration)
+    
+    result.update({
+        'best_path': best_path,
+        'best_distance': best_distance,
+        'iteration_history': list(iteration_history),
+        'aco_results': aco.get_results()
+    })
+    return result
@@ -0,0 +1,68 @@
+"""
+API Kota Uyumlu İstek Hızı Sınırlama (Token Bucket)
+"""
+
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket hız sınırlayıcı.
+    
+    Kova saniyede `rate` token ile dolar ve en fazla `capacity` token tutar.
+    acquire() yeterli token birikene kadar çağıran thread'i bekletir; böylece
+    eşzamanlı istekler toplamda kotayı aşmaz, kısa süreli patlamalara ise
+    kapasite kadar izin verilir.
+    """
+    
+    def __init__(self, rate, capacity=None):
+        """
+        Parameters:
+        -----------
+        rate : float
+            Saniyede eklenen token sayısı (ör. saniye başına eleman kotası)
+        capacity : float, optional
+            Kovanın en fazla token sayısı (varsayılan: rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate pozitif olmalıdır")
+        
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+    
+    def acquire(self, tokens=1):
+        """
+        `tokens` adet token alınana kadar bekler.
+        
+        Parameters:
+        -----------
+        tokens : float
+            Harcanacak token sayısı (kapasiteden büyük olamaz)
+        
+        Returns:
+        --------
+        float
+            Toplam bekleme süresi (saniye)
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"İstenen token ({tokens}) kapasiteyi ({self.capacity}) aşıyor")
+        
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,456 @@
+"""
+Zaman Pencereli Gezgin Satıcı Problemi (TSPTW) için Karınca Kolonisi
+Lokasyonlara yalnızca erişim saatleri içinde varılabilir
+"""
+
+import numpy as np
+
+from core.ant_algorithm import AntColonyOptimizer, _roulette, is_symmetric
+from core.local_search import improve_tour
+
+OBJECTIVES = ('distance', 'duration', 'weighted')
+
+def parse_clock(value):
+    """
+    'HH:MM' saatini (veya dakikayı) gün başından itibaren dakikaya çevirir.
+    None veya boş değer sınırsız (None) döner.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        hours, minutes = value.strip().split(':')
+        return int(hours) * 60 + int(minutes)
+    return float(value)
+
+def format_clock(minutes):
+    """Gün başından dakikayı 'HH:MM' metnine çevirir."""
+    if minutes is None or not np.isfinite(minutes):
+        return '-'
+    minutes = int(round(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def resolve_time_windows(location_names, time_windows=None, default_window=None):
+    """
+    Lokasyon adlarına göre verilen pencereleri (num_cities, 2) dizisine çevirir.
+    
+    Parameters:
+    -----------
+    location_names : list
+        Matristeki lokasyon sırası
+    time_windows : dict or list, optional
+        {ad: (açılış, kapanış)} veya lokasyon sırasıyla [(açılış, kapanış), ...];
+        zamanlar 'HH:MM' veya dakika, None sınırsız
+    default_window : tuple, optional
+        Penceresi verilmeyen lokasyonlar için (açılış, kapanış)
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (num_cities, 2) boyutunda dakika cinsinden pencereler (NaN sınırsız)
+    """
+    if time_windows is None:
+        time_windows = {}
+    if not isinstance(time_windows, dict):
+        time_windows = dict(zip(location_names, time_windows))
+    
+    unknown = set(time_windows) - set(location_names)
+    if unknown:
+        raise ValueError(f"Bilinmeyen lokasyon için zaman penceresi: {', '.join(sorted(unknown))}")
+    
+    windows = np.full((len(location_names), 2), np.nan)
+    for index, name in enumerate(location_names):
+        window = time_windows.get(name, default_window)
+        if window is None:
+            continue
+        for column, value in enumerate(window):
+            value = parse_clock(value)
+            if value is not None:
+                windows[index, column] = value
+    return windows
+
+class TimeWindowOptimizer(AntColonyOptimizer):
+    """
+    Karınca Kolonisi Algoritması ile zaman pencereli rota (TSPTW).
+    
+    Her karıncanın saati (o anki lokasyondan ayrılış zamanı) bir dizi olarak
+    tutulur. Her adımda tüm karıncalar için varış zamanları tek seferde
+    hesaplanır; kapanış saatinden sonra varılacak veya sonrasında depoya
+    zamanında dönülemeyecek lokasyonlar maskelenir. Ziyaret edilmemiş bir
+    lokasyona artık zamanında varamayacak karıncalar (çıkmaz kısmi tur)
+    erken budanır: kalan lokasyonlar kapanış saatine göre sıralanıp eklenir
+    ve karınca sonraki adımlarda hesaba katılmaz. Gecikmeli turlar toplam
+    gecikme kadar cezalandırılır.
+    
+    Zamanlar dakika cinsindendir; depo (0. lokasyon) penceresinin açılışı
+    çıkış, kapanışı en geç dönüş zamanıdır.
+    """
+    
+    def __init__(self, distance_matrix, duration_matrix, time_windows, service_times=None,
+                 objective='distance', objective_weights=(1.0, 1.0),
+                 infeasibility_penalty=None, **aco_params):
+        """
+        Parameters:
+        -----------
+        distance_matrix : numpy.ndarray
+            Lokasyonlar arası mesafe matrisi (km)
+        duration_matrix : numpy.ndarray
+            Lokasyonlar arası yolculuk süresi (dakika)
+        time_windows : array-like
+            (num_cities, 2) boyutunda [açılış, kapanış] zamanları (dakika);
+            None veya inf kapanış sınırsız demektir
+        service_times : float or array-like, optional
+            Lokasyon başına hizmet (numune alma) süresi (dakika)
+        objective : str
+            'distance' (toplam mesafe), 'duration' (bekleme dahil toplam
+            süre) veya 'weighted' (ağırlıklı toplam)
+        objective_weights : tuple
+            'weighted' için (km başına, dakika başına) ağırlıklar
+        infeasibility_penalty : float, optional
+            Dakika gecikme başına ceza (amaç biriminde); verilmezse en büyük
+            kenar maliyeti * lokasyon sayısı
+        **aco_params
+            AntColonyOptimizer parametreleri
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Bilinmeyen amaç: {objective}")
+        
+        self.objective = objective
+        self.objective_weights = objective_weights
+        self.duration_matrix = np.asarray(duration_matrix, dtype=float)
+        
+        # Sezgisel, feromon ve yerel arama amaca göre kenar maliyetinden
+        # hesaplanır; süre matrisi asimetrikse feromon yönlü tutulur
+        self.edge_costs = _edge_costs(distance_matrix, self.duration_matrix,
+                                      objective, objective_weights)
+        if objective != 'distance' and aco_params.get('symmetric') is None:
+            aco_params['symmetric'] = is_symmetric(self.edge_costs)
+        
+        super().__init__(distance_matrix, **aco_params)
+        
+        if self.n_jobs > 1:
+            raise ValueError("Zaman pencereli modda n_jobs > 1 desteklenmez")
+        
+        n = self.num_cities
+        
+        windows = np.array(time_windows, dtype=float).reshape(n, 2)
+        self.earliest = np.nan_to_num(windows[:, 0], nan=0.0)
+        self.latest = np.nan_to_num(windows[:, 1], nan=np.inf)
+        self.departure_time = float(self.earliest[0])
+        
+        # Pencere kısıtı yoksa (kapanış yok, bekleme yok) turlar TSP gibi oluşturulur
+        self.unconstrained = bool(np.all(np.isinf(self.latest))
+                                  and np.all(self.earliest <= self.departure_time))
+        
+        self.service_times = np.zeros(n)
+        if service_times is not None:
+            self.service_times = np.array(np.broadcast_to(service_times, n), dtype=float)
+            self.service_times[0] = 0.0
+        
+        if objective != 'distance':
+            heuristic = 1.0 / (self.edge_costs + 1e-10)
+            self.heuristic_beta = heuristic if self.beta == 1 else heuristic ** self.beta
+            self._update_choice_info()
+        
+        if infeasibility_penalty is None:
+            infeasibility_penalty = float(np.max(self.edge_costs)) * n
+        self.infeasibility_penalty = infeasibility_penalty
+    
+    def _construct_colony(self, pool=None):
+        """Tüm karıncaların turlarını zaman pencereleriyle vektörel oluşturur."""
+        if self.unconstrained:
+            return super()._construct_colony(pool)
+        
+        on_step = None
+        if self.pheromone_strategy.uses_local_update:
+            def on_step(from_cities, to_cities):
+                self.pheromone_strategy.local_update(self, from_cities, to_cities)
+        
+        stats = {}
+        paths = _construct_timed_tours(
+            self.choice_info, self.num_ants, self.duration_matrix,
+            self.earliest, self.latest, self.service_times,
+            rng=self.rng, q0=self.pheromone_strategy.q0, on_step=on_step,
+            stats=stats
+        )
+        self.construction_counts = (stats['steps'], stats['selections'])
+        return paths
+    
+    def schedule(self, paths):
+        """
+        Turların varış zamanlarını ve gecikmelerini vektörel olarak hesaplar.
+        
+        Parameters:
+        -----------
+        paths : numpy.ndarray
+            (num_ants, num_cities) veya (num_cities,) boyutunda turlar
+        
+        Returns:
+        --------
+        tuple
+            (arrivals, lateness) - arrivals: (num_ants, num_cities + 1)
+            boyutunda varış zamanları (son sütun depoya dönüş), lateness:
+            karınca başına toplam gecikme (dakika)
+        """
+        paths = np.atleast_2d(paths)
+        num_ants, n = paths.shape
+        
+        arrivals = np.empty((num_ants, n + 1))
+        arrivals[:, 0] = self.departure_time
+        lateness = np.zeros(num_ants)
+        clock = np.full(num_ants, self.departure_time)
+        
+        for position in range(1, n + 1):
+            previous = paths[:, position - 1]
+            current = paths[:, position % n]
+            arrival = clock + self.duration_matrix[previous, current]
+            arrivals[:, position] = arrival
+            lateness += np.maximum(arrival - self.latest[current], 0.0)
+            # Erken varan karınca açılışı bekler
+            clock = np.maximum(arrival, self.earliest[current]) + self.service_times[current]
+        
+        return arrivals, lateness
+    
+    def _evaluate_paths(self, all_paths):
+        """Amaç değeri + ceza * toplam gecikme (zamanında turlarda yalnızca amaç)."""
+        paths = np.asarray(all_paths)
+        objective, lateness = self._objective_values(paths)
+        total = objective + self.infeasibility_penalty * lateness
+        return total if paths.ndim > 1 else float(total[0])
+    
+    def _objective_values(self, paths):
+        """Her tur için (amaç değeri, toplam gecikme)."""
+        paths = np.atleast_2d(paths)
+        arrivals, lateness = self.schedule(paths)
+        durations = arrivals[:, -1] - self.departure_time
+        
+        if self.objective == 'duration':
+            return durations, lateness
+        
+        distances = self.calculate_path_distances(paths)
+        if self.objective == 'distance':
+            return distances, lateness
+        
+        distance_weight, duration_weight = self.objective_weights
+        return distance_weight * distances + duration_weight * durations, lateness
+    
+    def _apply_local_search(self, all_paths, all_distances):
+        """
+        Turlara kenar maliyetleri üzerinde 2-opt / Or-opt uygular; yerel arama
+        zaman pencerelerini bilmediği için yalnızca amaç + ceza değerini
+        düşüren turlar kabul edilir.
+        """
+        if self.local_search_scope == 'best':
+            indices = [int(np.argmin(all_distances))]
+        else:
+            indices = range(len(all_paths))
+        
+        for index in indices:
+            tour, num_moves = improve_tour(all_paths[index], self.edge_costs,
+                                           self.neighbor_list, self.local_search,
+                                           symmetric=self.symmetric)
+            if not num_moves:
+                continue
+            
+            cost = self._evaluate_paths(tour)
+            if cost < all_distances[index]:
+                self.local_search_moves += num_moves
+                all_paths[index] = tour
+                all_distances[index] = cost
+    
+    def get_schedule(self, path=None):
+        """
+        Tur için varış ve ayrılış zamanlarını döndürür.
+        
+        Parameters:
+        -----------
+        path : list, optional
+            Tur; verilmezse best_path
+        
+        Returns:
+        --------
+        list of dict
+            Her durak için {'location', 'arrival', 'start', 'departure',
+            'wait', 'late'}; son kayıt depoya dönüştür
+        """
+        path = np.asarray(self.best_path if path is None else path)
+        arrivals, _ = self.schedule(path)
+        stops = np.append(path, path[0])
+        
+        schedule = []
+        for position, location in enumerate(stops):
+            arrival = float(arrivals[0, position])
+            start = max(arrival, float(self.earliest[location]))
+            last = position == len(stops) - 1
+            schedule.append({
+                'location': int(location),
+                'arrival': arrival,
+                'start': start if position else arrival,
+                'departure': (start + float(self.service_times[location])) if not last else None,
+                'wait': (start - arrival) if position and not last else 0.0,
+                'late': max(arrival - float(self.latest[location]), 0.0)
+            })
+        return schedule
+    
+    def get_results(self):
+        """
+        Optimizasyon sonuçlarını zaman çizelgesiyle birlikte döndürür.
+        
+        Returns:
+        --------
+        dict
+            AntColonyOptimizer.get_results() + {'objective', 'schedule',
+            'total_distance', 'total_duration', 'lateness', 'feasible'}
+        """
+        results = super().get_results()
+        results['objective'] = self.objective
+        if self.best_path is None:
+            return results
+        
+        path = np.asarray(self.best_path)
+        arrivals, lateness = self.schedule(path)
+        results.update({
+            'schedule': self.get_schedule(),
+            'total_distance': float(self.calculate_path_distance(path)),
+            'total_duration': float(arrivals[0, -1] - self.departure_time),
+            'lateness': float(lateness[0]),
+            'feasible': bool(lateness[0] == 0)
+        })
+        return results
+
+def _edge_costs(distance_matrix, duration_matrix, objective, objective_weights):
+    """
+    Amaca göre kenar maliyet matrisi (mesafe, yolculuk süresi veya karışım).
+    Hizmet süreleri her turda aynı toplamı verdiği için eklenmez.
+    """
+    distances = np.asarray(distance_matrix, dtype=float)
+    if objective == 'distance':
+        return distances
+    if objective == 'duration':
+        return duration_matrix
+    distance_weight, duration_weight = objective_weights
+    return distance_weight * distances + duration_weight * duration_matrix
+
+def _construct_timed_tours(choice_info, num_ants, duration_matrix, earliest, latest,
+                           service_times, rng=None, q0=None, on_step=None, stats=None):
+    """
+    Tüm karıncaların turlarını varış zamanı maskeleriyle birlikte oluşturur.
+    
+    Her adımda etkin karıncalar için (etkin karınca, num_cities) boyutunda
+    varış zamanı matrisi hesaplanır. j lokasyonu, kapanıştan önce varılıyor
+    ve hizmetten sonra depoya kapanıştan önce dönülebiliyorsa seçilebilir.
+    Ziyaret edilmemiş lokasyonlardan biri bu koşulu sağlamıyorsa kısmi tur
+    zamanında tamamlanamaz (süreler arttıkça varış gecikir); karınca budanır,
+    kalan lokasyonlar kapanış saatine göre eklenir ve etkin diziler küçülür.
+    
+    Seçim ağırlıkları feromon/mesafe bilgisine ek olarak hizmete başlamaya
+    kadar geçecek süre (yolculuk + bekleme) ve kalan pay (en geç başlama -
+    başlama) ile ters orantılıdır; böylece kapanışı yaklaşan lokasyonlar
+    önce seçilir.
+    
+    Parameters:
+    -----------
+    choice_info : numpy.ndarray
+        tau^alpha * eta^beta seçim ağırlıkları
+    num_ants : int
+        Tur oluşturacak karınca sayısı
+    duration_matrix : numpy.ndarray
+        Yolculuk süreleri (dakika)
+    earliest, latest : numpy.ndarray
+        Lokasyonların açılış ve kapanış zamanları
+    service_times : numpy.ndarray
+        Lokasyon hizmet süreleri (depo 0)
+    rng : numpy.random.Generator, optional
+        Rastgele sayı üreteci
+    q0 : float, optional
+        ACS sömürü olasılığı
+    on_step : callable, optional
+        on_step(from_cities, to_cities) - etkin karıncalar için her adımdan
+        sonra çağrılır
+    stats : dict, optional
+        Verilirse gerçekleşen adım ('steps') ve seçim ('selections')
+        sayıları yazılır; budanan karıncaların tamamlanması sayılmaz
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (num_ants, num_cities) boyutunda turlar (hepsi 0'dan başlar)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    n = len(choice_info)
+    paths = np.zeros((num_ants, n), dtype=np.intp)
+    
+    # Etkin (budanmamış) karıncaların durumu
+    active = np.arange(num_ants)
+    unvisited = np.ones((num_ants, n), dtype=bool)
+    unvisited[:, 0] = False
+    current = np.zeros(num_ants, dtype=np.intp)
+    clock = np.full(num_ants, float(earliest[0]))
+    
+    # j'de hizmete en geç başlama zamanı: kapanış ve depoya zamanında dönüş
+    latest_start = np.minimum(latest, latest[0] - service_times - duration_matrix[:, 0])
+    # Kapanışı olmayan lokasyonlarda pay, tüm turun üst sınırıyla kırpılır
+    horizon = float(duration_matrix.max() * n + service_times.sum())
+    
+    thresholds_all = rng.random((n - 1, num_ants))
+    exploit_all = rng.random((n - 1, num_ants)) < q0 if q0 is not None else None
+    
+    steps = selections = 0
+    for step in range(1, n):
+        # Erken varan karınca açılışı bekler: hizmet max(varış, açılış)'ta başlar
+        arrival = clock[:, None] + duration_matrix[current]
+        start = np.maximum(arrival, earliest)
+        slack = latest_start - start
+        allowed = slack >= 0
+        allowed &= unvisited
+        
+        # Erken budama: ziyaret edilmemiş bir lokasyon artık zamanında olamaz
+        # (etkin karıncaların hepsinde n - step lokasyon ziyaret edilmemiştir)
+        doomed = np.count_nonzero(allowed, axis=1) < n - step
+        if doomed.any():
+            _complete_by_deadline(paths, active[doomed], ~unvisited[doomed], step, latest)
+            keep = ~doomed
+            active, unvisited, current, clock = active[keep], unvisited[keep], current[keep], clock[keep]
+            start, slack, allowed = start[keep], slack[keep], allowed[keep]
+            if not len(active):
+                break
+        
+        # Zaman sezgiseli: hizmete başlamaya kadar geçen süre (yolculuk +
+        # bekleme) ve kalan pay küçüldükçe ağırlık artar
+        weights = choice_info[current]
+        weights *= allowed
+        np.clip(slack, 0.0, horizon, out=slack)
+        slack += 1.0
+        slack *= start - clock[:, None] + 1.0
+        weights /= slack
+        next_cities = _roulette(weights, thresholds_all[step - 1, active], allowed)
+        steps += 1
+        selections += len(active)
+        
+        if exploit_all is not None:
+            exploit = exploit_all[step - 1, active]
+            if exploit.any():
+                best = weights[exploit]
+                best[~allowed[exploit]] = -np.inf
+                next_cities[exploit] = np.argmax(best, axis=1)
+        
+        if on_step is not None:
+            on_step(current, next_cities)
+        
+        rows = np.arange(len(active))
+        clock = start[rows, next_cities] + service_times[next_cities]
+        unvisited[rows, next_cities] = False
+        paths[active, step] = next_cities
+        current = next_cities
+    
+    if stats is not None:
+        stats['steps'] = steps
+        stats['selections'] = selections
+    
+    return paths
+
+def _complete_by_deadline(paths, ants, visited, step, latest):
+    """Budanan karıncaların turlarını kalan lokasyonlarla kapanış sırasına göre tamamlar."""
+    order = np.argsort(np.where(visited, -np.inf, latest), axis=1, kind='stable')
+    paths[ants, step:] = order[:, step:]
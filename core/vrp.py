@@ -0,0 +1,460 @@
+"""
+Çok Araçlı ve Kapasiteli Rotalama (mTSP / CVRP) için Karınca Kolonisi
+Her karınca depodan (0. lokasyon) çıkan bir rota kümesi oluşturur
+"""
+
+import numpy as np
+
+from core.ant_algorithm import AntColonyOptimizer, _roulette
+from core.local_search import improve_tour
+
+# Rota içi yerel aramada kullanılacak komşu sayısı
+_ROUTE_NEIGHBORS = 10
+
+class VehicleRoutingOptimizer(AntColonyOptimizer):
+    """
+    Karınca Kolonisi Algoritması ile araç rotalama.
+    
+    Çözüm, depoya dönüşlerle ayrılmış tek bir dizi olarak tutulur:
+    [0, 3, 5, 0, 2, 4] iki araç demektir (0 -> 3 -> 5 -> 0 ve 0 -> 2 -> 4 -> 0).
+    Karıncalar her adımda yalnızca kapasite ve vardiya süresi açısından
+    uygun lokasyonlar arasından seçim yapar (vektörel maske); uygun lokasyon
+    kalmayınca depoya dönüp yeni araçla devam eder. Araç sayısı tükenirse
+    kalan lokasyonlar kısıt gevşetilerek son araca eklenir ve çözüm ihlal
+    miktarı kadar cezalandırılır.
+    
+    Feromon stratejileri, erken durma, ölçüm ve iptal AntColonyOptimizer
+    ile aynıdır. Rotalar her zaman vektörel oluşturulur; aday listeleri ve
+    çok çekirdekli oluşturma (n_jobs > 1) bu modda kullanılmaz.
+    """
+    
+    def __init__(self, distance_matrix, demands=None, vehicle_capacity=None,
+                 duration_matrix=None, service_times=None, max_route_duration=None,
+                 num_vehicles=None, infeasibility_penalty=None, **aco_params):
+        """
+        Parameters:
+        -----------
+        distance_matrix : numpy.ndarray
+            Lokasyonlar arası mesafe matrisi; 0. lokasyon depodur
+        demands : float or array-like, optional
+            Her lokasyonun talebi (ör. numune şişesi sayısı); depo talebi 0
+            kabul edilir. vehicle_capacity verilip talep verilmezse her
+            lokasyonun talebi 1 kabul edilir
+        vehicle_capacity : float, optional
+            Araç başına kapasite; None ise kapasite kısıtı yok
+        duration_matrix : numpy.ndarray, optional
+            Lokasyonlar arası yolculuk süresi (dakika)
+        service_times : float or array-like, optional
+            Lokasyon başına hizmet (numune alma) süresi (dakika)
+        max_route_duration : float, optional
+            Araç başına en uzun rota (vardiya) süresi (dakika); verilirse
+            duration_matrix gereklidir
+        num_vehicles : int, optional
+            Kullanılabilecek en fazla araç sayısı; None ise sınırsız
+        infeasibility_penalty : float, optional
+            Birim ihlal başına ceza (mesafe biriminde); verilmezse en uzun
+            kenar * lokasyon sayısı, yani herhangi bir turdan daha büyük
+        **aco_params
+            AntColonyOptimizer parametreleri
+        """
+        if max_route_duration is not None and duration_matrix is None:
+            raise ValueError("max_route_duration için duration_matrix gerekli")
+        
+        super().__init__(distance_matrix, **aco_params)
+        
+        if self.n_jobs > 1:
+            raise ValueError("Araç rotalama modunda n_jobs > 1 desteklenmez")
+        
+        n = self.num_cities
+        
+        # Kapasite talepsiz anlamsızdır: varsayılan lokasyon başına bir birim
+        if demands is None and vehicle_capacity is not None:
+            demands = 1.0
+        
+        self.demands = None
+        if demands is not None:
+            self.demands = np.array(np.broadcast_to(demands, n), dtype=float)
+            self.demands[0] = 0.0
+        self.vehicle_capacity = vehicle_capacity
+        
+        self.duration_matrix = None
+        if duration_matrix is not None:
+            self.duration_matrix = np.asarray(duration_matrix, dtype=float)
+        self.service_times = np.zeros(n)
+        if service_times is not None:
+            self.service_times = np.array(np.broadcast_to(service_times, n), dtype=float)
+            self.service_times[0] = 0.0
+        self.max_route_duration = max_route_duration
+        self.num_vehicles = num_vehicles
+        
+        if infeasibility_penalty is None:
+            infeasibility_penalty = float(np.max(self.distance_matrix)) * n
+        self.infeasibility_penalty = infeasibility_penalty
+    
+    def _construct_colony(self, pool=None):
+        """Tüm karıncaların rota kümelerini vektörel olarak oluşturur."""
+        on_step = None
+        if self.pheromone_strategy.uses_local_update:
+            def on_step(from_cities, to_cities):
+                self.pheromone_strategy.local_update(self, from_cities, to_cities)
+        
+        durations = self.duration_matrix if self.max_route_duration is not None else None
+        
+        stats = {}
+        routes = _construct_routes(
+            self.choice_info, self.num_ants,
+            demands=self.demands, capacity=self.vehicle_capacity,
+            duration_matrix=durations, service_times=self.service_times,
+            max_duration=self.max_route_duration, max_vehicles=self.num_vehicles,
+            rng=self.rng, q0=self.pheromone_strategy.q0, on_step=on_step,
+            stats=stats
+        )
+        self.construction_counts = (stats['steps'], stats['selections'])
+        return routes
+    
+    def _evaluate_paths(self, all_paths):
+        """Toplam mesafe + ceza * kısıt ihlali (uygun çözümlerde yalnızca mesafe)."""
+        paths = np.asarray(all_paths)
+        next_cities = np.roll(paths, -1, axis=-1)
+        
+        # Dolgu (0 -> 0) kenarları sayılmaz
+        distances = np.where(paths == next_cities, 0.0,
+                             self.distance_matrix[paths, next_cities]).sum(axis=-1)
+        return distances + self.infeasibility_penalty * self.violations(paths)
+    
+    def violations(self, paths):
+        """
+        Rotaların kısıt ihlallerini vektörel olarak hesaplar.
+        
+        İhlal; kapasite ve süre aşımlarının kapasiteye / vardiya süresine
+        oranı ile fazladan kullanılan araç sayısının toplamıdır.
+        
+        Parameters:
+        -----------
+        paths : numpy.ndarray
+            (num_ants, L) veya (L,) boyutunda rota dizileri
+        
+        Returns:
+        --------
+        numpy.ndarray or float
+            Her rota kümesi için ihlal miktarı (0 = uygun)
+        """
+        paths = np.asarray(paths)
+        single = paths.ndim == 1
+        paths = np.atleast_2d(paths)
+        
+        next_cities = np.roll(paths, -1, axis=1)
+        violation = np.zeros(len(paths))
+        
+        if self.demands is not None and self.vehicle_capacity is not None:
+            loads = _per_route_sums(paths, self.demands[paths])
+            violation += (np.maximum(loads - self.vehicle_capacity, 0.0).sum(axis=1)
+                          / self.vehicle_capacity)
+        
+        if self.max_route_duration is not None:
+            times = np.where(paths == next_cities, 0.0,
+                             self.duration_matrix[paths, next_cities]
+                             + self.service_times[next_cities])
+            durations = _per_route_sums(paths, times)
+            violation += (np.maximum(durations - self.max_route_duration, 0.0).sum(axis=1)
+                          / self.max_route_duration)
+        
+        if self.num_vehicles is not None:
+            used = ((paths == 0) & (next_cities != 0)).sum(axis=1)
+            violation += np.maximum(used - self.num_vehicles, 0)
+        
+        return float(violation[0]) if single else violation
+    
+    def _solution_path(self, path):
+        """Sondaki depo dolgusunu atar: [0, 3, 0, 2, 0, 0] -> [0, 3, 0, 2]."""
+        path = np.asarray(path)
+        customers = np.flatnonzero(path)
+        return path[:customers[-1] + 1 if len(customers) else 1].tolist()
+    
+    def _apply_local_search(self, all_paths, all_distances):
+        """
+        Her aracın rotasını kendi içinde 2-opt / Or-opt ile iyileştirir.
+        Lokasyonlar araçlar arasında taşınmaz, bu yüzden yükler değişmez;
+        vardiya süresini aşan iyileştirmeler reddedilir.
+        """
+        if self.local_search_scope == 'best':
+            indices = [int(np.argmin(all_distances))]
+        else:
+            indices = range(len(all_paths))
+        
+        for index in indices:
+            path = all_paths[index]
+            improved = False
+            
+            for start, stop in _route_bounds(path):
+                route = path[start:stop]
+                tour, num_moves = self._improve_route(route)
+                if num_moves:
+                    path[start:stop] = tour
+                    self.local_search_moves += num_moves
+                    improved = True
+            
+            if improved:
+                all_distances[index] = self._evaluate_paths(path)
+    
+    def _improve_route(self, route):
+        """Tek bir rotayı (0 ile başlar) alt matris üzerinde iyileştirir."""
+        if len(route) < 4:
+            return route, 0
+        
+        sub_matrix = np.array(self.distance_matrix[np.ix_(route, route)], dtype=float)
+        blocked = sub_matrix.copy()
+        np.fill_diagonal(blocked, np.inf)
+        size = min(_ROUTE_NEIGHBORS, len(route) - 1)
+        neighbors = np.argsort(blocked, axis=1)[:, :size]
+        
+        local_tour, num_moves = improve_tour(np.arange(len(route)), sub_matrix,
+                                             neighbors, self.local_search,
+                                             symmetric=self.symmetric)
+        if not num_moves:
+            return route, 0
+        
+        tour = route[local_tour]
+        if (self.max_route_duration is not None
+                and self.route_duration(tour) > max(self.max_route_duration,
+                                                    self.route_duration(route))):
+            return route, 0
+        return tour, num_moves
+    
+    def route_duration(self, route):
+        """Depodan çıkıp depoya dönen rotanın süresi (yol + hizmet, dakika)."""
+        route = np.asarray(route)
+        next_cities = np.roll(route, -1)
+        return float((self.duration_matrix[route, next_cities]
+                      + self.service_times[next_cities]).sum())
+    
+    def get_routes(self, path=None):
+        """
+        Çözümü araç rotalarına ayırır.
+        
+        Parameters:
+        -----------
+        path : list, optional
+            Depo dönüşleriyle ayrılmış çözüm; verilmezse best_path
+        
+        Returns:
+        --------
+        list of dict
+            Her araç için {'vehicle', 'path', 'distance', 'duration', 'load'};
+            path depoda başlar ve biter. Süre yalnızca duration_matrix varsa
+            hesaplanır
+        """
+        path = np.asarray(self.best_path if path is None else path)
+        routes = []
+        
+        for start, stop in _route_bounds(path):
+            route = path[start:stop]
+            closed = np.append(route, 0)
+            routes.append({
+                'vehicle': len(routes) + 1,
+                'path': closed.tolist(),
+                'distance': float(self.distance_matrix[closed[:-1], closed[1:]].sum()),
+                'duration': (self.route_duration(route)
+                             if self.duration_matrix is not None else None),
+                'load': float(self.demands[route].sum()) if self.demands is not None else None
+            })
+        return routes
+    
+    def get_results(self):
+        """
+        Optimizasyon sonuçlarını araç rotalarıyla birlikte döndürür.
+        
+        Returns:
+        --------
+        dict
+            AntColonyOptimizer.get_results() + {'routes', 'num_vehicles_used',
+            'total_distance', 'violation', 'feasible'}
+        """
+        results = super().get_results()
+        if self.best_path is None:
+            return results
+        
+        routes = self.get_routes()
+        violation = self.violations(np.asarray(self.best_path))
+        results.update({
+            'routes': routes,
+            'num_vehicles_used': len(routes),
+            'total_distance': sum(route['distance'] for route in routes),
+            'violation': violation,
+            'feasible': violation == 0
+        })
+        return results
+
+def _route_bounds(path):
+    """Depoda başlayan her rotanın [start, stop) sınırlarını üretir."""
+    starts = np.flatnonzero(np.asarray(path) == 0)
+    stops = np.append(starts[1:], len(path))
+    for start, stop in zip(starts, stops):
+        if stop - start > 1:
+            yield int(start), int(stop)
+
+def _per_route_sums(paths, values):
+    """
+    Kenar/lokasyon değerlerini karınca ve rota bazında toplar.
+    
+    Parameters:
+    -----------
+    paths : numpy.ndarray
+        (num_ants, L) boyutunda rota dizileri (her depo yeni rota başlatır)
+    values : numpy.ndarray
+        (num_ants, L) boyutunda toplanacak değerler
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (num_ants, L) boyutunda rota toplamları (kullanılmayan rotalar 0)
+    """
+    num_ants, length = paths.shape
+    route_ids = np.cumsum(paths == 0, axis=1) - 1
+    flat = (np.arange(num_ants)[:, None] * length + route_ids).ravel()
+    return np.bincount(flat, weights=np.ravel(values),
+                       minlength=num_ants * length).reshape(num_ants, length)
+
+def _construct_routes(choice_info, num_ants, demands=None, capacity=None,
+                      duration_matrix=None, service_times=None, max_duration=None,
+                      max_vehicles=None, rng=None, q0=None, on_step=None, stats=None):
+    """
+    Tüm karıncaların rota kümelerini kısıt maskeleriyle birlikte oluşturur.
+    
+    Her adımda her karınca için (num_ants, num_cities) boyutunda uygunluk
+    maskesi hesaplanır: ziyaret edilmemiş, yükü kapasiteyi aşmayan ve depoya
+    vardiya süresi içinde dönülebilecek lokasyonlar. Uygun lokasyonu kalmayan
+    karıncalar depoya döner (yeni araç); araç sınırına ulaşmış veya depoda
+    iken bile ilerleyemeyen karıncalar kısıtlar gevşetilerek devam eder.
+    
+    Parameters:
+    -----------
+    choice_info : numpy.ndarray
+        tau^alpha * eta^beta seçim ağırlıkları
+    num_ants : int
+        Rota oluşturacak karınca sayısı
+    demands : numpy.ndarray, optional
+        Lokasyon talepleri (depo 0)
+    capacity : float, optional
+        Araç kapasitesi
+    duration_matrix : numpy.ndarray, optional
+        Yolculuk süreleri; max_duration ile birlikte kullanılır
+    service_times : numpy.ndarray, optional
+        Lokasyon hizmet süreleri (depo 0)
+    max_duration : float, optional
+        Araç başına en uzun rota süresi
+    max_vehicles : int, optional
+        En fazla araç sayısı
+    rng : numpy.random.Generator, optional
+        Rastgele sayı üreteci
+    q0 : float, optional
+        ACS sömürü olasılığı
+    on_step : callable, optional
+        on_step(from_cities, to_cities) - hareket eden karıncalar için her
+        adımdan sonra çağrılır
+    stats : dict, optional
+        Verilirse gerçekleşen adım ('steps') ve seçim ('selections')
+        sayıları yazılır
+    
+    Returns:
+    --------
+    numpy.ndarray
+        (num_ants, L) boyutunda rota dizileri; 0 ile başlar, depo dönüşleri
+        0 ile gösterilir, bitiren karıncaların satırları 0 ile doldurulur
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    n = len(choice_info)
+    ants = np.arange(num_ants)
+    
+    # Her lokasyondan sonra en fazla bir depo dönüşü olabilir
+    max_steps = 2 * (n - 1)
+    paths = np.zeros((num_ants, max_steps + 1), dtype=np.intp)
+    visited = np.zeros((num_ants, n), dtype=bool)
+    visited[:, 0] = True
+    current = np.zeros(num_ants, dtype=np.intp)
+    remaining = np.full(num_ants, n - 1)
+    vehicles = np.ones(num_ants, dtype=np.intp)
+    
+    check_capacity = demands is not None and capacity is not None
+    check_duration = duration_matrix is not None and max_duration is not None
+    if check_capacity:
+        # Kalan kapasite; j ancak demands[j] <= kalan ise seçilebilir
+        remaining_capacity = np.full(num_ants, float(capacity))
+    if check_duration:
+        if service_times is None:
+            service_times = np.zeros(n)
+        # i -> j yolculuğu + j'de hizmet + j'den depoya dönüş; maske her adımda
+        # tek bir satır okuma ve karşılaştırma ile hesaplanır
+        round_trip = duration_matrix + (service_times + duration_matrix[:, 0])[None, :]
+        step_times = duration_matrix + service_times[None, :]
+        remaining_time = np.full(num_ants, float(max_duration))
+    
+    thresholds_all = rng.random((max_steps, num_ants))
+    exploit_all = rng.random((max_steps, num_ants)) < q0 if q0 is not None else None
+    
+    step = 0
+    selections = 0
+    while step < max_steps:
+        moving = remaining > 0
+        if not moving.any():
+            break
+        selections += int(np.count_nonzero(moving))
+        
+        # Kısıt maskeleri - tüm karıncalar ve lokasyonlar için tek seferde
+        allowed = ~visited
+        if check_capacity:
+            allowed &= demands[None, :] <= remaining_capacity[:, None]
+        if check_duration:
+            allowed &= round_trip[current] <= remaining_time[:, None]
+        
+        stuck = moving & ~allowed.any(axis=1)
+        if max_vehicles is None:
+            to_depot = stuck & (current != 0)
+        else:
+            to_depot = stuck & (current != 0) & (vehicles < max_vehicles)
+        
+        # Yeni araçla da ilerlenemiyorsa kısıtlar gevşetilir (ceza ile)
+        relaxed = stuck & ~to_depot
+        if relaxed.any():
+            allowed[relaxed] = ~visited[relaxed]
+        
+        # Depoya dönen ve bitiren karıncalar için tek seçenek depo (0)
+        served = moving & ~to_depot
+        allowed[~served, 0] = True
+        
+        weights = choice_info[current]
+        weights *= allowed
+        next_cities = _roulette(weights, thresholds_all[step], allowed)
+        
+        if exploit_all is not None:
+            exploit = exploit_all[step]
+            if exploit.any():
+                best = weights[exploit]
+                best[~allowed[exploit]] = -np.inf
+                next_cities[exploit] = np.argmax(best, axis=1)
+        
+        visited[ants[served], next_cities[served]] = True
+        remaining -= served
+        vehicles += to_depot
+        
+        if check_capacity:
+            remaining_capacity = np.where(to_depot, float(capacity),
+                                          remaining_capacity - demands[next_cities])
+        if check_duration:
+            remaining_time = np.where(to_depot, float(max_duration),
+                                      remaining_time - step_times[current, next_cities])
+        
+        if on_step is not None:
+            on_step(current[moving], next_cities[moving])
+        
+        step += 1
+        paths[:, step] = next_cities
+        current = next_cities
+    
+    if stats is not None:
+        stats['steps'] = step
+        stats['selections'] = selections
+    
+    return paths[:, :step + 1]
@@ -8,16 +8,14 @@ Ders: BLG-307 Yapay Zeka Sistemleri
 """
 
 import streamlit as st
-import numpy as np
 import pandas as pd
-from streamlit_folium import folium_static
 import time
 
 # Proje modülleri
-from data.coordinates import get_all_locations, get_location_names, get_coordinates_list
-from core.haversine import create_haversine_matrix
-from core.matrix_utils import create_distance_matrix_with_google
-from core.ant_algorithm import AntColonyOptimizer
+from data.coordinates import get_all_locations, get_location_names
+from core.jobs import JobRunner, make_job_key
+from core.pipeline import estimate_duration_matrix, run_route_optimization
+from core.time_windows import OBJECTIVES, format_clock
 from visual.plotting import (
     create_route_map, 
     plot_convergence,
@@ -26,7 +24,11 @@ from visual.plotting import (
     display_route_details,
     create_distance_heatmap
 )
-from config import DEFAULT_ACO_PARAMS, PAGE_CONFIG
+from config import (
+    DEFAULT_ACO_PARAMS, PAGE_CONFIG, DISTANCE_CACHE_CONFIG,
+    GOOGLE_MAPS_FETCH_CONFIG, MATRIX_STORE_CONFIG, PROGRESS_UPDATE_INTERVAL,
+    JOB_RUNNER_CONFIG, VRP_CONFIG, TIME_WINDOW_CONFIG
+)
 import os
 
 # Sayfa konfigürasyonu
@@ -92,6 +94,15 @@ evaporation_rate = st.sidebar.slider(
     help="Feromon buharlaşma hızı (0-1 arası)"
 )
 
+pheromone_strategy = st.sidebar.selectbox(
+    "Feromon Stratejisi",
+    options=['as', 'mmas', 'acs'],
+    index=['as', 'mmas', 'acs'].index(DEFAULT_ACO_PARAMS['pheromone_strategy']),
+    format_func=lambda x: {'as': 'Ant System', 'mmas': 'MAX-MIN Ant System',
+                           'acs': 'Ant Colony System'}[x],
+    help="Feromon güncelleme kuralı"
+)
+
 st.sidebar.markdown("---")
 
 # Mesafe hesaplama yöntemi
@@ -102,6 +113,78 @@ distance_method = st.sidebar.radio(
     help="Google Maps API gerçek yol mesafelerini, Haversine kuş uçuşu mesafeyi hesaplar"
 )
 
+st.sidebar.markdown("---")
+
+# Çok araçlı rotalama - göletler kapasite ve vardiya süresine göre araçlara bölünür
+use_vrp = st.sidebar.checkbox(
+    "🚐 Çoklu Araç (VRP)",
+    value=False,
+    help="Göletleri numune şişesi kapasitesi ve vardiya süresine göre birden fazla araca böler"
+)
+
+vrp_params = None
+if use_vrp:
+    num_vehicles = st.sidebar.number_input(
+        "Araç Sayısı", min_value=1, max_value=10, value=VRP_CONFIG['num_vehicles'])
+    vehicle_capacity = st.sidebar.number_input(
+        "Araç Kapasitesi (numune şişesi)", min_value=1, max_value=50,
+        value=VRP_CONFIG['vehicle_capacity'])
+    max_route_duration = st.sidebar.slider(
+        "Vardiya Süresi (dakika)", min_value=60, max_value=720,
+        value=VRP_CONFIG['max_route_duration'], step=30,
+        help="Numune alma süreleri dahil araç başına en uzun rota süresi")
+    
+    vrp_params = {
+        **VRP_CONFIG,
+        'num_vehicles': int(num_vehicles),
+        'vehicle_capacity': int(vehicle_capacity),
+        'max_route_duration': max_route_duration
+    }
+
+st.sidebar.markdown("---")
+
+# Zaman pencereli rotalama - göletlere yalnızca erişim saatleri içinde varılır
+use_time_windows = st.sidebar.checkbox(
+    "🕒 Erişim Saatleri (Zaman Pencereleri)",
+    value=False,
+    disabled=use_vrp,
+    help="Göletlere yalnızca erişim saatleri içinde varılan rotalar arar (VRP ile birlikte kullanılamaz)"
+)
+
+time_window_params = None
+if use_time_windows and not use_vrp:
+    objective = st.sidebar.selectbox(
+        "Amaç",
+        options=list(OBJECTIVES),
+        index=list(OBJECTIVES).index(TIME_WINDOW_CONFIG['objective']),
+        format_func=lambda x: {'distance': 'Toplam Mesafe', 'duration': 'Toplam Süre',
+                               'weighted': 'Ağırlıklı (km + dakika)'}[x],
+        help="Toplam süre bekleme ve numune alma sürelerini de içerir"
+    )
+    service_time = st.sidebar.number_input(
+        "Numune Alma Süresi (dakika)", min_value=0, max_value=120,
+        value=TIME_WINDOW_CONFIG['service_times'])
+    
+    # Erişim saatleri 'HH:MM'; boş bırakılan hücre sınırsız
+    default_open, default_close = TIME_WINDOW_CONFIG['default_window']
+    window_df = st.sidebar.data_editor(
+        pd.DataFrame([{
+            'Lokasyon': name,
+            'Açılış': TIME_WINDOW_CONFIG['time_windows'].get(name, (default_open, default_close))[0],
+            'Kapanış': TIME_WINDOW_CONFIG['time_windows'].get(name, (default_open, default_close))[1]
+        } for name in get_location_names()]),
+        disabled=['Lokasyon'], hide_index=True, key='time_windows_editor'
+    )
+    
+    time_window_params = {
+        **TIME_WINDOW_CONFIG,
+        'objective': objective,
+        'service_times': service_time,
+        'default_window': None,
+        'time_windows': {row['Lokasyon']: (row['Açılış'] or None, row['Kapanış'] or None)
+                         for row in window_df.to_dict('records')}
+    }
+
 st.sidebar.markdown("---")
 st.sidebar.info("""
 **Öğrenci:** Samet POLAT  
@@ -137,170 +220,267 @@ with col2:
 
 st.markdown("---")
 
-# Algoritma Çalıştır Butonu
-if st.button("🚀 Algoritmayı Çalıştır", type="primary", use_container_width=True):
+@st.cache_resource
+def get_job_runner():
+    """Tüm oturumlarca paylaşılan arka plan iş çalıştırıcısı"""
+    return JobRunner(**JOB_RUNNER_CONFIG)
+
+def optimization_job(job, locations, method, aco_params, api_key, vrp_params=None,
+                     time_window_params=None):
+    """Arka planda mesafe matrisini oluşturup ACO'yu çalıştırır"""
+    num_iterations = aco_params['num_iterations']
+    job.report(stage='matrix', percent=10)
+    
+    def on_iteration(aco, iteration, best_distance, best_path):
+        job.report(stage='aco', percent=30 + int(50 * (iteration + 1) / num_iterations),
+                   iteration=iteration + 1, best_distance=best_distance,
+                   history=aco.iteration_best_distances)
+        # Kullanıcı iptal ettiyse ACO durur
+        return not job.cancelled
     
-    # Progress bar
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    return run_route_optimization(
+        locations, method, aco_params, api_key=api_key, callback=on_iteration,
+        vrp_params=vrp_params,
+        time_window_params=time_window_params,
+        store_path=MATRIX_STORE_CONFIG['google_path'],
+        cache_config=DISTANCE_CACHE_CONFIG,
+        fetch_options=GOOGLE_MAPS_FETCH_CONFIG
+    )
+
+def save_figures(result):
+    """Yakınsama grafiğini ve haritayı figure/ klasörüne kaydeder"""
+    os.makedirs('figure', exist_ok=True)
     
     try:
-        # 1. Mesafe matrisini oluştur
-        status_text.text("📊 Mesafe matrisi oluşturuluyor...")
-        progress_bar.progress(10)
-        
-        if "Google" in distance_method:
-            # Google Maps API kullan
-            try:
-                api_key = st.secrets["GOOGLE_MAPS_API_KEY"]
-                distance_matrix, duration_matrix, loc_names = create_distance_matrix_with_google(
-                    api_key, locations
-                )
-                st.success("✅ Google Maps API ile gerçek yol mesafeleri alındı!")
-            except Exception as e:
-                st.error(f"❌ Google Maps API hatası: {str(e)}")
-                st.warning("⚠️ Haversine formülü ile kuş uçuşu mesafeler kullanılacak.")
-                coordinates = get_coordinates_list()
-                distance_matrix = create_haversine_matrix(coordinates)
-                loc_names = location_names
-        else:
-            # Haversine formülü kullan
-            coordinates = get_coordinates_list()
-            distance_matrix = create_haversine_matrix(coordinates)
-            loc_names = location_names
-            st.info("ℹ️ Haversine formülü ile kuş uçuşu mesafeler kullanıldı.")
-        
-        progress_bar.progress(30)
-        
-        # 2. ACO algoritmasını çalıştır
-        status_text.text("🐜 Karınca Kolonisi Algoritması çalıştırılıyor...")
+        # Yakınsama grafiğini kaydet
+        plot_convergence_matplotlib(result['iteration_history'], save_path='figure/convergence.png')
         
-        aco = AntColonyOptimizer(
-            distance_matrix=distance_matrix,
-            num_ants=num_ants,
-            num_iterations=num_iterations,
-            alpha=alpha,
-            beta=beta,
-            evaporation_rate=evaporation_rate,
-            Q=DEFAULT_ACO_PARAMS['Q']
-        )
-        
-        # Optimizasyonu çalıştır
-        best_path, best_distance, iteration_history = aco.optimize(verbose=False)
-        
-        progress_bar.progress(80)
-        status_text.text("📈 Sonuçlar görselleştiriliyor...")
+        # Haritayı oluştur ve kaydet
+        route_map = create_route_map(locations, result['best_path'], result['location_names'])
+        save_map_as_png(route_map, filename='figure/rota.html')
         
-        # Figure klasörünü oluştur
-        os.makedirs('figure', exist_ok=True)
-        
-        # Görselleri kaydet
-        try:
-            # Yakınsama grafiğini kaydet
-            plot_convergence_matplotlib(iteration_history, save_path='figure/convergence.png')
-            
-            # Haritayı oluştur ve kaydet
-            route_map = create_route_map(locations, best_path, loc_names)
-            save_map_as_png(route_map, filename='figure/rota.html')
-            
-            st.success("💾 Görselleştirmeler figure/ klasörüne kaydedildi!")
-        except Exception as e:
-            st.warning(f"⚠️ Görsel kaydetme hatası: {e}")
+        st.success("💾 Görselleştirmeler figure/ klasörüne kaydedildi!")
+    except Exception as e:
+        st.warning(f"⚠️ Görsel kaydetme hatası: {e}")
+
+def render_results(result):
+    """Önbellekteki iş sonucundan sonuç bölümlerini oluşturur"""
+    best_path = result['best_path']
+    best_distance = result['best_distance']
+    iteration_history = result['iteration_history']
+    distance_matrix = result['distance_matrix']
+    loc_names = result['location_names']
+    aco_results = result['aco_results']
+    
+    for level, message in result['messages']:
+        getattr(st, level)(message)
+    
+    if 'routes' in aco_results:
+        st.success(f"🎉 **{aco_results['num_vehicles_used']} araç için rotalar bulundu! "
+                   f"Toplam mesafe: {aco_results['total_distance']:.2f} km**")
+    elif 'schedule' in aco_results:
+        st.success(f"🎉 **Erişim saatlerine uygun rota bulundu! "
+                   f"Toplam mesafe: {aco_results['total_distance']:.2f} km, "
+                   f"toplam süre: {aco_results['total_duration']:.0f} dakika**")
+    else:
+        st.success(f"🎉 **En kısa rota bulundu! Toplam mesafe: {best_distance:.2f} km**")
+    
+    if aco_results['stop_reason'] != 'max_iterations':
+        st.info(f"⏹️ Erken durdu ({aco_results['stop_reason']}): "
+                f"{aco_results['iterations_run']}/{aco_results['num_iterations']} iterasyon, "
+                f"{aco_results['elapsed_seconds']:.1f} sn")
+    
+    # Sonuç bölümleri
+    st.markdown("---")
+    st.header("📊 Optimizasyon Sonuçları")
+    
+    # Tab'lar oluştur
+    tab1, tab2, tab3, tab4 = st.tabs(["🗺️ Rota Haritası", "📈 Yakınsama Grafiği", "📋 Rota Detayları", "🔥 Mesafe Matrisi"])
+    
+    with tab1:
+        st.subheader("Optimal Rota Haritası")
+        from streamlit_folium import folium_static
         
-        # 3. Sonuçları göster
-        progress_bar.progress(100)
-        status_text.text("✅ Optimizasyon tamamlandı!")
-        time.sleep(0.5)
-        status_text.empty()
-        progress_bar.empty()
+        route_map = create_route_map(locations, best_path, loc_names)
+        folium_static(route_map, width=800, height=600)
         
-        st.success(f"🎉 **En kısa rota bulundu! Toplam mesafe: {best_distance:.2f} km**")
+        # Rota sırası
+        st.markdown("**Ziyaret Sırası:**")
+        route_order = " → ".join([f"{i+1}. {loc_names[idx]}" for i, idx in enumerate(best_path)])
+        route_order += f" → {loc_names[best_path[0]]}"
+        st.info(route_order)
+    
+    with tab2:
+        st.subheader("Algoritma Yakınsama Grafiği")
+        convergence_fig = plot_convergence(iteration_history)
+        st.plotly_chart(convergence_fig, use_container_width=True)
         
-        # Sonuç bölümleri
-        st.markdown("---")
-        st.header("📊 Optimizasyon Sonuçları")
+        st.markdown(f"""
+        **Yakınsama İstatistikleri:**
+        - Başlangıç Mesafesi: {iteration_history[0]:.2f} km
+        - Final Mesafe: {iteration_history[-1]:.2f} km
+        - İyileştirme: {((iteration_history[0] - iteration_history[-1]) / iteration_history[0] * 100):.1f}%
+        """)
+    
+    with tab3:
+        st.subheader("Detaylı Rota Bilgileri")
+        route_details, total_distance = display_route_details(best_path, loc_names, distance_matrix)
         
-        # Tab'lar oluştur
-        tab1, tab2, tab3, tab4 = st.tabs(["🗺️ Rota Haritası", "📈 Yakınsama Grafiği", "📋 Rota Detayları", "🔥 Mesafe Matrisi"])
+        route_df = pd.DataFrame(route_details)
+        st.dataframe(route_df, use_container_width=True, hide_index=True)
         
-        with tab1:
-            st.subheader("Optimal Rota Haritası")
-            route_map = create_route_map(locations, best_path, loc_names)
-            folium_static(route_map, width=800, height=600)
-            
-            # Rota sırası
-            st.markdown("**Ziyaret Sırası:**")
-            route_order = " → ".join([f"{i+1}. {loc_names[idx]}" for i, idx in enumerate(best_path)])
-            route_order += f" → {loc_names[best_path[0]]}"
-            st.info(route_order)
+        st.metric("Toplam Mesafe", f"{total_distance:.2f} km")
         
-        with tab2:
-            st.subheader("Algoritma Yakınsama Grafiği")
-            convergence_fig = plot_convergence(iteration_history)
-            st.plotly_chart(convergence_fig, use_container_width=True)
+        if 'routes' in aco_results:
+            # Araç bazında rotalar (süreler yol + numune alma, dakika)
+            st.markdown("**Araç Rotaları:**")
+            vehicle_df = pd.DataFrame([{
+                'Araç': route['vehicle'],
+                'Rota': " → ".join(loc_names[idx] for idx in route['path']),
+                'Mesafe (km)': round(route['distance'], 2),
+                'Süre (dakika)': round(route['duration']),
+                'Numune Şişesi': route['load']
+            } for route in aco_results['routes']])
+            st.dataframe(vehicle_df, use_container_width=True, hide_index=True)
             
-            st.markdown(f"""
-            **Yakınsama İstatistikleri:**
-            - Başlangıç Mesafesi: {iteration_history[0]:.2f} km
-            - Final Mesafe: {iteration_history[-1]:.2f} km
-            - İyileştirme: {((iteration_history[0] - iteration_history[-1]) / iteration_history[0] * 100):.1f}%
-            """)
-        
-        with tab3:
-            st.subheader("Detaylı Rota Bilgileri")
-            route_details, total_distance = display_route_details(best_path, loc_names, distance_matrix)
+            if not aco_results['feasible']:
+                st.warning("⚠️ Araç sayısı, kapasite veya vardiya süresi ile tüm göletler "
+                           "ziyaret edilemedi; kısıtlar bazı araçlarda aşıldı.")
             
-            route_df = pd.DataFrame(route_details)
-            st.dataframe(route_df, use_container_width=True, hide_index=True)
+            estimated_time = max(route['duration'] for route in aco_results['routes'])
+            st.metric("En Uzun Vardiya", f"{estimated_time:.0f} dakika (~{estimated_time/60:.1f} saat)")
+        elif 'schedule' in aco_results:
+            # Varış/ayrılış saatleri (bekleme: açılıştan önce varış)
+            st.markdown("**Zaman Çizelgesi:**")
+            schedule_df = pd.DataFrame([{
+                'Lokasyon': loc_names[stop['location']],
+                'Varış': format_clock(stop['arrival']),
+                'Ayrılış': format_clock(stop['departure']),
+                'Bekleme (dakika)': round(stop['wait']),
+                'Gecikme (dakika)': round(stop['late'])
+            } for stop in aco_results['schedule']])
+            st.dataframe(schedule_df, use_container_width=True, hide_index=True)
             
-            st.metric("Toplam Mesafe", f"{total_distance:.2f} km")
+            if not aco_results['feasible']:
+                st.warning(f"⚠️ Tüm göletlere erişim saatleri içinde varılamadı; toplam "
+                           f"gecikme {aco_results['lateness']:.0f} dakika.")
             
-            # Tahmini süre (ortalama 50 km/saat)
-            estimated_time = (total_distance / 50) * 60  # dakika
+            total_duration = aco_results['total_duration']
+            st.metric("Toplam Süre", f"{total_duration:.0f} dakika (~{total_duration/60:.1f} saat)")
+        else:
+            # Tahmini süre: Google süre matrisi, yoksa ortalama hız (yalnızca yol)
+            duration_matrix = result['duration_matrix']
+            if duration_matrix is None:
+                duration_matrix = estimate_duration_matrix(distance_matrix)
+            estimated_time = sum(duration_matrix[best_path[i]][best_path[(i + 1) % len(best_path)]]
+                                 for i in range(len(best_path)))
             st.metric("Tahmini Süre", f"{estimated_time:.0f} dakika (~{estimated_time/60:.1f} saat)")
-        
-        with tab4:
-            st.subheader("Lokasyonlar Arası Mesafe Matrisi")
-            heatmap_fig = create_distance_heatmap(distance_matrix, loc_names)
-            st.plotly_chart(heatmap_fig, use_container_width=True)
-        
-        # İndirme butonları
-        st.markdown("---")
-        st.subheader("💾 Sonuçları İndir")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Rota CSV
-            route_csv = pd.DataFrame(route_details).to_csv(index=False)
-            st.download_button(
-                label="📥 Rota Detaylarını İndir (CSV)",
-                data=route_csv,
-                file_name="ankara_goletleri_rota.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            # Mesafe matrisi CSV
-            matrix_csv = pd.DataFrame(
-                distance_matrix, 
-                index=loc_names, 
-                columns=loc_names
-            ).to_csv()
-            st.download_button(
-                label="📥 Mesafe Matrisini İndir (CSV)",
-                data=matrix_csv,
-                file_name="mesafe_matrisi.csv",
-                mime="text/csv"
-            )
-        
-    except Exception as e:
-        st.error(f"❌ Bir hata oluştu: {str(e)}")
-        st.exception(e)
+    
+    with tab4:
+        st.subheader("Lokasyonlar Arası Mesafe Matrisi")
+        heatmap_fig = create_distance_heatmap(distance_matrix, loc_names)
+        st.plotly_chart(heatmap_fig, use_container_width=True)
+    
+    # İndirme butonları
+    st.markdown("---")
+    st.subheader("💾 Sonuçları İndir")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Rota CSV
+        route_csv = pd.DataFrame(route_details).to_csv(index=False)
+        st.download_button(
+            label="📥 Rota Detaylarını İndir (CSV)",
+            data=route_csv,
+            file_name="ankara_goletleri_rota.csv",
+            mime="text/csv"
+        )
+    
+    with col2:
+        # Mesafe matrisi CSV
+        matrix_csv = pd.DataFrame(
+            distance_matrix, 
+            index=loc_names, 
+            columns=loc_names
+        ).to_csv()
+        st.download_button(
+            label="📥 Mesafe Matrisini İndir (CSV)",
+            data=matrix_csv,
+            file_name="mesafe_matrisi.csv",
+            mime="text/csv"
+        )
 
-else:
+job_runner = get_job_runner()
+
+# Algoritma Çalıştır Butonu
+if st.button("🚀 Algoritmayı Çalıştır", type="primary", use_container_width=True):
+    method = 'google' if "Google" in distance_method else 'haversine'
+    api_key = None
+    if method == 'google':
+        try:
+            api_key = st.secrets["GOOGLE_MAPS_API_KEY"]
+        except Exception:
+            api_key = None
+    
+    aco_params = {
+        **DEFAULT_ACO_PARAMS,
+        'num_ants': num_ants,
+        'num_iterations': num_iterations,
+        'alpha': alpha,
+        'beta': beta,
+        'evaporation_rate': evaporation_rate,
+        'pheromone_strategy': pheromone_strategy
+    }
+    
+    # Aynı lokasyon/yöntem/parametre/tohum için sonuç önbellekten gelir
+    job_key = make_job_key(locations, method, aco_params, vrp_params, time_window_params,
+                           aco_params['seed'])
+    st.session_state['job_id'] = job_runner.submit(job_key, optimization_job, locations,
+                                                   method, aco_params, api_key, vrp_params,
+                                                   time_window_params)
+
+job = job_runner.get(st.session_state.get('job_id'))
+
+if job is None:
     st.info("👆 Yukarıdaki butona tıklayarak algoritmayı başlatın.")
 
+elif not job.finished:
+    # İş arka planda sürüyor: ilerleme gösterilir ve sayfa periyodik yenilenir
+    progress = job.progress
+    st.progress(progress.get('percent', 0))
+    
+    if progress.get('stage') == 'aco':
+        st.text(f"🐜 İterasyon {progress['iteration']}/{num_iterations} - "
+                f"En iyi mesafe: {progress['best_distance']:.2f} km")
+        st.line_chart(pd.DataFrame({'En iyi mesafe (km)': list(progress['history'])}))
+    else:
+        st.text("📊 Mesafe matrisi oluşturuluyor...")
+    
+    if st.button("⏹️ İptal Et"):
+        job.cancel()
+    
+    time.sleep(PROGRESS_UPDATE_INTERVAL)
+    st.rerun()
+
+elif job.status == 'failed':
+    st.error("❌ Bir hata oluştu")
+    st.code(job.error)
+
+elif job.status == 'cancelled':
+    st.warning("⏹️ Optimizasyon iptal edildi.")
+
+else:
+    if job.cached:
+        st.caption("♻️ Aynı parametrelerle önceki sonuç gösteriliyor.")
+    
+    # Görseller her iş için bir kez kaydedilir
+    if st.session_state.get('figures_saved_for') != job.key:
+        save_figures(job.result)
+        st.session_state['figures_saved_for'] = job.key
+    
+    render_results(job.result)
+
 # Footer
 st.markdown("---")
 st.markdown("""
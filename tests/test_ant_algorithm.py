@@ -0,0 +1,84 @@
+"""
+AntColonyOptimizer testleri: tekrarlanabilirlik, feromon stratejileri ve
+erken durdurma
+"""
+
+import numpy as np
+import pytest
+
+from core.ant_algorithm import AntColonyOptimizer
+
+def _distance_matrix(n, seed=0):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0.0, 100.0, (n, 2))
+    return np.linalg.norm(points[:, None] - points[None, :], axis=2)
+
+def _assert_valid_tour(aco, path, distance):
+    assert sorted(path) == list(range(aco.num_cities))
+    assert path[0] == 0
+    assert distance == pytest.approx(aco.calculate_path_distance(path))
+
+@pytest.mark.parametrize('batch_construction', [True, False])
+def test_same_seed_gives_same_tour(batch_construction):
+    distance_matrix = _distance_matrix(25)
+    runs = []
+    for _ in range(2):
+        aco = AntColonyOptimizer(distance_matrix, num_ants=8, num_iterations=10, seed=42,
+                                 batch_construction=batch_construction)
+        best_path, best_distance, history = aco.optimize(verbose=False)
+        runs.append((list(best_path), best_distance, list(history)))
+    
+    assert runs[0] == runs[1]
+
+def test_different_seeds_explore_differently():
+    distance_matrix = _distance_matrix(25)
+    histories = []
+    for seed in (1, 2):
+        aco = AntColonyOptimizer(distance_matrix, num_ants=8, num_iterations=5, seed=seed)
+        aco.optimize(verbose=False)
+        histories.append(aco.iteration_best_distances)
+    
+    assert histories[0] != histories[1]
+
+@pytest.mark.parametrize('strategy', ['as', 'mmas', 'acs'])
+@pytest.mark.parametrize('symmetric', [True, False])
+def test_pheromone_strategies_return_valid_tours(strategy, symmetric):
+    distance_matrix = _distance_matrix(20)
+    if not symmetric:
+        distance_matrix = distance_matrix * np.random.default_rng(3).uniform(0.8, 1.2, (20, 20))
+    
+    aco = AntColonyOptimizer(distance_matrix, num_ants=6, num_iterations=8, seed=0,
+                             pheromone_strategy=strategy)
+    best_path, best_distance, history = aco.optimize(verbose=False)
+    
+    assert aco.symmetric == symmetric
+    _assert_valid_tour(aco, best_path, best_distance)
+    assert len(history) == 8
+    assert all(later <= earlier for earlier, later in zip(history, history[1:]))
+    assert np.all(np.isfinite(aco.pheromone)) and np.all(aco.pheromone > 0)
+    assert aco.get_results()['pheromone_strategy'] == strategy
+
+def test_patience_stops_early():
+    aco = AntColonyOptimizer(_distance_matrix(12), num_ants=5, num_iterations=500, seed=0,
+                             patience=3)
+    best_path, best_distance, _ = aco.optimize(verbose=False)
+    
+    assert aco.stop_reason == 'patience'
+    assert aco.iterations_run < 500
+    _assert_valid_tour(aco, best_path, best_distance)
+
+def test_time_limit_stops_early():
+    aco = AntColonyOptimizer(_distance_matrix(30), num_ants=5, num_iterations=100000, seed=0,
+                             time_limit_seconds=0.2)
+    best_path, best_distance, _ = aco.optimize(verbose=False)
+    
+    assert aco.stop_reason == 'time_limit'
+    assert 0 < aco.iterations_run < 100000
+    _assert_valid_tour(aco, best_path, best_distance)
+
+def test_runs_all_iterations_without_stopping_criteria():
+    aco = AntColonyOptimizer(_distance_matrix(10), num_ants=4, num_iterations=6, seed=0)
+    aco.optimize(verbose=False)
+    
+    assert aco.stop_reason == 'max_iterations'
+    assert aco.iterations_run == 6
@@ -0,0 +1,67 @@
+"""
+cli.py toplu iş testleri
+"""
+
+import json
+
+import cli
+from config import TIME_WINDOW_CONFIG
+
+LOCATIONS = {
+    'Depo': {'lat': 39.93, 'lon': 32.85},
+    'A': {'lat': 39.97, 'lon': 32.80},
+    'B': {'lat': 39.90, 'lon': 32.92},
+    'C': {'lat': 39.85, 'lon': 32.78},
+    'D': {'lat': 40.00, 'lon': 32.88}
+}
+
+def _run(tmp_path, job):
+    source = tmp_path / 'jobs.jsonl'
+    source.write_text(json.dumps(job) + '\n', encoding='utf-8')
+    output = tmp_path / 'results.jsonl'
+    
+    exit_code = cli.main([str(source), '--output', str(output),
+                          '--ants', '5', '--iterations', '5', '--seed', '1'])
+    
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert len(records) == 1
+    return exit_code, records[0]
+
+def _minutes(clock):
+    hours, minutes = clock.split(':')
+    return int(hours) * 60 + int(minutes)
+
+def test_time_window_job_uses_config_defaults(tmp_path):
+    # Yalnızca bir lokasyonun penceresi verilir; diğer alanlar arayüzdeki gibi
+    # TIME_WINDOW_CONFIG'den gelir
+    job = {'id': 'tw', 'locations': LOCATIONS,
+           'time_windows': {'time_windows': {'A': ['09:00', '17:00']}}}
+    
+    exit_code, record = _run(tmp_path, job)
+    
+    assert exit_code == 0, record
+    assert record['status'] == 'ok'
+    assert record['feasible'] is True
+    assert sorted(record['route']) == sorted(LOCATIONS)
+    
+    depot, *stops = record['schedule'][:-1]
+    default_open, _ = TIME_WINDOW_CONFIG['default_window']
+    assert depot['departure'] == default_open
+    for stop in stops:
+        service = _minutes(stop['departure']) - _minutes(stop['arrival']) - stop['wait']
+        assert abs(service - TIME_WINDOW_CONFIG['service_times']) <= 1
+        if stop['location'] == 'A':
+            assert _minutes(stop['departure']) - TIME_WINDOW_CONFIG['service_times'] >= 9 * 60
+
+def test_time_window_job_overrides_defaults(tmp_path):
+    job = {'id': 'tw', 'locations': LOCATIONS,
+           'time_windows': {'default_window': ['07:00', '18:00'], 'service_times': 5}}
+    
+    exit_code, record = _run(tmp_path, job)
+    
+    assert exit_code == 0, record
+    depot, *stops = record['schedule'][:-1]
+    assert depot['departure'] == '07:00'
+    for stop in stops:
+        service = _minutes(stop['departure']) - _minutes(stop['arrival']) - stop['wait']
+        assert abs(service - 5) <= 1
@@ -0,0 +1,56 @@
+"""
+create_haversine_matrix / create_haversine_memmap testleri
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core.haversine import create_haversine_matrix, create_haversine_memmap
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def _coordinates(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(36.0, 42.0, n), rng.uniform(26.0, 45.0, n)])
+
+def test_memmap_matches_dense_matrix(tmp_path):
+    coordinates = _coordinates(700)
+    
+    matrix = create_haversine_memmap(coordinates, tmp_path / 'matrix.bin', block_size=64)
+    
+    assert matrix.shape == (700, 700)
+    assert np.array_equal(np.asarray(matrix),
+                          create_haversine_matrix(coordinates, dtype=np.float32))
+    assert not np.diagonal(matrix).any()
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="resource modülü yok")
+def test_memmap_peak_memory_bounded_by_block_size(tmp_path):
+    # Tepe bellek (ru_maxrss) süreç boyunca ölçüldüğü için ayrı süreçte çalıştırılır
+    n, block_size = 6000, 512
+    script = textwrap.dedent(f"""
+        import resource
+        import numpy as np
+        from core.haversine import create_haversine_memmap
+        
+        rng = np.random.default_rng(0)
+        coordinates = np.column_stack([rng.uniform(36, 42, {n}), rng.uniform(26, 45, {n})])
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        create_haversine_memmap(coordinates, {str(tmp_path / 'matrix.bin')!r},
+                                block_size={block_size})
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print((after - before) * 1024)
+    """)
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    growth = int(result.stdout.split()[-1])
+    
+    matrix_bytes = n * n * np.dtype(np.float32).itemsize
+    # Şerit başına birkaç float64 ara dizi (block_size^2 eleman) + pay
+    block_bytes = block_size * block_size * 8
+    assert growth < 16 * block_bytes + (8 << 20)
+    assert growth < matrix_bytes // 4
@@ -0,0 +1,23 @@
+"""
+İçe aktarma süresi testleri (bkz. benchmarks/import_time_check.py)
+
+Her modül ayrı bir süreçte `python -X importtime` ile içe aktarılır.
+"""
+
+import pytest
+
+from benchmarks.import_time_check import BUDGET_MS, TARGETS, check_module
+
+@pytest.mark.parametrize('module', TARGETS)
+def test_does_not_import_optional_packages(module):
+    result = check_module(module, repeats=1)
+    
+    assert result['forbidden'] == [], (
+        f"{module} isteğe bağlı paketleri yüklüyor: {', '.join(result['forbidden'])}")
+
+def test_ant_algorithm_import_budget():
+    result = check_module('core.ant_algorithm', repeats=5)
+    
+    assert result['own_ms'] <= BUDGET_MS, (
+        f"core.ant_algorithm içe aktarma süresi {result['own_ms']:.1f} ms "
+        f"(bütçe {BUDGET_MS:.1f} ms, numpy hariç)")
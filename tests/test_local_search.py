@@ -0,0 +1,69 @@
+"""
+2-opt / Or-opt yerel arama testleri
+"""
+
+import numpy as np
+import pytest
+
+from core.ant_algorithm import AntColonyOptimizer
+from core.local_search import improve_tour, tour_length
+
+def _instance(n, symmetric, seed=0):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0.0, 100.0, (n, 2))
+    distance_matrix = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+    if not symmetric:
+        distance_matrix = distance_matrix * rng.uniform(0.7, 1.3, (n, n))
+        np.fill_diagonal(distance_matrix, 0.0)
+    
+    order = np.argsort(distance_matrix + np.diag(np.full(n, np.inf)), axis=1)
+    return distance_matrix, order[:, :8]
+
+@pytest.mark.parametrize('method', ['2opt', '2opt+oropt'])
+@pytest.mark.parametrize('symmetric', [True, False])
+def test_improve_tour_returns_shorter_permutation(method, symmetric):
+    distance_matrix, neighbor_lists = _instance(40, symmetric)
+    rng = np.random.default_rng(1)
+    
+    for _ in range(5):
+        tour = [0] + list(rng.permutation(np.arange(1, 40)))
+        improved, num_moves = improve_tour(tour, distance_matrix, neighbor_lists,
+                                           method, symmetric=symmetric)
+        
+        assert sorted(improved) == list(range(40))
+        assert improved[0] == 0
+        before = tour_length(tour, distance_matrix)
+        after = tour_length(improved, distance_matrix)
+        assert after <= before + 1e-9
+        if num_moves:
+            assert after < before
+
+def test_improve_tour_keeps_local_optimum():
+    distance_matrix, neighbor_lists = _instance(30, True)
+    tour, _ = improve_tour(list(range(30)), distance_matrix, neighbor_lists, '2opt+oropt')
+    
+    again, num_moves = improve_tour(tour, distance_matrix, neighbor_lists, '2opt+oropt')
+    
+    assert num_moves == 0
+    assert list(again) == list(tour)
+
+def test_rejects_unknown_method():
+    distance_matrix, neighbor_lists = _instance(5, True)
+    with pytest.raises(ValueError):
+        improve_tour(list(range(5)), distance_matrix, neighbor_lists, '3opt')
+
+@pytest.mark.parametrize('scope', ['best', 'all'])
+def test_optimizer_local_search_never_lengthens_tours(scope):
+    distance_matrix, _ = _instance(30, True, seed=2)
+    aco = AntColonyOptimizer(distance_matrix, num_ants=6, num_iterations=5, seed=0,
+                             local_search='2opt+oropt', local_search_scope=scope)
+    best_path, best_distance, _ = aco.optimize(verbose=False)
+    
+    assert sorted(best_path) == list(range(30))
+    assert best_distance == pytest.approx(aco.calculate_path_distance(best_path))
+    assert aco.local_search_moves > 0
+    
+    # Aynı tohumla yerel aramasız çalıştırmadan kötü olmaz
+    plain = AntColonyOptimizer(distance_matrix, num_ants=6, num_iterations=5, seed=0)
+    plain.optimize(verbose=False)
+    assert best_distance <= plain.best_distance + 1e-9
@@ -0,0 +1,56 @@
+"""
+MatrixStore eşzamanlı güncelleme testleri
+"""
+
+import threading
+
+import numpy as np
+
+from core.haversine import create_haversine_matrix
+from core.matrix_store import MatrixStore
+from core.matrix_utils import load_matrix_bundle
+
+def _locations(names, seed):
+    rng = np.random.default_rng(seed)
+    return {name: {'lat': float(rng.uniform(39.8, 40.1)), 'lon': float(rng.uniform(32.6, 33.0))}
+            for name in names}
+
+def test_concurrent_updates_of_same_store(tmp_path):
+    filename = str(tmp_path / 'store' / 'matrix')
+    # İki iş farklı (kısmen ortak) lokasyon kümeleriyle aynı paketi günceller
+    location_sets = [_locations([f"P{i}" for i in range(0, 60)], seed=1),
+                     _locations([f"P{i}" for i in range(30, 120)], seed=2)]
+    barrier = threading.Barrier(len(location_sets))
+    errors = []
+    
+    def worker(locations):
+        try:
+            store = MatrixStore(filename)
+            barrier.wait()
+            for _ in range(20):
+                result = store.update(locations)
+                expected = create_haversine_matrix(
+                    [(value['lat'], value['lon']) for value in locations.values()])
+                assert result['location_names'] == list(locations)
+                np.testing.assert_allclose(result['distance_matrix'], expected, rtol=1e-12)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(locations,)) for locations in location_sets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    
+    # Son paket tutarlı: isimler, koordinatlar ve matris aynı güncellemeden
+    bundle = load_matrix_bundle(filename)
+    names = bundle['location_names']
+    coordinates = bundle['metadata']['coordinates']
+    assert bundle['distance_matrix'].shape == (len(names), len(names))
+    np.testing.assert_allclose(bundle['distance_matrix'], create_haversine_matrix(coordinates),
+                               rtol=1e-12)
+    
+    # Geçici dosyalar kalmaz
+    assert not list((tmp_path / 'store').glob('*.tmp'))
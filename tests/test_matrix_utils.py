@@ -0,0 +1,136 @@
+"""
+fetch_distance_matrix_with_google testleri (googlemaps.Client sahte modülle)
+"""
+
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from core import matrix_utils
+from core.distance_cache import DistanceCache
+from core.matrix_utils import fetch_distance_matrix_with_google
+
+class _TransportError(Exception):
+    pass
+
+class _Timeout(Exception):
+    pass
+
+class _ApiError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(status, message)
+        self.status = status
+
+class _StubClient:
+    """
+    Gönderilen istekleri kaydeden sahte googlemaps.Client. i -> j mesafesi
+    (100 * i + j) km, süresi (i + j) dakikadır; failures sırayla fırlatılır.
+    """
+    
+    requests = []
+    failures = []
+    lock = threading.Lock()
+    
+    def __init__(self, key):
+        self.key = key
+    
+    def distance_matrix(self, origins, destinations, mode, language, units):
+        with self.lock:
+            type(self).requests.append((list(origins), list(destinations)))
+            if type(self).failures:
+                raise type(self).failures.pop(0)
+        
+        rows = []
+        for origin in origins:
+            i = _index(origin)
+            rows.append({'elements': [
+                {'status': 'OK',
+                 'distance': {'value': (100 * i + _index(destination)) * 1000},
+                 'duration': {'value': (i + _index(destination)) * 60}}
+                for destination in destinations]})
+        return {'rows': rows}
+
+def _index(coordinate):
+    # Koordinatlar (i, i) olarak üretilir
+    return int(round(coordinate[0]))
+
+def _locations(n):
+    return {f"L{i}": {'lat': float(i), 'lon': float(i), 'adres': ''} for i in range(n)}
+
+@pytest.fixture
+def googlemaps_stub(monkeypatch):
+    module = types.ModuleType('googlemaps')
+    module.Client = _StubClient
+    module.exceptions = types.SimpleNamespace(TransportError=_TransportError,
+                                              Timeout=_Timeout, ApiError=_ApiError)
+    monkeypatch.setitem(sys.modules, 'googlemaps', module)
+    monkeypatch.setattr(_StubClient, 'requests', [])
+    monkeypatch.setattr(_StubClient, 'failures', [])
+    return _StubClient
+
+def _expected_distances(n):
+    index = np.arange(n)
+    expected = 100.0 * index[:, None] + index[None, :]
+    np.fill_diagonal(expected, 0.0)
+    return expected
+
+def test_blocks_requests_and_places_cells(googlemaps_stub):
+    n = 12
+    result = fetch_distance_matrix_with_google('key', _locations(n))
+    
+    # 12 x 12 matris, 100 elemanlık limitle 2 istekte alınır
+    assert result.num_requests == len(googlemaps_stub.requests) == 2
+    assert result.failed_cells == []
+    for origins, destinations in googlemaps_stub.requests:
+        assert len(origins) * len(destinations) <= matrix_utils.MAX_ELEMENTS
+    
+    np.testing.assert_allclose(result.distance_matrix, _expected_distances(n))
+    index = np.arange(n)
+    expected_durations = (index[:, None] + index[None, :]).astype(float)
+    np.fill_diagonal(expected_durations, 0.0)
+    np.testing.assert_allclose(result.duration_matrix, expected_durations)
+
+def test_cache_hit_sends_no_request(googlemaps_stub, tmp_path):
+    n = 6
+    cache = DistanceCache(str(tmp_path / 'cache.sqlite'))
+    first = fetch_distance_matrix_with_google('key', _locations(n), cache=cache)
+    assert first.num_requests == 1
+    assert first.num_cached == 0
+    
+    googlemaps_stub.requests.clear()
+    second = fetch_distance_matrix_with_google('key', _locations(n), cache=cache)
+    
+    assert googlemaps_stub.requests == []
+    assert second.num_requests == 0
+    assert second.num_cached == n * (n - 1)
+    np.testing.assert_allclose(second.distance_matrix, _expected_distances(n))
+
+def test_retries_transient_errors_with_backoff(googlemaps_stub, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(matrix_utils.time, 'sleep', sleeps.append)
+    googlemaps_stub.failures.extend([_ApiError('OVER_QUERY_LIMIT'), _TransportError()])
+    
+    result = fetch_distance_matrix_with_google('key', _locations(5),
+                                               backoff_base=0.5, backoff_max=30.0)
+    
+    assert result.num_requests == 3
+    assert result.failed_cells == []
+    np.testing.assert_allclose(result.distance_matrix, _expected_distances(5))
+    # Full jitter: k. denemeden önce en fazla backoff_base * 2^k saniye
+    assert len(sleeps) == 2
+    assert 0.0 <= sleeps[0] <= 0.5
+    assert 0.0 <= sleeps[1] <= 1.0
+
+def test_gives_up_after_max_retries(googlemaps_stub, monkeypatch):
+    monkeypatch.setattr(matrix_utils.time, 'sleep', lambda seconds: None)
+    googlemaps_stub.failures.extend([_TransportError()] * 3)
+    
+    result = fetch_distance_matrix_with_google('key', _locations(3), max_retries=2)
+    
+    assert result.num_requests == 3
+    assert len(result.failed_cells) == 3 * 2
+    assert {cell['status'] for cell in result.failed_cells} == {'_TransportError'}
+    assert np.isnan(result.distance_matrix[~np.eye(3, dtype=bool)]).all()
@@ -0,0 +1,95 @@
+"""
+Vektörel feromon bırakma (AntColonyOptimizer._deposit) testleri
+"""
+
+import numpy as np
+import pytest
+
+from core.ant_algorithm import AntColonyOptimizer
+
+def _reference_update(pheromone, all_paths, all_distances, evaporation_rate, Q, symmetric):
+    """Vektörleştirme öncesi döngü (asimetrik modda yalnızca geçilen yön)."""
+    pheromone = pheromone * (1 - evaporation_rate)
+    
+    for path, distance in zip(all_paths, all_distances):
+        pheromone_deposit = Q / distance
+        
+        for i in range(len(path) - 1):
+            pheromone[path[i]][path[i + 1]] += pheromone_deposit
+            if symmetric:
+                pheromone[path[i + 1]][path[i]] += pheromone_deposit
+        
+        pheromone[path[-1]][path[0]] += pheromone_deposit
+        if symmetric:
+            pheromone[path[0]][path[-1]] += pheromone_deposit
+    
+    return pheromone
+
+def _optimizer(n, symmetric, seed=0):
+    rng = np.random.default_rng(seed)
+    distances = rng.uniform(1.0, 100.0, (n, n))
+    if symmetric:
+        distances = (distances + distances.T) / 2
+    np.fill_diagonal(distances, 0.0)
+    return AntColonyOptimizer(distances, num_ants=4, num_iterations=1,
+                              evaporation_rate=0.3, Q=7.0, seed=seed)
+
+@pytest.mark.parametrize('symmetric', [True, False])
+@pytest.mark.parametrize('num_ants', [1, 12])
+def test_deposit_matches_reference_loop(symmetric, num_ants):
+    # 1 karınca np.add.at (seyrek), 12 karınca bincount yolunu kullanır
+    aco = _optimizer(30, symmetric)
+    assert aco.symmetric == symmetric
+    
+    rng = np.random.default_rng(1)
+    all_paths = np.array([rng.permutation(30) for _ in range(num_ants)])
+    all_distances = aco.calculate_path_distances(all_paths)
+    aco.pheromone = rng.uniform(0.1, 1.0, (30, 30))
+    expected = _reference_update(aco.pheromone, all_paths, all_distances,
+                                 aco.evaporation_rate, aco.Q, symmetric)
+    
+    aco.update_pheromones(all_paths, all_distances)
+    
+    np.testing.assert_allclose(aco.pheromone, expected, rtol=1e-12)
+    np.testing.assert_allclose(aco.choice_info, aco.pheromone * aco.heuristic_beta, rtol=1e-12)
+
+@pytest.mark.parametrize('symmetric', [True, False])
+def test_deposit_accumulates_repeated_edges(symmetric):
+    aco = _optimizer(8, symmetric)
+    
+    # Aynı tur iki kez, ters yön ve depo dolgusu (0 -> 0, 0 tekrarları)
+    all_paths = [
+        [0, 1, 2, 3, 4, 5, 6, 7],
+        [0, 1, 2, 3, 4, 5, 6, 7],
+        [0, 7, 6, 5, 4, 3, 2, 1],
+        [0, 1, 2, 0, 3, 4, 0, 0],
+    ]
+    all_distances = np.array([10.0, 10.0, 20.0, 5.0])
+    aco.pheromone = np.full((8, 8), 0.5)
+    expected = _reference_update(aco.pheromone, all_paths, all_distances,
+                                 aco.evaporation_rate, aco.Q, symmetric)
+    
+    aco.update_pheromones(np.array(all_paths), all_distances)
+    
+    np.testing.assert_allclose(aco.pheromone, expected, rtol=1e-12)
+    if symmetric:
+        np.testing.assert_allclose(aco.pheromone, aco.pheromone.T)
+
+def test_sparse_and_dense_paths_agree():
+    aco = _optimizer(40, True)
+    from_cities = np.array([3, 5, 3, 9, 5])
+    to_cities = np.array([5, 3, 5, 1, 3])
+    amounts = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    
+    aco.pheromone = np.zeros((40, 40))
+    aco._deposit(from_cities, to_cities, amounts)
+    sparse = aco.pheromone.copy()
+    
+    # Aynı kenarlar tam boyutlu bincount yolunu tetikleyecek kadar tekrarlanır
+    repeats = 40 * 40
+    aco.pheromone = np.zeros((40, 40))
+    aco._deposit(np.tile(from_cities, repeats), np.tile(to_cities, repeats),
+                 np.tile(amounts, repeats) / repeats)
+    
+    np.testing.assert_allclose(aco.pheromone, sparse, rtol=1e-9)
+    assert sparse[3, 5] == sparse[5, 3] == 1.0 + 2.0 + 3.0 + 5.0
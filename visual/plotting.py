@@ -1,11 +1,11 @@
 """
 Görselleştirme Fonksiyonları
 Harita ve grafik oluşturma
+
+folium, plotly ve matplotlib ilk kullanıldıkları fonksiyonda yüklenir;
+modülü içe aktarmak bu paketleri yüklemez.
 """
 
-import folium
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 from datetime import datetime
@@ -28,6 +28,8 @@ def create_route_map(locations_dict, route_indices, location_names):
     folium.Map
         Oluşturulan harita objesi
     """
+    import folium
+    
     # Ankara merkezinde harita oluştur
     ankara_center = [39.9334, 32.8597]
     route_map = folium.Map(
@@ -111,6 +113,8 @@ def plot_convergence(iteration_history):
     plotly.graph_objects.Figure
         Oluşturulan grafik
     """
+    import plotly.graph_objects as go
+    
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
@@ -149,6 +153,8 @@ def plot_convergence_matplotlib(iteration_history, save_path='figure/convergence
     str
         Kaydedilen dosyanın yolu
     """
+    import matplotlib.pyplot as plt
+    
     # Figure klasörünün var olduğundan emin ol
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
     
@@ -198,6 +204,8 @@ def create_distance_heatmap(distance_matrix, location_names):
     plotly.graph_objects.Figure
         Isı haritası
     """
+    import plotly.graph_objects as go
+    
     # Kısa isimler oluştur (ilk 20 karakter)
     short_names = [name[:20] + '...' if len(name) > 20 else name 
                    for name in location_names]